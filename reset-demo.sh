@@ -69,6 +69,15 @@ echo "[reset] Cleaning ML pipeline scripts..."
 remove_item "src/ml-pipeline/register_data.py"
 remove_item "src/ml-pipeline/register_data.sh"
 remove_item "src/ml-pipeline/train.py"
+remove_item "src/ml-pipeline/forest_export.py"
+remove_item "src/ml-pipeline/chunked_loader.py"
+remove_item "src/ml-pipeline/feature_pipeline.py"
+remove_item "src/ml-pipeline/hyperparameter_search.py"
+remove_item "src/ml-pipeline/warm_start.py"
+remove_item "src/ml-pipeline/compare_models.py"
+remove_item "src/ml-pipeline/training_profile.py"
+remove_item "src/ml-pipeline/model_compaction.py"
+remove_item "src/ml-pipeline/compaction_report.py"
 remove_item "src/ml-pipeline/submit_training_job.py"
 remove_item "src/ml-pipeline/submit_training_job.sh"
 remove_item "src/ml-pipeline/register_model.py"
@@ -83,12 +92,13 @@ remove_item "src/data/README.md"
 remove_item "src/data/prepare_mltables.sh"
 remove_item "src/data/generate_synthetic_data.py"
 remove_item "src/data/generate_data.sh"
+remove_item "src/data/benchmark_formats.py"
 
-# Remove raw CSV files
+# Remove raw CSV and Parquet files
 if [[ -d "src/data/raw" ]]; then
-  for csv in src/data/raw/*.csv; do
-    if [[ -f "$csv" ]]; then
-      remove_item "$csv"
+  for data_file in src/data/raw/*.csv src/data/raw/*.parquet; do
+    if [[ -f "$data_file" ]]; then
+      remove_item "$data_file"
     fi
   done
 fi
@@ -109,6 +119,25 @@ echo ""
 echo "[reset] Cleaning deployment artifacts..."
 remove_item "src/deploy/score.py"
 remove_item "src/deploy/env-infer.yml"
+remove_item "src/deploy/feature_encoder.py"
+remove_item "src/deploy/forest_engine.py"
+remove_item "src/deploy/benchmark_forest.py"
+remove_item "src/deploy/batching.py"
+remove_item "src/deploy/prediction_cache.py"
+remove_item "src/deploy/model_registry.py"
+remove_item "src/deploy/bulk.py"
+remove_item "src/deploy/batch_score.py"
+remove_item "src/deploy/timing.py"
+remove_item "src/deploy/load_test.py"
+remove_item "src/deploy/validation.py"
+remove_item "src/deploy/fast_json.py"
+remove_item "src/deploy/benchmark_uncertainty.py"
+remove_item "src/deploy/serve.py"
+echo ""
+
+# Remove tests of the generated pipeline and scoring code
+echo "[reset] Cleaning tests..."
+remove_item "tests"
 echo ""
 
 # Remove Bruno secrets
@@ -76,6 +76,7 @@ remove_item "src/data/README.md"
 remove_item "src/data/generate_synthetic_data.py"
 remove_item "src/data/generate_data.sh"
 remove_item "src/data/prepare_mltables.sh"
+remove_item "src/data/benchmark_formats.py"
 remove_item "src/data/raw"
 remove_item "src/data/mltable"
 
@@ -92,6 +93,26 @@ echo "[reset] Cleaning deployment directory..."
 remove_item "src/deploy/env-train.yml"
 remove_item "src/deploy/env-infer.yml"
 remove_item "src/deploy/score.py"
+remove_item "src/deploy/feature_encoder.py"
+remove_item "src/deploy/forest_engine.py"
+remove_item "src/deploy/benchmark_forest.py"
+remove_item "src/deploy/batching.py"
+remove_item "src/deploy/prediction_cache.py"
+remove_item "src/deploy/model_registry.py"
+remove_item "src/deploy/bulk.py"
+remove_item "src/deploy/batch_score.py"
+remove_item "src/deploy/timing.py"
+remove_item "src/deploy/load_test.py"
+remove_item "src/deploy/validation.py"
+remove_item "src/deploy/fast_json.py"
+remove_item "src/deploy/benchmark_uncertainty.py"
+remove_item "src/deploy/serve.py"
+
+# ============================================================
+# TESTS - Remove the pipeline and scoring tests
+# ============================================================
+echo "[reset] Cleaning tests..."
+remove_item "tests"
 
 # ============================================================
 # BRUNO - Remove entire collection
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark CSV against Parquet for the generated house data.
+
+Generates the same rows with the vectorized generator in both formats
+(in a temporary directory), then compares file size and the time to load
+each file into pandas, and checks both loads hold the same values.
+
+Requires NumPy, pandas and pyarrow.
+
+Example:
+    python benchmark_formats.py --rows 1000000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from generate_synthetic_data import generate_dataset_vectorized
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark CSV against Parquet for house data')
+    parser.add_argument('--rows', type=int, default=1_000_000,
+                       help='Rows to generate (default: 1000000)')
+    parser.add_argument('--repeats', type=int, default=5,
+                       help='Timed loads per format (default: 5)')
+    return parser.parse_args()
+
+
+def time_load(load, path, repeats):
+    """
+    Load a file repeatedly.
+
+    Returns:
+        Tuple of (median seconds, last loaded DataFrame)
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df = load(path)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), df
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / 'houses.csv'
+        parquet_path = Path(tmp) / 'houses.parquet'
+
+        start = time.perf_counter()
+        generate_dataset_vectorized(csv_path, args.rows, 1, fmt='csv')
+        csv_write = time.perf_counter() - start
+        start = time.perf_counter()
+        generate_dataset_vectorized(parquet_path, args.rows, 1, fmt='parquet')
+        parquet_write = time.perf_counter() - start
+
+        csv_load, csv_df = time_load(pd.read_csv, csv_path, args.repeats)
+        parquet_load, parquet_df = time_load(pd.read_parquet, parquet_path, args.repeats)
+
+        # Same values either way (categoricals compared as strings)
+        categorical = [c for c in parquet_df.columns
+                       if isinstance(parquet_df[c].dtype, pd.CategoricalDtype)]
+        pd.testing.assert_frame_equal(
+            parquet_df.astype({c: str for c in categorical}),
+            csv_df.astype({c: str for c in categorical}),
+            check_dtype=False,
+        )
+
+        sizes = {'csv': csv_path.stat().st_size, 'parquet': parquet_path.stat().st_size}
+        memory = {
+            'csv': csv_df.memory_usage(deep=True).sum(),
+            'parquet': parquet_df.memory_usage(deep=True).sum(),
+        }
+
+    print()
+    print('=' * 70)
+    print(f'CSV vs Parquet ({args.rows:,} rows, median of {args.repeats} loads)')
+    print('=' * 70)
+    print(f"{'format':<9} {'file MB':>9} {'write s':>9} {'load s':>9} {'in-memory MB':>13}")
+    for fmt, write_s, load_s in [('csv', csv_write, csv_load), ('parquet', parquet_write, parquet_load)]:
+        print(f"{fmt:<9} {sizes[fmt] / 1e6:>9.1f} {write_s:>9.2f} {load_s:>9.3f} "
+              f"{memory[fmt] / 1e6:>13.1f}")
+    print()
+    print(f'Parquet file size: {sizes["parquet"] / sizes["csv"]:.0%} of CSV')
+    print(f'Parquet load time: {parquet_load / csv_load:.0%} of CSV '
+          f'({csv_load / parquet_load:.1f}x faster)')
+    print()
+    print('Parquet dtypes:')
+    for column, dtype in parquet_df.dtypes.items():
+        print(f'  {column:<18} {dtype}')
+    print('=' * 70)
+
+
+if __name__ == '__main__':
+    main()
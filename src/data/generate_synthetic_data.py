@@ -4,12 +4,31 @@ Generate synthetic house price data for Boulder, CO market.
 
 Creates train, validation, and test datasets with realistic correlations
 between features and target price.
+
+Two generators share the same distributions and price formula:
+- the default per-house generator (generate_house), reproducible per id
+- a vectorized NumPy generator (--vectorized) that builds whole chunks of
+  houses as arrays and streams them to disk, for multi-million-row
+  load-testing datasets. It draws from numpy.random.Generator, so its rows
+  differ from the per-house generator's, but a given seed and chunk size
+  always produce the same file.
+
+With --shards, each split is cut into contiguous shards generated on a
+process pool (--workers) and kept as <split>-NNNNN-of-NNNNN.csv (or .parquet) files
+(picked up by prepare_mltables.sh) or concatenated (--concat). Shards are
+seeded from the seed, the split's seed offset and the shard index, so the
+output never depends on the worker count.
+
+--format parquet writes Parquet instead of CSV (zstd-compressed, row
+groups of PARQUET_ROW_GROUP_ROWS, integer/float dtypes preserved and
+categorical columns dictionary-encoded).
 """
 
 import csv
 import random
 import argparse
 import os
+import shutil
 from pathlib import Path
 
 
@@ -25,6 +44,22 @@ NEIGHBORHOOD_BASE_PRICES = {
     'N5': 440000   # Up-and-coming
 }
 
+# Neighborhood and exterior codes, in the order the generators draw them
+NEIGHBORHOODS = ['N1', 'N2', 'N3', 'N4', 'N5']
+EXTERIOR_TYPES = ['brick', 'siding', 'stucco', 'fiber_cement', 'wood']
+
+FIELDNAMES = ['id', 'sqft', 'bedrooms', 'bathrooms', 'year_built',
+              'neighborhood_code', 'garage_spaces', 'condition_score',
+              'exterior_type', 'price']
+
+# Rows generated (and written) at a time by the vectorized generator
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+# Output formats, and rows per Parquet row group (small enough to stream
+# a file one row group at a time)
+FORMATS = ['csv', 'parquet']
+PARQUET_ROW_GROUP_ROWS = 128 * 1024
+
 # Exterior type price multipliers
 EXTERIOR_MULTIPLIERS = {
     'brick': 1.08,         # +8% premium
@@ -57,7 +92,7 @@ def generate_house(house_id, seed_offset=0):
     year_built = random.randint(1950, 2023)
     
     # Random neighborhood
-    neighborhood = random.choice(['N1', 'N2', 'N3', 'N4', 'N5'])
+    neighborhood = random.choice(NEIGHBORHOODS)
     
     # Garage spaces (0-3)
     garage_spaces = random.randint(0, 3)
@@ -66,7 +101,7 @@ def generate_house(house_id, seed_offset=0):
     condition_score = random.randint(1, 10)
     
     # Exterior type
-    exterior_type = random.choice(['brick', 'siding', 'stucco', 'fiber_cement', 'wood'])
+    exterior_type = random.choice(EXTERIOR_TYPES)
     
     # Calculate price with realistic correlations
     price = calculate_price(
@@ -134,23 +169,328 @@ def calculate_price(sqft, bedrooms, bathrooms, year_built, neighborhood,
     return final_price
 
 
-def generate_dataset(output_path, num_rows, start_id, seed_offset=0):
-    """Generate a single dataset and write to CSV."""
+def iter_house_chunks(num_rows, start_id, seed_offset=0, chunk_rows=10_000):
+    """Yield lists of per-house records for houses start_id .. start_id + num_rows - 1."""
+    for chunk_start in range(start_id, start_id + num_rows, chunk_rows):
+        chunk_end = min(chunk_start + chunk_rows, start_id + num_rows)
+        yield [generate_house(i, seed_offset) for i in range(chunk_start, chunk_end)]
+
+
+def generate_dataset(output_path, num_rows, start_id, seed_offset=0, fmt='csv'):
+    """Generate a single dataset and write to CSV (or Parquet)."""
+    
+    if fmt == 'parquet':
+        write_parquet(output_path, (records_to_columns(chunk) for chunk in
+                                    iter_house_chunks(num_rows, start_id, seed_offset)))
+    else:
+        with open(output_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+            writer.writeheader()
+            for chunk in iter_house_chunks(num_rows, start_id, seed_offset):
+                writer.writerows(chunk)
+    
+    print(f"✓ Created {output_path} with {num_rows} rows")
+
+
+def generate_houses_vectorized(rng, start_id, num_rows):
+    """
+    Generate a chunk of houses as NumPy arrays.
+    
+    Applies the same distributions and price formula as generate_house()
+    and calculate_price(), column-wise.
+    
+    Args:
+        rng: numpy.random.Generator to draw from
+        start_id: id of the first house in the chunk
+        num_rows: Number of houses
+        
+    Returns:
+        Dict of column name -> NumPy array, in FIELDNAMES order
+    """
+    import numpy as np
+    
+    sqft = rng.integers(600, 4500, size=num_rows, endpoint=True)
+    
+    # Bedrooms correlate with square footage (~700 sqft per bedroom)
+    base_bedrooms = np.maximum(1, sqft // 700)
+    bedrooms = np.clip(base_bedrooms + rng.integers(-1, 2, size=num_rows, endpoint=True), 1, 6)
     
-    fieldnames = ['id', 'sqft', 'bedrooms', 'bathrooms', 'year_built', 
-                  'neighborhood_code', 'garage_spaces', 'condition_score', 
-                  'exterior_type', 'price']
+    # Bathrooms correlate with bedrooms (~0.75 ratio)
+    base_bathrooms = bedrooms * 0.75
+    bathrooms = np.round(
+        np.clip(base_bathrooms + rng.uniform(-0.5, 0.5, size=num_rows), 1.0, 4.0), 1
+    )
+    
+    year_built = rng.integers(1950, 2023, size=num_rows, endpoint=True)
+    neighborhood = rng.integers(0, len(NEIGHBORHOODS), size=num_rows)
+    garage_spaces = rng.integers(0, 3, size=num_rows, endpoint=True)
+    condition_score = rng.integers(1, 10, size=num_rows, endpoint=True)
+    exterior_type = rng.integers(0, len(EXTERIOR_TYPES), size=num_rows)
+    
+    # calculate_price(), one factor at a time over whole columns
+    base_prices = np.array([NEIGHBORHOOD_BASE_PRICES[code] for code in NEIGHBORHOODS], dtype=float)
+    exterior_factors = np.array([EXTERIOR_MULTIPLIERS[code] for code in EXTERIOR_TYPES])
+    sqft_factor = (sqft / 2000) ** 0.8
+    age_factor = 1.0 - ((2023 - year_built) / 250)
+    condition_factor = 0.85 + (condition_score / 20)
+    room_factor = 1.0 + ((bedrooms - 3) * 0.03) + ((bathrooms - 2) * 0.02)
+    garage_factor = 1.0 + (garage_spaces * 0.04)
+    predicted_price = (base_prices[neighborhood] * sqft_factor * age_factor *
+                       condition_factor * room_factor * garage_factor *
+                       exterior_factors[exterior_type])
+    noise = rng.uniform(-0.10, 0.10, size=num_rows)
+    price = np.round(predicted_price * (1 + noise), 2)
     
-    houses = [generate_house(i, seed_offset) for i in range(start_id, start_id + num_rows)]
+    return {
+        'id': np.arange(start_id, start_id + num_rows),
+        'sqft': sqft,
+        'bedrooms': bedrooms,
+        'bathrooms': bathrooms,
+        'year_built': year_built,
+        'neighborhood_code': np.array(NEIGHBORHOODS)[neighborhood],
+        'garage_spaces': garage_spaces,
+        'condition_score': condition_score,
+        'exterior_type': np.array(EXTERIOR_TYPES)[exterior_type],
+        'price': price,
+    }
+
+
+# CSV lines end like csv.DictWriter's (excel dialect, '\r\n'), so every
+# writer produces the same bytes and shards concatenate cleanly
+CSV_HEADER = ','.join(FIELDNAMES) + csv.excel.lineterminator
+# One CSV line per house, fields in FIELDNAMES order
+CSV_ROW_FORMAT = ','.join(['{}'] * len(FIELDNAMES)) + csv.excel.lineterminator
+
+
+def format_csv_rows(columns):
+    """Render a chunk of columns as CSV text (no header)."""
+    # Python floats print as their shortest repr (e.g. 132900.83), matching
+    # csv.DictWriter output; str.format over lists is ~2x faster than
+    # joining NumPy string arrays
+    values = [columns[name].tolist() for name in FIELDNAMES]
+    return ''.join(map(CSV_ROW_FORMAT.format, *values))
+
+
+def iter_house_chunks_vectorized(num_rows, start_id, seed_offset=0, shard_index=0,
+                                 chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Yield column chunks from the vectorized generator.
+    
+    Each chunk draws from its own generator seeded by (RANDOM_SEED,
+    seed_offset, shard_index, chunk index), so only one chunk is in memory
+    at a time and the rows are fully determined by those values.
+    """
+    import numpy as np
+    
+    for chunk_index, chunk_start in enumerate(range(0, num_rows, chunk_rows)):
+        rng = np.random.default_rng([RANDOM_SEED, seed_offset, shard_index, chunk_index])
+        size = min(chunk_rows, num_rows - chunk_start)
+        yield generate_houses_vectorized(rng, start_id + chunk_start, size)
+
+
+def records_to_columns(records):
+    """Turn a list of house records into a dict of NumPy column arrays."""
+    import numpy as np
     
-    with open(output_path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(houses)
+    return {name: np.array([record[name] for record in records]) for name in FIELDNAMES}
+
+
+def write_csv(path, chunks, header=True):
+    """Stream column chunks to a CSV file."""
+    with open(path, 'w', newline='') as f:
+        if header:
+            f.write(CSV_HEADER)
+        for columns in chunks:
+            f.write(format_csv_rows(columns))
+
+
+def parquet_schema():
+    """
+    Arrow schema for house files.
+    
+    Integer and float columns keep the dtypes pandas infers from the CSV;
+    categorical columns are dictionary-encoded against their full, sorted
+    vocabulary, so every row group (and file) shares the same categories.
+    """
+    import pyarrow as pa
+    
+    category = pa.dictionary(pa.int8(), pa.string())
+    types = {
+        'bathrooms': pa.float64(),
+        'price': pa.float64(),
+        'neighborhood_code': category,
+        'exterior_type': category,
+    }
+    return pa.schema([(name, types.get(name, pa.int64())) for name in FIELDNAMES])
+
+
+def columns_to_table(columns, schema):
+    """Build an Arrow table from column arrays."""
+    import numpy as np
+    import pyarrow as pa
+    
+    vocabularies = {'neighborhood_code': NEIGHBORHOODS, 'exterior_type': EXTERIOR_TYPES}
+    arrays = []
+    for field in schema:
+        values = columns[field.name]
+        if field.name in vocabularies:
+            levels = np.array(sorted(vocabularies[field.name]))
+            indices = np.searchsorted(levels, values).astype(np.int8)
+            arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(levels)))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_parquet(path, chunks, row_group_rows=PARQUET_ROW_GROUP_ROWS):
+    """Stream column chunks to a Parquet file in row groups of row_group_rows."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit('[ERROR] Parquet output requires pyarrow (pip install pyarrow)')
+    
+    schema = parquet_schema()
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for columns in chunks:
+            writer.write_table(columns_to_table(columns, schema), row_group_size=row_group_rows)
+
+
+def generate_dataset_vectorized(output_path, num_rows, start_id, seed_offset=0,
+                                chunk_rows=DEFAULT_CHUNK_ROWS, fmt='csv'):
+    """Generate a dataset with the vectorized generator, streaming it to CSV (or Parquet)."""
+    chunks = iter_house_chunks_vectorized(num_rows, start_id, seed_offset, chunk_rows=chunk_rows)
+    if fmt == 'parquet':
+        write_parquet(output_path, chunks)
+    else:
+        write_csv(output_path, chunks)
     
     print(f"✓ Created {output_path} with {num_rows} rows")
 
 
+def plan_shards(num_rows, start_id, shards):
+    """
+    Split a dataset's rows into contiguous shards.
+    
+    Returns:
+        List of (shard_index, start_id, num_rows), skipping empty shards
+    """
+    rows_per_shard = -(-num_rows // shards)
+    plan = []
+    for shard_index in range(shards):
+        first = shard_index * rows_per_shard
+        size = min(rows_per_shard, num_rows - first)
+        if size > 0:
+            plan.append((shard_index, start_id + first, size))
+    return plan
+
+
+def generate_shard(task):
+    """
+    Process pool worker: write one shard file.
+    
+    Args:
+        task: Tuple of (path, num_rows, start_id, seed_offset, shard_index,
+            vectorized, chunk_rows, fmt, header)
+    
+    Returns:
+        The shard path
+    """
+    path, num_rows, start_id, seed_offset, shard_index, vectorized, chunk_rows, fmt, header = task
+    if vectorized:
+        chunks = iter_house_chunks_vectorized(num_rows, start_id, seed_offset, shard_index,
+                                              chunk_rows)
+        if fmt == 'parquet':
+            write_parquet(path, chunks)
+        else:
+            write_csv(path, chunks, header)
+    elif fmt == 'parquet':
+        write_parquet(path, (records_to_columns(chunk) for chunk in
+                             iter_house_chunks(num_rows, start_id, seed_offset)))
+    else:
+        # Per-house rows are seeded by id, so sharding doesn't change them
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+            if header:
+                writer.writeheader()
+            for chunk in iter_house_chunks(num_rows, start_id, seed_offset):
+                writer.writerows(chunk)
+    return path
+
+
+def concat_shards(output_path, paths, fmt):
+    """Merge shard files (CSV parts without headers, or Parquet files) into one file."""
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        with pq.ParquetWriter(output_path, parquet_schema(), compression='zstd') as writer:
+            for path in paths:
+                for batch in pq.ParquetFile(path).iter_batches(batch_size=PARQUET_ROW_GROUP_ROWS):
+                    writer.write_batch(batch, row_group_size=PARQUET_ROW_GROUP_ROWS)
+    else:
+        with open(output_path, 'wb') as out:
+            out.write(CSV_HEADER.encode())
+            for path in paths:
+                with open(path, 'rb') as part:
+                    shutil.copyfileobj(part, out, 16 * 1024 * 1024)
+    for path in paths:
+        path.unlink()
+
+
+def remove_split_files(output_dir, name):
+    """Remove a split's data files from earlier runs (any format, sharded or not)."""
+    for ext in FORMATS:
+        for stale in [output_dir / f'{name}.{ext}', *output_dir.glob(f'{name}-*-of-*.{ext}')]:
+            stale.unlink(missing_ok=True)
+
+
+def generate_splits_sharded(output_dir, splits, shards, workers, vectorized,
+                            chunk_rows=DEFAULT_CHUNK_ROWS, concat=False, fmt='csv'):
+    """
+    Generate every split as shards on a process pool.
+    
+    Shards are seeded from (RANDOM_SEED, seed_offset, shard index), so the
+    output depends on the shard count but never on the worker count.
+    
+    Args:
+        output_dir: Directory for the data files
+        splits: List of (name, num_rows, start_id, seed_offset)
+        shards: Shards per split
+        workers: Worker processes
+        vectorized: Use the vectorized generator
+        chunk_rows: Rows per chunk in vectorized mode
+        concat: Concatenate each split's shards into <split>.<fmt> instead
+            of keeping <split>-NNNNN-of-NNNNN.<fmt> shard files
+        fmt: 'csv' or 'parquet'
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    tasks, outputs = [], {}
+    for name, num_rows, start_id, seed_offset in splits:
+        # Remove files from earlier runs so MLTable never picks up stale shards
+        remove_split_files(output_dir, name)
+        
+        paths = []
+        for shard_index, shard_start, size in plan_shards(num_rows, start_id, shards):
+            if concat:
+                path = output_dir / f'.{name}-{shard_index:05d}.part'
+            else:
+                path = output_dir / f'{name}-{shard_index:05d}-of-{shards:05d}.{fmt}'
+            tasks.append((str(path), size, shard_start, seed_offset, shard_index,
+                          vectorized, chunk_rows, fmt, not concat))
+            paths.append(path)
+        outputs[name] = (paths, num_rows)
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(generate_shard, tasks))
+    
+    for name, (paths, num_rows) in outputs.items():
+        if concat:
+            output_path = output_dir / f'{name}.{fmt}'
+            concat_shards(output_path, paths, fmt)
+            print(f"✓ Created {output_path} with {num_rows} rows from {len(paths)} shard(s)")
+        else:
+            print(f"✓ Created {len(paths)} shard file(s) for {name} with {num_rows} rows")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Generate synthetic house price datasets'
@@ -161,6 +501,20 @@ def main():
                        help='Number of validation rows (default: 75)')
     parser.add_argument('--test-rows', type=int, default=75,
                        help='Number of test rows (default: 75)')
+    parser.add_argument('--vectorized', action='store_true',
+                       help='Use the NumPy generator for large datasets (requires numpy)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                       help=f'Rows per chunk in vectorized mode (default: {DEFAULT_CHUNK_ROWS})')
+    parser.add_argument('--shards', type=int, default=1,
+                       help='Shards per split, generated in parallel (default: 1)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Worker processes for sharded generation, used with '
+                            '--shards > 1 (default: 1)')
+    parser.add_argument('--concat', action='store_true',
+                       help='Concatenate shards into one file per split instead of '
+                            'keeping <split>-NNNNN-of-NNNNN shard files')
+    parser.add_argument('--format', choices=FORMATS, default='csv',
+                       help='Output format (default: csv; parquet requires pyarrow)')
     
     args = parser.parse_args()
     
@@ -174,26 +528,25 @@ def main():
     print()
     
     # Generate datasets with different seed offsets to ensure variety
-    generate_dataset(
-        output_dir / 'train.csv',
-        num_rows=args.train_rows,
-        start_id=1,
-        seed_offset=0
-    )
-    
-    generate_dataset(
-        output_dir / 'val.csv',
-        num_rows=args.val_rows,
-        start_id=args.train_rows + 1,
-        seed_offset=1000
-    )
-    
-    generate_dataset(
-        output_dir / 'test.csv',
-        num_rows=args.test_rows,
-        start_id=args.train_rows + args.val_rows + 1,
-        seed_offset=2000
-    )
+    splits = [
+        ('train', args.train_rows, 1, 0),
+        ('val', args.val_rows, args.train_rows + 1, 1000),
+        ('test', args.test_rows, args.train_rows + args.val_rows + 1, 2000),
+    ]
+    
+    # A single shard has nothing to parallelize, so it's written as <split>.<fmt>
+    if args.shards > 1:
+        generate_splits_sharded(output_dir, splits, args.shards, args.workers,
+                                args.vectorized, args.chunk_rows, args.concat, args.format)
+    else:
+        for name, num_rows, start_id, seed_offset in splits:
+            remove_split_files(output_dir, name)
+            output_path = output_dir / f'{name}.{args.format}'
+            if args.vectorized:
+                generate_dataset_vectorized(output_path, num_rows, start_id, seed_offset,
+                                            chunk_rows=args.chunk_rows, fmt=args.format)
+            else:
+                generate_dataset(output_path, num_rows, start_id, seed_offset, fmt=args.format)
     
     print()
     print(f"✓ Successfully generated {args.train_rows + args.val_rows + args.test_rows} total rows")
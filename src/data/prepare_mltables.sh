@@ -1,7 +1,8 @@
 #!/usr/bin/env bash
 #
 # prepare_mltables.sh
-# Copy CSV files into MLTable directories for self-contained upload to Azure ML
+# Copy CSV (or Parquet) files into MLTable directories for self-contained
+# upload to Azure ML
 #
 
 set -euo pipefail
@@ -10,21 +11,63 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 RAW_DIR="${SCRIPT_DIR}/raw"
 MLTABLE_DIR="${SCRIPT_DIR}/mltable"
 
-echo "[prepare] Copying CSV files into MLTable directories..."
+echo "[prepare] Copying data files into MLTable directories..."
 
-# Copy each CSV file into its corresponding MLTable directory
+# Write an MLTable definition that reads the given CSV or Parquet files
+write_mltable() {
+  local dest_dir="$1"
+  local format="$2"
+  shift 2
+  {
+    echo "paths:"
+    for file in "$@"; do
+      echo "  - file: ./${file}"
+    done
+    echo "transformations:"
+    if [[ "$format" == "parquet" ]]; then
+      echo "  - read_parquet:"
+      echo "      include_path_column: false"
+    else
+      echo "  - read_delimited:"
+      echo "      delimiter: ','"
+      echo "      header: all_files_same_headers"
+    fi
+  } > "${dest_dir}/MLTable"
+}
+
+# Copy each split's data file (or its shard files) into its MLTable directory.
+# Parquet output from generate_synthetic_data.py --format parquet is used
+# when present, otherwise CSV.
 for split in train val test; do
-  src="${RAW_DIR}/${split}.csv"
-  dest="${MLTABLE_DIR}/${split}/${split}.csv"
+  dest_dir="${MLTABLE_DIR}/${split}"
+  
+  format=csv
+  if compgen -G "${RAW_DIR}/${split}.parquet" > /dev/null \
+     || compgen -G "${RAW_DIR}/${split}-*-of-*.parquet" > /dev/null; then
+    format=parquet
+  fi
+  shards=( "${RAW_DIR}/${split}"-*-of-*."${format}" )
+  
+  # Clear data files from a previous layout (single file vs shards, CSV vs Parquet)
+  rm -f "${dest_dir}"/*.csv "${dest_dir}"/*.parquet
+  
+  if [[ -f "${shards[0]}" ]]; then
+    echo "  [copy] ${#shards[@]} ${split} shard(s) -> mltable/${split}/"
+    cp "${shards[@]}" "${dest_dir}/"
+    write_mltable "$dest_dir" "$format" $(cd "$RAW_DIR" && ls "${split}"-*-of-*."${format}")
+    continue
+  fi
   
+  src="${RAW_DIR}/${split}.${format}"
   if [[ ! -f "$src" ]]; then
     echo "  [ERROR] Source file not found: $src"
     exit 1
   fi
   
-  echo "  [copy] ${split}.csv -> mltable/${split}/"
-  cp "$src" "$dest"
+  echo "  [copy] ${split}.${format} -> mltable/${split}/"
+  cp "$src" "${dest_dir}/${split}.${format}"
+  write_mltable "$dest_dir" "$format" "${split}.${format}"
 done
 
-echo "[prepare] ✓ All CSV files copied. MLTable directories are now self-contained."
+echo "[prepare] ✓ All data files copied. MLTable directories are now self-contained."
 echo "[prepare] You can now run: cd ../../ml-pipeline && ./register_data.sh"
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Offline batch scoring for large house files.
+
+Scores the MLTable splits under src/data/mltable/ or any CSV or Parquet
+file without going through the HTTP endpoint. Each input file is split
+into shards (byte ranges of a CSV, row groups of a Parquet file) that a
+pool of worker processes read, encode and score in parallel. Every worker
+loads the model once, using the same loading code as score.py, and checks
+every shard with the model's RecordValidator before scoring it, as the
+endpoint does. Predictions for the valid rows are written in input order
+to CSV or Parquet; rejected rows are not scored and are written with their
+validation errors to <file>_rejected.csv instead.
+
+Example:
+    python batch_score.py \\
+      --model-dir ../ml-pipeline/outputs \\
+      --input ../data/mltable/test \\
+      --output-dir ./predictions
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import score
+
+# Loaded once per worker process by _init_worker()
+_worker_model = None
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Score house CSV or Parquet files offline with a trained model"
+    )
+    parser.add_argument(
+        "--model-dir",
+        required=True,
+        help="Directory containing the model artifacts (forest/ or model.pkl)",
+    )
+    parser.add_argument(
+        "--input",
+        required=True,
+        nargs="+",
+        help="CSV or Parquet files, or MLTable directories (every *.csv and "
+             "*.parquet inside is scored; Parquet needs pyarrow)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="./predictions",
+        help="Directory for prediction files (default: ./predictions)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Output format (default: csv; parquet needs pyarrow)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--shard-mb",
+        type=float,
+        default=32,
+        help="Approximate shard size in MB (default: 32)",
+    )
+    return parser.parse_args()
+
+
+def resolve_inputs(paths):
+    """Expand MLTable directories into the CSV and Parquet files they contain."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.suffix in (".csv", ".parquet")))
+        elif path.is_file():
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"Input not found: {path}")
+    return files
+
+
+def plan_tasks(path, shard_bytes):
+    """
+    Split an input file into shard tasks for _score_shard().
+
+    CSV files are split into byte ranges of roughly shard_bytes each.
+    Parquet files are split by row group (generate_synthetic_data.py
+    writes 128k-row groups), which can be read independently.
+
+    Args:
+        path: CSV or Parquet file
+        shard_bytes: Approximate CSV shard size in bytes
+
+    Returns:
+        List of ("csv", path, header, start, end) or ("parquet", path,
+        row group) tuples, in file order
+    """
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("[ERROR] Parquet input requires pyarrow (pip install pyarrow)")
+        return [("parquet", str(path), group)
+                for group in range(pq.ParquetFile(path).num_row_groups)]
+    header, ranges = plan_shards(path, shard_bytes)
+    return [("csv", str(path), header, start, end) for start, end in ranges]
+
+
+def plan_shards(path, shard_bytes):
+    """
+    Split a CSV file into byte ranges of roughly shard_bytes each.
+
+    Returns:
+        Tuple of (header column names, list of (start, end) byte ranges)
+    """
+    with open(path, "rb") as f:
+        header = f.readline().decode("utf-8").strip().split(",")
+        data_start = f.tell()
+    size = os.path.getsize(path)
+    starts = range(data_start, max(size, data_start + 1), max(int(shard_bytes), 1))
+    return header, [(start, min(start + int(shard_bytes), size)) for start in starts]
+
+
+def read_shard(path, start, end):
+    """
+    Read the CSV lines that start inside [start, end).
+
+    A line that straddles the end of the range belongs to this shard; the
+    partial line at the start of the range belongs to the previous one.
+    """
+    with open(path, "rb") as f:
+        f.seek(start - 1)
+        f.readline()  # finish the line that began before start
+        position = f.tell()
+        if position >= end:
+            return b""
+        data = f.read(end - position)
+        if data and not data.endswith(b"\n"):
+            data += f.readline()
+        return data
+
+
+def _init_worker(model_dir):
+    """Load the model once in each worker process."""
+    global _worker_model
+    _worker_model = score.load_scoring_model(model_dir, "batch")
+
+
+def load_shard(task, categorical_features):
+    """
+    Read one shard task from plan_tasks() as a DataFrame.
+
+    Args:
+        task: Shard task tuple
+        categorical_features: Columns to read as strings
+
+    Returns:
+        DataFrame, or None for a byte range holding no lines
+    """
+    if task[0] == "parquet":
+        import pyarrow.parquet as pq
+        _, path, group = task
+        # Dictionary-encoded columns arrive as categoricals of strings
+        return pq.ParquetFile(path).read_row_group(group).to_pandas()
+
+    _, path, header, start, end = task
+    data = read_shard(path, start, end)
+    if not data:
+        return None
+    return pd.read_csv(io.BytesIO(data), names=header, header=None,
+                       dtype={name: str for name in categorical_features})
+
+
+def _score_shard(task):
+    """
+    Validate and score one shard.
+
+    Returns:
+        Tuple of (ids or None, predictions with NaN for rejected rows,
+        list of per-row validation errors with shard row numbers)
+    """
+    df = load_shard(task, _worker_model.encoder.categorical_features)
+    if df is None or df.empty:
+        return None, np.empty(0), []
+
+    columns = {name: df[name].to_numpy() for name in df.columns}
+    ids = columns.get("id")
+    valid_rows, errors = _worker_model.validator.validate_columns(columns)
+    if not errors:
+        X = _worker_model.encoder.encode_columns(columns)
+        return ids, _worker_model.predictor.predict(X), []
+
+    predictions = np.full(len(df), np.nan)
+    if len(valid_rows):
+        X = _worker_model.encoder.encode_columns(
+            {name: values[valid_rows] for name, values in columns.items()}
+        )
+        predictions[valid_rows] = _worker_model.predictor.predict(X)
+    return ids, predictions, errors
+
+
+class PredictionWriter:
+    """Append prediction chunks to a CSV or Parquet file."""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self._parquet = None
+        self._started = False
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+                import pyarrow.parquet  # noqa: F401
+            except ImportError:
+                raise SystemExit("[ERROR] Parquet output requires pyarrow (pip install pyarrow)")
+
+    def write(self, ids, predictions, first_row):
+        """Write one chunk; without an id column, rows get their row number."""
+        if ids is None:
+            ids = np.arange(first_row, first_row + len(predictions))
+        chunk = pd.DataFrame({"id": ids, "predicted_price": predictions})
+
+        if self.fmt == "csv":
+            chunk.to_csv(self.path, mode="a" if self._started else "w",
+                         header=not self._started, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        self._started = True
+
+    def close(self):
+        """Finish the file (writes an empty file if nothing was scored)."""
+        if not self._started:
+            self.write(None, np.empty(0), 0)
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def write_rejected(path, ids, errors, append):
+    """
+    Append rejected rows to a CSV of id and validation errors (as JSON).
+
+    Args:
+        path: Rejected-rows CSV
+        ids: Ids (or row numbers) of the shard's rows
+        errors: Per-row errors from RecordValidator, with shard row numbers
+        append: Append to the file instead of starting it
+    """
+    chunk = pd.DataFrame({
+        "id": [ids[error["row"]] for error in errors],
+        "errors": [json.dumps(error["errors"]) for error in errors],
+    })
+    chunk.to_csv(path, mode="a" if append else "w", header=not append, index=False)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    print("=" * 60)
+    print("House Price Batch Scoring")
+    print("=" * 60)
+    print()
+
+    try:
+        inputs = resolve_inputs(args.input)
+    except FileNotFoundError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    if not inputs:
+        print("[ERROR] No CSV or Parquet files found in the given inputs")
+        sys.exit(1)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"[batch] Model: {args.model_dir}")
+    print(f"[batch] Workers: {args.workers}")
+
+    total_rows = 0
+    total_rejected = 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init_worker, initargs=(args.model_dir,)
+    ) as pool:
+        for path in inputs:
+            tasks = plan_tasks(path, args.shard_mb * 1024 * 1024)
+            out_path = output_dir / f"{path.stem}_predictions.{args.format}"
+            writer = PredictionWriter(out_path, args.format)
+
+            rejected_path = output_dir / f"{path.stem}_rejected.csv"
+            if rejected_path.exists():
+                rejected_path.unlink()
+
+            file_started = time.perf_counter()
+            file_rows = 0
+            file_rejected = 0
+            # map() yields shards in input order while workers run ahead
+            for ids, predictions, errors in pool.map(_score_shard, tasks):
+                n_rows = len(predictions)
+                if ids is None:
+                    ids = np.arange(file_rows, file_rows + n_rows)
+                if errors:
+                    write_rejected(rejected_path, ids, errors, append=file_rejected > 0)
+                    scored = ~np.isnan(predictions)
+                    ids, predictions = ids[scored], predictions[scored]
+                    file_rejected += len(errors)
+                writer.write(ids, predictions, file_rows)
+                file_rows += n_rows
+            writer.close()
+
+            elapsed = time.perf_counter() - file_started
+            print(f"[batch] {path} -> {out_path}: {file_rows:,} rows in {elapsed:.2f}s "
+                  f"({file_rows / elapsed:,.0f} rows/s, {len(tasks)} shard(s))")
+            if file_rejected:
+                print(f"[batch] {file_rejected:,} row(s) failed validation and were not "
+                      f"scored; see {rejected_path}")
+            total_rows += file_rows
+            total_rejected += file_rejected
+
+    elapsed = time.perf_counter() - started
+    print()
+    print("=" * 60)
+    print("Batch Scoring Complete")
+    print("=" * 60)
+    print(f"Rows scored: {total_rows - total_rejected:,}")
+    print(f"Rejected:    {total_rejected:,}")
+    print(f"Wall time:   {elapsed:.2f}s")
+    print(f"Throughput:  {total_rows / elapsed:,.0f} rows/s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
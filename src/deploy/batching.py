@@ -0,0 +1,206 @@
+"""
+Micro-batching request coalescer for the scoring endpoint.
+
+When the endpoint serves many small concurrent requests, each run() call
+would walk the forest for just a row or two. The MicroBatcher collects
+feature matrices from concurrent callers for a short, bounded window,
+scores them with a single predict() call and hands each caller back its
+own slice of the predictions.
+"""
+
+import collections
+import logging
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    """One caller's feature matrix waiting in the batch queue."""
+
+    __slots__ = ("X", "enqueued", "done", "result", "error")
+
+    def __init__(self, X):
+        self.X = X
+        self.enqueued = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent predict() calls into shared batches.
+
+    A background thread waits for the first queued request, then keeps
+    collecting until either max_batch_size rows are queued or max_wait_ms
+    has passed since that first request arrived. Requests that are already
+    max_batch_size rows or larger skip the queue and are scored directly,
+    as does everything submitted after close().
+    """
+
+    # Number of recent queueing delays kept for percentile reporting
+    DELAY_SAMPLES = 1024
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=2.0, log_interval_s=60.0):
+        """
+        Start the batching thread.
+
+        Args:
+            predict_fn: Function mapping a feature matrix to predictions
+            max_batch_size: Maximum rows scored in one coalesced batch
+            max_wait_ms: Longest time the first request in a batch may wait
+            log_interval_s: Seconds between stats log lines (0 disables)
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.predict_fn = predict_fn
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.log_interval = log_interval_s
+
+        self._cond = threading.Condition()
+        self._queue = collections.deque()
+        self._queued_rows = 0
+        self._closed = False
+
+        # Metrics (written by the batching thread, read by stats())
+        self._stats_lock = threading.Lock()
+        self._batch_rows = collections.Counter()
+        self._batches = 0
+        self._requests = 0
+        self._delays_ms = collections.deque(maxlen=self.DELAY_SAMPLES)
+        self._last_log = time.monotonic()
+
+        self._thread = threading.Thread(target=self._worker, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, X):
+        """
+        Score a feature matrix as part of a coalesced batch.
+
+        Blocks until this caller's predictions are ready.
+
+        Args:
+            X: Feature matrix (n_rows, n_features)
+
+        Returns:
+            NumPy array of predictions for the rows of X
+        """
+        if len(X) >= self.max_batch_size:
+            return self.predict_fn(X)
+
+        item = _Pending(X)
+        with self._cond:
+            if self._closed:
+                # A request that raced with a model swap still gets scored
+                return self.predict_fn(X)
+            self._queue.append(item)
+            self._queued_rows += len(X)
+            self._cond.notify()
+
+        item.done.wait()
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def close(self):
+        """Stop the batching thread after draining queued requests."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def stats(self):
+        """
+        Summarize batching behaviour so far.
+
+        Returns:
+            Dict with batch/request counts, the batch size distribution
+            (rows per batch -> number of batches) and queueing delay
+            percentiles in milliseconds
+        """
+        with self._stats_lock:
+            delays = np.array(self._delays_ms) if self._delays_ms else np.zeros(1)
+            batches, requests = self._batches, self._requests
+            batch_rows = dict(sorted(self._batch_rows.items()))
+
+        p50, p95, p99 = np.percentile(delays, [50, 95, 99])
+        return {
+            "batches": batches,
+            "requests": requests,
+            "mean_requests_per_batch": requests / batches if batches else 0.0,
+            "batch_rows": batch_rows,
+            "queue_delay_ms": {
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(delays.max()),
+            },
+        }
+
+    def _next_batch(self):
+        """Wait for and dequeue the next batch (empty list once closed)."""
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return []
+
+            # Keep collecting until the batch is full or the oldest request
+            # has waited max_wait
+            deadline = self._queue[0].enqueued + self.max_wait
+            while self._queued_rows < self.max_batch_size and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = [self._queue.popleft()]
+            rows = len(batch[0].X)
+            while self._queue and rows + len(self._queue[0].X) <= self.max_batch_size:
+                item = self._queue.popleft()
+                batch.append(item)
+                rows += len(item.X)
+            self._queued_rows -= rows
+            return batch
+
+    def _worker(self):
+        """Batching thread: score queued requests until closed."""
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            self._score(batch)
+
+    def _score(self, batch):
+        """Score one coalesced batch and fan the results back out."""
+        started = time.monotonic()
+
+        try:
+            X = batch[0].X if len(batch) == 1 else np.concatenate([item.X for item in batch])
+            predictions = self.predict_fn(X)
+            offset = 0
+            for item in batch:
+                item.result = predictions[offset:offset + len(item.X)]
+                offset += len(item.X)
+        except Exception as e:
+            for item in batch:
+                item.error = e
+        finally:
+            for item in batch:
+                item.done.set()
+
+        with self._stats_lock:
+            self._delays_ms.extend((started - item.enqueued) * 1000 for item in batch)
+            self._batches += 1
+            self._requests += len(batch)
+            self._batch_rows[sum(len(item.X) for item in batch)] += 1
+
+        if self.log_interval and started - self._last_log >= self.log_interval:
+            self._last_log = started
+            logger.info(f"Micro-batching stats: {self.stats()}")
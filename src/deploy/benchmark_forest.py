@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark the flat forest engine against scikit-learn's model.predict.
+
+Loads model.pkl, the forest/ bundle and feature_schema.json from a model
+directory (e.g. the ./outputs folder of a local train.py run), checks that
+both engines agree, and reports latency and throughput for a range of
+batch sizes.
+
+Example:
+    python benchmark_forest.py --model-dir ../ml-pipeline/outputs
+"""
+
+import argparse
+import csv
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from score import find_artifact, load_feature_encoder, load_feature_schema
+from forest_engine import FlatForest
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark flat forest scoring against scikit-learn"
+    )
+    parser.add_argument(
+        "--model-dir",
+        required=True,
+        help="Directory containing model.pkl and the forest/ bundle",
+    )
+    parser.add_argument(
+        "--data",
+        default=str(Path(__file__).parent.parent / "data" / "mltable" / "test" / "test.csv"),
+        help="CSV of houses to sample requests from (default: MLTable test split)",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        default="1,10,100,1000,10000",
+        help="Comma-separated batch sizes (default: 1,10,100,1000,10000)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=50,
+        help="Timed calls per batch size (default: 50)",
+    )
+    return parser.parse_args()
+
+
+def time_calls(fn, X, repeats):
+    """Return per-call latencies in milliseconds."""
+    fn(X)  # warm-up
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    model_path = find_artifact(args.model_dir, "model.pkl")
+    forest_path = find_artifact(args.model_dir, "forest")
+    if model_path is None or forest_path is None:
+        print(f"[ERROR] model.pkl and forest/ are both required in {args.model_dir}")
+        sys.exit(1)
+
+    model = joblib.load(model_path)
+    forest = FlatForest.load(forest_path)
+    encoder = load_feature_encoder(args.model_dir, load_feature_schema(args.model_dir))
+
+    with open(args.data, newline="") as f:
+        houses = list(csv.DictReader(f))
+    X_all = encoder.encode(
+        [
+            {k: (v if k in encoder.categorical_features else float(v)) for k, v in house.items()}
+            for house in houses
+        ]
+    )
+
+    # A pruned bundle scores differently from model.pkl by design, and a
+    # compact one stores float32 leaf values
+    pruned = len(forest.value) != sum(tree.tree_.node_count for tree in model.estimators_)
+    if pruned:
+        print("[WARNING] The forest bundle is pruned; skipping the parity check")
+    rtol = 1e-6 if forest.value.dtype == np.float32 else 1e-9
+
+    print("=" * 72)
+    print("Flat Forest Benchmark")
+    print("=" * 72)
+    print(f"Trees: {forest.n_estimators}   Max depth: {forest.max_depth}   "
+          f"Nodes: {len(forest.value)}")
+    print()
+    print(f"{'batch':>7}  {'sklearn p50 ms':>15}  {'flat p50 ms':>12}  "
+          f"{'speedup':>8}  {'flat rows/s':>12}")
+
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        X = X_all[np.arange(batch_size) % len(X_all)]
+
+        expected = model.predict(X)
+        actual = forest.predict(X)
+        if not pruned and not np.allclose(actual, expected, rtol=rtol, atol=0.0):
+            print(f"[ERROR] Predictions differ for batch size {batch_size}")
+            sys.exit(1)
+
+        sklearn_p50 = statistics.median(time_calls(model.predict, X, args.repeats))
+        flat_p50 = statistics.median(time_calls(forest.predict, X, args.repeats))
+        print(f"{batch_size:>7}  {sklearn_p50:>15.3f}  {flat_p50:>12.3f}  "
+              f"{sklearn_p50 / flat_p50:>7.1f}x  {batch_size / flat_p50 * 1000:>12,.0f}")
+
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
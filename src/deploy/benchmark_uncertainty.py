@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark uncertainty predictions against point predictions.
+
+Compares, for a range of batch sizes:
+- point: FlatForest.predict (what run() returns by default)
+- uncertainty: mean, std and quantiles from one FlatForest pass
+- per-tree loop: the same statistics from one scikit-learn
+  estimator.predict call per tree (only when model.pkl is present)
+
+Example:
+    python benchmark_uncertainty.py --model-dir ../ml-pipeline/outputs
+"""
+
+import argparse
+import csv
+import statistics
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from benchmark_forest import time_calls
+from score import find_artifact, load_feature_encoder, load_feature_schema
+from forest_engine import FlatForest, tree_distribution
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark uncertainty predictions against point predictions"
+    )
+    parser.add_argument(
+        "--model-dir",
+        required=True,
+        help="Directory containing the forest/ bundle (and optionally model.pkl)",
+    )
+    parser.add_argument(
+        "--data",
+        default=str(Path(__file__).parent.parent / "data" / "mltable" / "test" / "test.csv"),
+        help="CSV of houses to sample requests from (default: MLTable test split)",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        default="1,10,100,1000,10000",
+        help="Comma-separated batch sizes (default: 1,10,100,1000,10000)",
+    )
+    parser.add_argument(
+        "--quantiles",
+        default="0.05,0.5,0.95",
+        help="Comma-separated quantiles (default: 0.05,0.5,0.95)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=20,
+        help="Timed calls per batch size (default: 20)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    forest_path = find_artifact(args.model_dir, "forest")
+    if forest_path is None:
+        print(f"[ERROR] forest/ bundle not found in {args.model_dir}")
+        sys.exit(1)
+    forest = FlatForest.load(forest_path)
+    model_path = find_artifact(args.model_dir, "model.pkl")
+    model = joblib.load(model_path) if model_path is not None else None
+    encoder = load_feature_encoder(args.model_dir, load_feature_schema(args.model_dir))
+    quantiles = [float(q) for q in args.quantiles.split(",")]
+
+    with open(args.data, newline="") as f:
+        houses = list(csv.DictReader(f))
+    X_all = encoder.encode(
+        [
+            {k: (v if k in encoder.categorical_features else float(v)) for k, v in house.items()}
+            for house in houses
+        ]
+    )
+
+    def uncertainty(X):
+        return tree_distribution(forest.tree_predictions(X), quantiles)
+
+    def per_tree_loop(X):
+        X32 = X.astype(np.float32)
+        return tree_distribution(np.stack([t.predict(X32) for t in model.estimators_]), quantiles)
+
+    print("=" * 78)
+    print("Uncertainty Benchmark")
+    print("=" * 78)
+    print(f"Trees: {forest.n_estimators}   Quantiles: {args.quantiles}")
+    print()
+    print(f"{'batch':>7}  {'point p50 ms':>13}  {'uncert p50 ms':>14}  {'overhead':>9}  "
+          f"{'per-tree loop ms':>17}")
+
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        X = X_all[np.arange(batch_size) % len(X_all)]
+
+        mean, _, _ = uncertainty(X)
+        if not np.allclose(mean, forest.predict(X), rtol=1e-12, atol=0.0):
+            print(f"[ERROR] Uncertainty mean differs from the point prediction "
+                  f"for batch size {batch_size}")
+            sys.exit(1)
+
+        point_p50 = statistics.median(time_calls(forest.predict, X, args.repeats))
+        uncert_p50 = statistics.median(time_calls(uncertainty, X, args.repeats))
+        if model is not None:
+            loop = f"{statistics.median(time_calls(per_tree_loop, X, args.repeats)):>17.3f}"
+        else:
+            loop = f"{'n/a':>17}"
+        print(f"{batch_size:>7}  {point_p50:>13.3f}  {uncert_p50:>14.3f}  "
+              f"{uncert_p50 / point_p50 - 1:>+8.0%}  {loop}")
+
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
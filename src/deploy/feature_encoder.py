@@ -0,0 +1,269 @@
+"""
+Fast feature encoder for the house price scoring path.
+
+Turns a list of JSON records straight into the float64 feature matrix the
+model was trained on, without building a pandas DataFrame per request.
+All column positions, one-hot slots and ordinal category codes come from
+the encoder fitted in training (src/ml-pipeline/feature_pipeline.py), so
+the per-request work is just filling a NumPy array.
+"""
+
+import itertools
+import operator
+
+import numpy as np
+
+
+ENCODER_FORMAT = "feature-encoder"
+
+
+class FeatureEncoder:
+    """
+    Encode raw house records into the model's feature matrix.
+
+    The encoder is built once (at endpoint init) from the encoder.json that
+    train.py fits and saves with the model: integer lookups from each
+    numeric field and each categorical level to its feature column. A
+    level without a column (the dropped baseline, or an unknown value)
+    encodes as all zeros, exactly as in training. Models with native
+    categorical support (histogram gradient boosting) instead get one
+    column per categorical field holding the level's ordinal code, with
+    NaN for unknown levels. Models saved before
+    encoder.json existed are handled by from_schema(), which derives the
+    same lookups from the ``pd.get_dummies`` column names
+    (``<column>_<level>``).
+    """
+
+    def __init__(self, feature_columns, numeric_index, category_slots, category_codes=None):
+        """
+        Precompute the per-request lookups.
+
+        Args:
+            feature_columns: Model feature columns in training order
+            numeric_index: Dict of numeric input field -> feature column
+                position
+            category_slots: Dict of one-hot categorical input field -> {level:
+                feature column position} (levels without a column are omitted)
+            category_codes: Optional dict of ordinal categorical input field ->
+                (feature column position, {level: code})
+        """
+        self.feature_columns = list(feature_columns)
+        self.n_features = len(self.feature_columns)
+        category_codes = category_codes or {}
+
+        positions = [*numeric_index.values()] + [
+            position for slots in category_slots.values() for position in slots.values()
+        ] + [position for position, _ in category_codes.values()]
+        if any(not 0 <= position < self.n_features for position in positions):
+            raise ValueError(f"Encoder positions out of range for {self.n_features} features")
+
+        self.numeric_features = list(numeric_index)
+        self.categorical_features = list(category_slots) + list(category_codes)
+        self.required_columns = self.numeric_features + self.categorical_features
+
+        # Positions of the numeric inputs inside the feature matrix
+        self._numeric_index = np.array(
+            [numeric_index[name] for name in self.numeric_features], dtype=np.intp
+        )
+        self._numeric_values = (
+            operator.itemgetter(*self.numeric_features)
+            if len(self.numeric_features) > 1
+            else lambda record, name=self.numeric_features[0]: (record[name],)
+        )
+
+        # Per categorical field: level -> one-hot column position
+        self._category_slots = [
+            (name, {str(level): int(position) for level, position in slots.items()})
+            for name, slots in category_slots.items()
+        ]
+        # Per ordinal categorical field: column position and level -> code
+        self._category_codes = [
+            (name, int(position), {str(level): float(code) for level, code in codes.items()})
+            for name, (position, codes) in category_codes.items()
+        ]
+
+    @classmethod
+    def from_dict(cls, spec):
+        """
+        Build an encoder from the fitted state train.py saves as encoder.json.
+
+        Args:
+            spec: Dict with feature_columns, numeric (field -> position),
+                categorical (field -> {level: position}) and, for ordinal
+                encoding, ordinal (field -> {position, codes})
+
+        Returns:
+            FeatureEncoder instance
+        """
+        if spec.get("format") != ENCODER_FORMAT:
+            raise ValueError("Not a feature encoder spec")
+        category_codes = {
+            name: (entry["position"], entry["codes"])
+            for name, entry in (spec.get("ordinal") or {}).items()
+        }
+        return cls(spec["feature_columns"], spec["numeric"], spec["categorical"], category_codes)
+
+    @classmethod
+    def from_schema(cls, schema):
+        """
+        Build an encoder from a feature schema written by train.py.
+
+        Used for models saved without encoder.json: the lookups are derived
+        from the one-hot column names.
+
+        Args:
+            schema: Dict with feature_columns, numeric_features and
+                categorical_features (field -> levels)
+
+        Returns:
+            FeatureEncoder instance
+        """
+        feature_columns = schema["feature_columns"]
+        column_index = {name: i for i, name in enumerate(feature_columns)}
+
+        missing = [name for name in schema["numeric_features"] if name not in column_index]
+        if missing:
+            raise ValueError(f"Numeric features not in feature columns: {missing}")
+
+        category_slots = {}
+        for name, levels in schema["categorical_features"].items():
+            category_slots[name] = {
+                level: column_index[f"{name}_{level}"]
+                for level in levels
+                if f"{name}_{level}" in column_index
+            }
+        return cls(
+            feature_columns,
+            {name: column_index[name] for name in schema["numeric_features"]},
+            category_slots,
+        )
+
+    def encode(self, records, out=None):
+        """
+        Encode records into a float64 feature matrix.
+
+        Args:
+            records: List of dicts with the raw input fields
+            out: Optional preallocated array of shape
+                (len(records), n_features) to fill in place
+
+        Returns:
+            NumPy array of shape (len(records), n_features)
+        """
+        n_rows = len(records)
+        if out is None:
+            X = np.zeros((n_rows, self.n_features), dtype=np.float64)
+        else:
+            X = out
+            X.fill(0.0)
+
+        try:
+            numeric = np.fromiter(
+                itertools.chain.from_iterable(map(self._numeric_values, records)),
+                dtype=np.float64,
+                count=n_rows * len(self.numeric_features),
+            ).reshape(n_rows, len(self.numeric_features))
+            X[:, self._numeric_index] = numeric
+
+            rows = np.arange(n_rows)
+            for name, slots in self._category_slots:
+                cols = np.fromiter(
+                    (slots.get(record[name], -1) for record in records),
+                    dtype=np.intp,
+                    count=n_rows,
+                )
+                hit = cols >= 0
+                X[rows[hit], cols[hit]] = 1.0
+
+            for name, position, codes in self._category_codes:
+                X[:, position] = np.fromiter(
+                    (codes.get(record[name], np.nan) for record in records),
+                    dtype=np.float64,
+                    count=n_rows,
+                )
+        except KeyError:
+            # Only pay for the full column check when something is missing
+            raise ValueError(
+                f"Missing required columns: {self.missing_columns(records)}"
+            ) from None
+
+        return X
+
+    def encode_columns(self, columns, out=None):
+        """
+        Encode column arrays (e.g. from a CSV chunk) into the feature matrix.
+
+        The columnar counterpart of encode(): numeric columns are copied in
+        as whole arrays and each categorical column is mapped to one-hot
+        slots (or ordinal codes) through its distinct values, with no
+        per-row Python work.
+
+        Args:
+            columns: Dict of input field -> 1-D array-like of values
+            out: Optional preallocated array of shape (n_rows, n_features)
+                to fill in place
+
+        Returns:
+            NumPy array of shape (n_rows, n_features)
+        """
+        missing = {name for name in self.required_columns if name not in columns}
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+
+        n_rows = len(columns[self.required_columns[0]])
+        if out is None:
+            X = np.zeros((n_rows, self.n_features), dtype=np.float64)
+        else:
+            X = out
+            X.fill(0.0)
+
+        for name, position in zip(self.numeric_features, self._numeric_index):
+            X[:, position] = np.asarray(columns[name], dtype=np.float64)
+
+        rows = np.arange(n_rows)
+        for name, slots in self._category_slots:
+            levels, inverse = np.unique(np.asarray(columns[name]).astype(str), return_inverse=True)
+            level_cols = np.array([slots.get(level, -1) for level in levels], dtype=np.intp)
+            cols = level_cols[inverse.reshape(-1)]
+            hit = cols >= 0
+            X[rows[hit], cols[hit]] = 1.0
+
+        for name, position, codes in self._category_codes:
+            levels, inverse = np.unique(np.asarray(columns[name]).astype(str), return_inverse=True)
+            level_codes = np.array([codes.get(level, np.nan) for level in levels], dtype=np.float64)
+            X[:, position] = level_codes[inverse.reshape(-1)]
+
+        return X
+
+    def row_keys(self, records):
+        """
+        Build a canonical, hashable key per record.
+
+        Numeric fields are normalized to float and categoricals to str, so
+        {"sqft": 1800} and {"sqft": 1800.0} share a key. Extra fields are
+        ignored.
+
+        Args:
+            records: List of dicts with the raw input fields
+
+        Returns:
+            List of tuples in required_columns order
+        """
+        numeric, categorical = self.numeric_features, self.categorical_features
+        try:
+            return [
+                tuple(float(record[name]) for name in numeric)
+                + tuple(str(record[name]) for name in categorical)
+                for record in records
+            ]
+        except KeyError:
+            raise ValueError(
+                f"Missing required columns: {self.missing_columns(records)}"
+            ) from None
+
+    def missing_columns(self, records):
+        """Return the set of required columns absent from any record."""
+        missing = set()
+        for record in records:
+            missing.update(name for name in self.required_columns if name not in record)
+        return missing
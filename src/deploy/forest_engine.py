@@ -0,0 +1,198 @@
+"""
+Array-backed random forest scoring engine.
+
+Loads the flattened forest bundle written by src/ml-pipeline/forest_export.py
+(a forest/ directory of .npy files) and evaluates every tree for a whole
+batch at once. Each step of the traversal is a few NumPy gathers over the
+node indices of all (tree, row) pairs, so there is no per-tree Python
+dispatch, no input validation and no thread pool setup on the request path.
+
+The arrays are stored in exactly the layout used at scoring time and are
+memory-mapped read-only, so loading is near-instant and every worker
+process on a node shares the same page-cache copy of the trees. Compact
+bundles (float32 thresholds and values, narrow integer indices) are
+scored as stored; compressed bundles (one arrays.npz) are decompressed
+into memory at load instead.
+"""
+
+import json
+import os
+
+import numpy as np
+
+# Node arrays in the forest bundle, one <name>.npy file each
+BUNDLE_ARRAYS = ("feature", "threshold", "children", "value", "roots")
+
+
+class FlatForest:
+    """
+    A random forest stored as contiguous node arrays.
+
+    Leaves point at themselves with an infinite threshold, so running
+    max_depth traversal steps always ends with every row on a leaf.
+    """
+
+    # Rows are scored in chunks so the working arrays stay cache-sized
+    CHUNK_ROWS = 2048
+
+    def __init__(self, feature, threshold, children, value, roots, max_depth, n_features,
+                 feature_columns=None):
+        """
+        Wrap the flattened node arrays (no copies are made).
+
+        Args:
+            feature: Split feature index per node (any integer dtype)
+            threshold: Split threshold per node (float64, or float32 rounded
+                down; +inf on leaves)
+            children: Interleaved child indices (int32 or int64):
+                children[2 * node + 1] is taken when x <= threshold,
+                children[2 * node] otherwise
+            value: Prediction value per node (float64 or float32)
+            roots: Global index of each tree's root node
+            max_depth: Depth of the deepest tree
+            n_features: Number of input feature columns
+            feature_columns: Optional feature column names in training order
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.n_estimators = len(roots)
+        self.feature_columns = feature_columns
+
+    @property
+    def nbytes(self):
+        """Total size of the node arrays in bytes."""
+        return sum(
+            a.nbytes for a in (self.feature, self.threshold, self.children, self.value, self.roots)
+        )
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a flat forest bundle directory.
+
+        Args:
+            path: Path to the forest/ bundle directory
+            mmap: Memory-map the node arrays read-only instead of reading
+                them into private memory (not possible for compressed
+                bundles, which are always read into memory)
+
+        Returns:
+            FlatForest instance
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+
+        if meta.get("storage") == "npz":
+            with np.load(os.path.join(path, "arrays.npz")) as bundle:
+                arrays = {name: bundle[name] for name in BUNDLE_ARRAYS}
+        else:
+            mmap_mode = "r" if mmap else None
+            arrays = {
+                name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+                for name in BUNDLE_ARRAYS
+            }
+        return cls(
+            max_depth=meta["max_depth"],
+            n_features=meta["n_features"],
+            feature_columns=meta.get("feature_columns"),
+            **arrays,
+        )
+
+    def apply(self, X):
+        """
+        Find the leaf each row lands in, for every tree.
+
+        Args:
+            X: Feature matrix (n_rows, n_features)
+
+        Returns:
+            Array of global leaf indices with shape (n_trees, n_rows)
+        """
+        # scikit-learn compares float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected feature matrix with {self.n_features} columns, got shape {X.shape}"
+            )
+
+        leaves = np.empty((self.n_estimators, X.shape[0]), dtype=np.intp)
+        for start in range(0, X.shape[0], self.CHUNK_ROWS):
+            chunk = X[start:start + self.CHUNK_ROWS]
+            leaves[:, start:start + len(chunk)] = self._apply_chunk(chunk)
+        return leaves
+
+    def _apply_chunk(self, X):
+        """Walk all trees for one chunk of rows, using flat 1-D gathers."""
+        n_rows = X.shape[0]
+        # Column-major copy so feature f of row r lives at f * n_rows + r
+        X_flat = np.ascontiguousarray(X.T).ravel()
+        row_offsets = np.tile(np.arange(n_rows), self.n_estimators)
+        node = np.repeat(self.roots, n_rows)
+
+        for _ in range(self.max_depth):
+            # Widen before scaling: compact bundles store feature as int8/int16
+            column = np.take(self.feature, node).astype(np.intp, copy=False)
+            x = np.take(X_flat, column * n_rows + row_offsets)
+            go_left = x <= np.take(self.threshold, node)
+            node = np.take(self.children, 2 * node + go_left)
+
+        return node.reshape(self.n_estimators, n_rows)
+
+    def tree_predictions(self, X):
+        """
+        Predict with every tree separately.
+
+        Args:
+            X: Feature matrix (n_rows, n_features)
+
+        Returns:
+            float64 array of per-tree predictions with shape (n_trees, n_rows)
+        """
+        return np.take(self.value, self.apply(X)).astype(np.float64, copy=False)
+
+    def predict(self, X):
+        """
+        Predict prices for a batch.
+
+        Args:
+            X: Feature matrix (n_rows, n_features)
+
+        Returns:
+            NumPy array of predictions, the mean over all trees
+        """
+        return self.tree_predictions(X).mean(axis=0)
+
+
+def tree_distribution(per_tree, quantiles=()):
+    """
+    Summarize the spread of per-tree predictions.
+
+    The spread across trees reflects how much the forest disagrees about a
+    house; it is not a calibrated prediction interval.
+
+    Args:
+        per_tree: Per-tree predictions with shape (n_trees, n_rows)
+        quantiles: Quantiles to compute, each between 0 and 1
+
+    Returns:
+        Tuple of (mean, std, quantile array with shape (len(quantiles), n_rows))
+    """
+    mean = per_tree.mean(axis=0)
+    std = per_tree.std(axis=0)
+
+    # Sort once and interpolate every quantile from the same sorted array
+    # (np.quantile's default "linear" method, several times faster than
+    # calling it with a list of quantiles)
+    n_trees = per_tree.shape[0]
+    position = np.asarray(quantiles, dtype=np.float64) * (n_trees - 1)
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, n_trees - 1)
+    weight = (position - lower)[:, None]
+    ordered = np.sort(per_tree, axis=0)
+    values = ordered[lower] * (1 - weight) + ordered[upper] * weight
+    return mean, std, values
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Load-test and latency benchmark for the scoring endpoint.
+
+Drives the scoring code with a configurable mix of request sizes and
+concurrency and reports throughput and latency percentiles. Houses come
+from generate_synthetic_data.generate_house, so payloads look like the
+training data. Two targets are supported:
+
+- inproc: imports score.py and calls init()/run() directly. This measures
+  the scoring code itself, with no HTTP overhead.
+- http: POSTs JSON to a scoring URL over keep-alive connections, e.g. a
+  local azureml-inference-server-http started with --start-server, or an
+  already running server or endpoint given by --url.
+
+Results can be saved as a baseline and later runs compared against it,
+so regressions in the scoring path show up before deployment.
+
+Examples:
+    # In-process, 8 threads, mostly single-house requests
+    python load_test.py --model-dir ../ml-pipeline/outputs \\
+      --concurrency 8 --mix 1:0.7,10:0.2,100:0.1 \\
+      --save-baseline baselines/inproc.json
+
+    # Local inference server, compared against a saved baseline
+    python load_test.py --target http --start-server \\
+      --model-dir ../ml-pipeline/outputs --baseline baselines/http.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "data"))
+from generate_synthetic_data import generate_house  # noqa: E402
+
+# Metrics compared against a baseline, and whether higher is better
+BASELINE_METRICS = {
+    "throughput_rps": True,
+    "throughput_rows_s": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+}
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Load-test the house price scoring endpoint"
+    )
+    parser.add_argument(
+        "--target",
+        choices=["inproc", "http"],
+        default="inproc",
+        help="Call score.run() in-process or POST to a server (default: inproc)",
+    )
+    parser.add_argument(
+        "--model-dir",
+        help="Model directory (required for inproc and --start-server)",
+    )
+    parser.add_argument(
+        "--url",
+        default="http://127.0.0.1:5001/score",
+        help="Scoring URL for the http target (default: http://127.0.0.1:5001/score)",
+    )
+    parser.add_argument(
+        "--api-key",
+        default=os.getenv("SCORE_API_KEY"),
+        help="Bearer token for the http target (default: $SCORE_API_KEY)",
+    )
+    parser.add_argument(
+        "--start-server",
+        action="store_true",
+        help="Start a local azmlinfsrv for score.py on the --url port",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Concurrent client threads (default: 4)",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=2000,
+        help="Timed requests to send (default: 2000)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=50,
+        help="Untimed warm-up requests (default: 50)",
+    )
+    parser.add_argument(
+        "--mix",
+        default="1:0.7,10:0.2,100:0.1",
+        help="Comma-separated batch_size:weight pairs (default: 1:0.7,10:0.2,100:0.1)",
+    )
+    parser.add_argument(
+        "--distinct-houses",
+        type=int,
+        default=100000,
+        help="Size of the house pool requests draw from; smaller pools "
+             "raise the prediction cache hit rate (default: 100000)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for the payload mix (default: 0)",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        help="Write the results to this JSON file",
+    )
+    parser.add_argument(
+        "--baseline",
+        help="Compare against this baseline JSON and exit 1 on a regression",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Allowed relative regression against the baseline (default: 0.15)",
+    )
+    return parser.parse_args()
+
+
+def parse_mix(mix):
+    """Parse "1:0.7,10:0.3" into ([1, 10], [0.7, 0.3])."""
+    sizes, weights = [], []
+    for part in mix.split(","):
+        size, _, weight = part.partition(":")
+        sizes.append(int(size))
+        weights.append(float(weight or 1))
+    return sizes, weights
+
+
+def build_payloads(sizes, weights, count, distinct_houses, seed):
+    """
+    Pre-generate request bodies so generation isn't part of the timing.
+
+    Args:
+        sizes: Batch sizes in the mix
+        weights: Relative weight of each batch size
+        count: Number of payloads
+        distinct_houses: Houses are drawn (by id) from this many
+        seed: Seed for picking sizes and house ids
+
+    Returns:
+        List of (batch_size, UTF-8 JSON body) tuples
+    """
+    rng = random.Random(seed)
+    houses = {}
+    payloads = []
+    for batch_size in rng.choices(sizes, weights=weights, k=count):
+        records = []
+        for house_id in (rng.randrange(distinct_houses) for _ in range(batch_size)):
+            if house_id not in houses:
+                house = generate_house(house_id, seed_offset=5000)
+                del house["id"], house["price"]
+                houses[house_id] = house
+            records.append(houses[house_id])
+        payloads.append((batch_size, json.dumps({"data": records}).encode("utf-8")))
+    return payloads
+
+
+def inproc_client(model_dir):
+    """Return a send(body) function that calls score.run() in this process."""
+    os.environ["AZUREML_MODEL_DIR"] = str(Path(model_dir).resolve())
+    import score
+    score.init()
+
+    def send(body):
+        # run() returns a dict, or an AMLResponse for compact responses
+        status, data = score.encode_response(score.run(body))
+        return status == 200 and b'"error"' not in data
+
+    return send
+
+
+def http_client(url, api_key=None):
+    """Return a send(body) function using one keep-alive connection per thread."""
+    parsed = urllib.parse.urlsplit(url)
+    connection_class = (
+        http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+    )
+    path = parsed.path or "/"
+    headers = {"Content-Type": "application/json"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    local = threading.local()
+
+    def send(body):
+        for attempt in range(2):
+            if getattr(local, "connection", None) is None:
+                local.connection = connection_class(parsed.netloc, timeout=60)
+            try:
+                local.connection.request("POST", path, body=body, headers=headers)
+                response = local.connection.getresponse()
+                data = response.read()
+                return response.status == 200 and b'"error"' not in data
+            except (http.client.HTTPException, ConnectionError):
+                # Server closed the keep-alive connection; reconnect once
+                local.connection.close()
+                local.connection = None
+                if attempt:
+                    raise
+        return False
+
+    return send
+
+
+def start_server(model_dir, url):
+    """
+    Start azmlinfsrv for score.py and wait until it answers.
+
+    Returns:
+        The server subprocess
+    """
+    port = urllib.parse.urlsplit(url).port or 5001
+    env = dict(os.environ, AZUREML_MODEL_DIR=str(Path(model_dir).resolve()))
+    server = subprocess.Popen(
+        ["azmlinfsrv", "--entry_script", "score.py", "--port", str(port)],
+        cwd=Path(__file__).parent,
+        env=env,
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"azmlinfsrv exited with code {server.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            connection.request("GET", "/")
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            pass
+        time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("azmlinfsrv did not become ready within 120s")
+
+
+def run_load(send, payloads, concurrency):
+    """
+    Send every payload with a pool of client threads.
+
+    Returns:
+        Tuple of (wall time in seconds, list of (batch_size, latency_ms, ok))
+    """
+    def timed(payload):
+        batch_size, body = payload
+        started = time.perf_counter()
+        try:
+            ok = send(body)
+        except Exception:
+            ok = False
+        return batch_size, (time.perf_counter() - started) * 1000, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(timed, payloads))
+    return time.perf_counter() - started, samples
+
+
+def summarize(latencies, rows, elapsed):
+    """Return throughput and latency percentiles for a set of samples."""
+    latencies = np.asarray(latencies)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0, 0, 0)
+    return {
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed,
+        "throughput_rows_s": rows / elapsed,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(latencies.max()) if len(latencies) else 0.0,
+    }
+
+
+def compare_baseline(results, baseline, tolerance):
+    """
+    Compare overall results against a baseline.
+
+    Returns:
+        List of regression messages (empty when within tolerance)
+    """
+    regressions = []
+    for metric, higher_is_better in BASELINE_METRICS.items():
+        before = baseline["overall"].get(metric)
+        after = results["overall"][metric]
+        if not before:
+            continue
+        change = (after - before) / before
+        regressed = change < -tolerance if higher_is_better else change > tolerance
+        marker = "REGRESSION" if regressed else "ok"
+        print(f"[load] {metric:<18} {before:>12.3f} -> {after:>12.3f}  ({change:+.1%})  {marker}")
+        if regressed:
+            regressions.append(f"{metric} changed {change:+.1%}")
+    return regressions
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    if (args.target == "inproc" or args.start_server) and not args.model_dir:
+        print("[ERROR] --model-dir is required for the inproc target and --start-server")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("House Price Scoring Load Test")
+    print("=" * 60)
+    print()
+
+    sizes, weights = parse_mix(args.mix)
+    print(f"[load] Target: {args.target}" + (f" ({args.url})" if args.target == "http" else ""))
+    print(f"[load] Concurrency: {args.concurrency}   Mix: {args.mix}   "
+          f"Requests: {args.requests}")
+
+    payloads = build_payloads(
+        sizes, weights, args.warmup + args.requests, args.distinct_houses, args.seed
+    )
+
+    server = None
+    try:
+        if args.target == "inproc":
+            send = inproc_client(args.model_dir)
+        else:
+            if args.start_server:
+                print("[load] Starting local azmlinfsrv...")
+                server = start_server(args.model_dir, args.url)
+            send = http_client(args.url, args.api_key)
+
+        run_load(send, payloads[:args.warmup], args.concurrency)
+        elapsed, samples = run_load(send, payloads[args.warmup:], args.concurrency)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    ok = [(size, ms) for size, ms, success in samples if success]
+    errors = len(samples) - len(ok)
+    results = {
+        "config": {
+            "target": args.target,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "requests": args.requests,
+            "distinct_houses": args.distinct_houses,
+        },
+        "errors": errors,
+        "overall": summarize([ms for _, ms in ok], sum(size for size, _ in ok), elapsed),
+        "by_batch_size": {
+            str(size): summarize(
+                [ms for s, ms in ok if s == size],
+                sum(s for s, _ in ok if s == size),
+                elapsed,
+            )
+            for size in sizes
+        },
+    }
+
+    print()
+    print(f"{'batch':>7}  {'requests':>9}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'max ms':>9}")
+    for label, summary in list(results["by_batch_size"].items()) + [("all", results["overall"])]:
+        print(f"{label:>7}  {summary['requests']:>9}  {summary['p50_ms']:>9.3f}  "
+              f"{summary['p95_ms']:>9.3f}  {summary['p99_ms']:>9.3f}  {summary['max_ms']:>9.3f}")
+    print()
+    print(f"Throughput: {results['overall']['throughput_rps']:,.0f} requests/s, "
+          f"{results['overall']['throughput_rows_s']:,.0f} rows/s")
+    print(f"Errors:     {errors}")
+
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"[load] Baseline saved to {args.save_baseline}")
+
+    failed = errors > 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != results["config"]:
+            print("[WARNING] Baseline was recorded with a different configuration")
+        print()
+        regressions = compare_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"[ERROR] Regressed against {args.baseline}: {', '.join(regressions)}")
+            failed = True
+
+    print("=" * 60)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
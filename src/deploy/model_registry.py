@@ -0,0 +1,303 @@
+"""
+In-process registry of loaded model versions for the scoring endpoint.
+
+Lets one scoring process serve several model versions side by side and
+roll out a retrained model without a redeploy:
+
+- Single-model mode: the model directory itself is the only version.
+- Multi-version mode: every subdirectory of the model directory is a
+  version (e.g. <model_dir>/3/, <model_dir>/4/). Non-default versions are
+  loaded lazily on first use and evicted least-recently-used when the
+  loaded models exceed a memory budget. A watcher thread rescans the
+  directory and, when a newer version appears (or the default version's
+  files change), loads it in the background and then swaps the default
+  pointer in one step. Requests already running keep the model object
+  they started with, so nothing is dropped during a swap.
+
+Copy new versions in atomically (write to a temporary name, then rename)
+so the watcher never sees a half-written directory.
+"""
+
+import collections
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def version_sort_key(version):
+    """Sort versions naturally, so "10" comes after "9"."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", version)]
+
+
+def directory_fingerprint(path):
+    """
+    Summarize a version directory so changes to its files can be detected.
+
+    Looks at the directory and one level of subdirectories, which covers
+    both flat artifacts and the registered outputs/ folder layout.
+
+    Args:
+        path: Version directory
+
+    Returns:
+        Hashable tuple of (relative path, mtime, size) entries
+    """
+    entries = []
+    for root in [path] + [e.path for e in os.scandir(path) if e.is_dir()]:
+        for entry in os.scandir(root):
+            stat = entry.stat()
+            entries.append((os.path.relpath(entry.path, path), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+class ModelRegistry:
+    """
+    Hold loaded model versions and route lookups to them.
+
+    The registry is generic over what a "model" is: it calls
+    loader(path, version) to load one, and expects the result to have a
+    size_bytes attribute and a close() method.
+    """
+
+    def __init__(self, model_dir, loader, multi_version=False, default_version=None,
+                 memory_budget_mb=512, poll_interval_s=10.0):
+        """
+        Discover versions and load the default one.
+
+        Args:
+            model_dir: Model directory (AZUREML_MODEL_DIR)
+            loader: Function (path, version) -> loaded model
+            multi_version: Treat each subdirectory of model_dir as a version
+            default_version: Pin the default version instead of following
+                the newest one
+            memory_budget_mb: Evict idle versions beyond this much memory
+            poll_interval_s: Seconds between directory rescans (0 disables
+                the watcher)
+        """
+        self.model_dir = model_dir
+        self.multi_version = multi_version
+        self.pinned_default = default_version
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.poll_interval = poll_interval_s
+        self._loader = loader
+
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._models = collections.OrderedDict()  # version -> model, LRU order
+        self._fingerprints = {}
+        self._available = {}
+        self._default = None
+        self.swaps = 0
+        self.evictions = 0
+
+        self.refresh()
+        if self._default is None:
+            raise FileNotFoundError(f"No model versions found under {model_dir}")
+
+        self._stop = threading.Event()
+        self._watcher = None
+        if multi_version and poll_interval_s > 0:
+            self._watcher = threading.Thread(
+                target=self._watch, name="model-registry-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    @property
+    def default_version(self):
+        """Version served when a request doesn't ask for one."""
+        return self._default
+
+    def discover(self):
+        """
+        List the model versions currently on disk.
+
+        Returns:
+            Dict of version -> directory path
+        """
+        if not self.multi_version:
+            version = os.path.basename(os.path.normpath(self.model_dir)) or "default"
+            return {version: self.model_dir}
+
+        return {
+            entry.name: entry.path
+            for entry in os.scandir(self.model_dir)
+            if entry.is_dir() and not entry.name.startswith((".", "_"))
+        }
+
+    def refresh(self):
+        """
+        Rescan the model directory and hot-swap the default if needed.
+
+        The new default is fully loaded before the pointer moves, so
+        requests never wait on a cold start.
+        """
+        with self._refresh_lock:
+            self._refresh()
+
+    def _refresh(self):
+        """Rescan and swap; callers hold the refresh lock."""
+        available = self.discover()
+        stale = []
+        with self._lock:
+            self._available = available
+            # Drop loaded non-default versions that were removed or changed
+            # on disk; they are reloaded lazily on next use
+            for version in list(self._models):
+                if version == self._default:
+                    continue
+                path = available.get(version)
+                if path is None or directory_fingerprint(path) != self._fingerprints.get(version):
+                    stale.append(self._models.pop(version))
+                    self._fingerprints.pop(version, None)
+        for model in stale:
+            model.close()
+
+        if self.pinned_default is not None:
+            target = self.pinned_default
+        elif available:
+            target = max(available, key=version_sort_key)
+        else:
+            target = None
+        if target is None or target not in available:
+            logger.warning(f"Default model version {target!r} not found under {self.model_dir}")
+            return
+
+        fingerprint = directory_fingerprint(available[target])
+        with self._lock:
+            current = self._models.get(target)
+            up_to_date = current is not None and fingerprint == self._fingerprints.get(target)
+        if up_to_date and target == self._default:
+            return
+
+        if up_to_date:
+            # Already loaded (e.g. lazily for a routed request): just promote it
+            loaded = current
+        else:
+            try:
+                loaded = self._loader(available[target], target)
+            except Exception as e:
+                # Keep serving the current default; the next poll retries
+                logger.error(f"Failed to load model version {target!r}: {e}")
+                if self._default is None:
+                    raise
+                return
+
+        with self._lock:
+            previous = self._models.pop(target, None)
+            self._models[target] = loaded
+            self._fingerprints[target] = fingerprint
+            if self._default is not None and self._default != target:
+                self.swaps += 1
+                logger.info(f"Default model version swapped: {self._default} -> {target}")
+            self._default = target
+        if previous is not None and previous is not loaded:
+            previous.close()
+        self._evict()
+
+    def get(self, version=None):
+        """
+        Return a loaded model, loading it on first use.
+
+        Args:
+            version: Model version, or None for the default version
+
+        Returns:
+            The loaded model object
+        """
+        with self._lock:
+            if version is None:
+                version = self._default
+            model = self._models.get(version)
+            if model is not None:
+                self._models.move_to_end(version)
+                return model
+            path = self._available.get(version)
+        if path is None:
+            raise ValueError(f"Unknown model version: {version!r}")
+
+        # Serialize lazy loads so two requests don't load the same version
+        with self._load_lock:
+            with self._lock:
+                model = self._models.get(version)
+            if model is None:
+                logger.info(f"Loading model version {version!r} on demand")
+                model = self._loader(path, version)
+                with self._lock:
+                    self._models[version] = model
+                    self._fingerprints[version] = directory_fingerprint(path)
+                self._evict(keep=version)
+        return model
+
+    def stats(self):
+        """
+        Describe the loaded and available versions.
+
+        Returns:
+            Dict with the default version, loaded/available versions,
+            memory use, swap and eviction counts
+        """
+        with self._lock:
+            return {
+                "default_version": self._default,
+                "loaded_versions": list(self._models),
+                "available_versions": sorted(self._available, key=version_sort_key),
+                "loaded_bytes": sum(m.size_bytes for m in self._models.values()),
+                "swaps": self.swaps,
+                "evictions": self.evictions,
+            }
+
+    def loaded(self):
+        """Return a snapshot of (version, model) pairs currently loaded."""
+        with self._lock:
+            return list(self._models.items())
+
+    def close(self):
+        """Stop the watcher and release every loaded model."""
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+        with self._lock:
+            models = list(self._models.values())
+            self._models.clear()
+        for model in models:
+            model.close()
+
+    def _evict(self, keep=None):
+        """
+        Drop least recently used versions until within the memory budget.
+
+        The default version is never dropped, nor is keep (the version just
+        loaded for the current request), even if that leaves the registry
+        over budget.
+
+        Args:
+            keep: Optional version to keep loaded
+        """
+        evicted = []
+        with self._lock:
+            total = sum(m.size_bytes for m in self._models.values())
+            for version in list(self._models):
+                if total <= self.memory_budget:
+                    break
+                if version in (self._default, keep):
+                    continue
+                model = self._models.pop(version)
+                self._fingerprints.pop(version, None)
+                total -= model.size_bytes
+                evicted.append((version, model))
+                self.evictions += 1
+        for version, model in evicted:
+            logger.info(f"Evicted model version {version!r} to stay within the memory budget")
+            model.close()
+
+    def _watch(self):
+        """Watcher thread: rescan the model directory until closed."""
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Model directory rescan failed: {e}")
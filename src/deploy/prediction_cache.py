@@ -0,0 +1,106 @@
+"""
+Bounded LRU cache of house price predictions.
+
+The same listings are re-valued over and over (many users, refresh jobs),
+and a model's prediction for a given house never changes, so repeated
+lookups can skip encoding and tree traversal entirely. Entries are keyed
+on the canonicalized feature tuple produced by FeatureEncoder.row_keys().
+"""
+
+import collections
+import threading
+import time
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache with an optional time-to-live.
+
+    The cache belongs to one loaded model: score.init() builds a fresh cache
+    whenever it loads a model, so stale predictions never outlive it.
+    """
+
+    def __init__(self, capacity=10000, ttl_s=0.0):
+        """
+        Create an empty cache.
+
+        Args:
+            capacity: Maximum number of cached predictions
+            ttl_s: Seconds an entry stays valid (0 means no expiry)
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = int(capacity)
+        self.ttl = float(ttl_s)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, keys):
+        """
+        Look up several keys at once.
+
+        Args:
+            keys: List of canonical feature keys
+
+        Returns:
+            List of cached predictions, with None for each miss
+        """
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and (not self.ttl or entry[1] > now):
+                    self._entries.move_to_end(key)
+                    results.append(entry[0])
+                    self.hits += 1
+                else:
+                    if entry is not None:
+                        del self._entries[key]
+                    results.append(None)
+                    self.misses += 1
+        return results
+
+    def put_many(self, keys, values):
+        """
+        Store predictions, evicting the least recently used entries.
+
+        Args:
+            keys: List of canonical feature keys
+            values: Predictions matching keys
+        """
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._entries[key] = (value, expires)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Report cache effectiveness.
+
+        Returns:
+            Dict with size, capacity, hits, misses, evictions and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -8,17 +8,519 @@ interface for house price estimation.
 import os
 import json
 import logging
+import time
+import warnings
 import joblib
-import pandas as pd
+import numpy as np
+
+import bulk
+import fast_json
+from batching import MicroBatcher
+from feature_encoder import FeatureEncoder
+from forest_engine import FlatForest, tree_distribution
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache
+from timing import StageTimings
+from validation import RecordValidator
+
+# Raw responses let run() hand back JSON it already serialized; only
+# available inside the Azure ML inference server
+try:
+    from azureml.contrib.services.aml_response import AMLResponse
+except ImportError:
+    AMLResponse = None
 
 # Global variables
-model = None
+registry = None
+stage_timings = StageTimings()
+last_stats_log = time.monotonic()
+
+# Optional micro-batching of concurrent requests (off by default)
+BATCHING_ENABLED = os.getenv("SCORE_BATCHING", "false").lower() in ("1", "true", "yes")
+BATCH_MAX_SIZE = int(os.getenv("SCORE_BATCH_MAX_SIZE", "64"))
+BATCH_MAX_WAIT_MS = float(os.getenv("SCORE_BATCH_MAX_WAIT_MS", "2"))
+
+# In-process LRU cache of predictions (capacity 0 disables it)
+CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", "10000"))
+CACHE_TTL_S = float(os.getenv("SCORE_CACHE_TTL_S", "0"))
+
+# Multiple model versions (one per subdirectory of AZUREML_MODEL_DIR),
+# hot-swapped to the newest version as new directories appear
+MULTI_VERSION = os.getenv("SCORE_MODEL_VERSIONS", "false").lower() in ("1", "true", "yes")
+DEFAULT_MODEL_VERSION = os.getenv("SCORE_DEFAULT_MODEL_VERSION") or None
+MODEL_MEMORY_MB = float(os.getenv("SCORE_MODEL_MEMORY_MB", "512"))
+MODEL_POLL_S = float(os.getenv("SCORE_MODEL_POLL_S", "10"))
+
+# Rows per chunk when scoring NDJSON/CSV bulk payloads
+BULK_CHUNK_SIZE = int(os.getenv("SCORE_BULK_CHUNK_SIZE", "4096"))
+
+# Accepted numeric ranges are the training min/max widened by this
+# fraction of the span on each side
+RANGE_MARGIN = float(os.getenv("SCORE_RANGE_MARGIN", "0.1"))
+
+# Response format when a request doesn't ask for one: "full" returns
+# predictions as computed; "compact" rounds them to cents and, inside the
+# inference server, returns pre-serialized JSON
+RESPONSE_FORMAT = os.getenv("SCORE_RESPONSE_FORMAT", "full")
+
+# Quantiles returned by uncertainty requests that don't list their own
+UNCERTAINTY_QUANTILES = [
+    float(q) for q in os.getenv("SCORE_UNCERTAINTY_QUANTILES", "0.05,0.5,0.95").split(",")
+]
+
+# Seconds between "Scoring stats" log lines with latency percentiles (0 disables)
+STATS_LOG_INTERVAL_S = float(os.getenv("SCORE_STATS_LOG_INTERVAL_S", "60"))
+
+# Feature layout used when the model artifact has no feature_schema.json
+# (models trained before the schema was saved alongside model.pkl)
+DEFAULT_FEATURE_SCHEMA = {
+    "feature_columns": [
+        'sqft', 'bedrooms', 'bathrooms', 'year_built', 'garage_spaces',
+        'condition_score', 'neighborhood_code_N2', 'neighborhood_code_N3',
+        'neighborhood_code_N4', 'neighborhood_code_N5',
+        'exterior_type_fiber_cement', 'exterior_type_siding',
+        'exterior_type_stucco', 'exterior_type_wood'
+    ],
+    "numeric_features": [
+        "sqft", "bedrooms", "bathrooms", "year_built",
+        "garage_spaces", "condition_score",
+    ],
+    "categorical_features": {
+        "neighborhood_code": ["N1", "N2", "N3", "N4", "N5"],
+        "exterior_type": ["brick", "fiber_cement", "siding", "stucco", "wood"],
+    },
+    "numeric_ranges": {
+        "sqft": [600, 4500], "bedrooms": [1, 6], "bathrooms": [1.0, 4.0],
+        "year_built": [1950, 2023], "garage_spaces": [0, 3], "condition_score": [1, 10],
+    },
+}
+
+# We score plain NumPy matrices already in training column order, so
+# scikit-learn's feature-name check on every predict() is just noise
+warnings.filterwarnings(
+    "ignore", message="X does not have valid feature names", category=UserWarning
+)
+# A compressed model.pkl can't be memory-mapped; joblib just loads it
+warnings.filterwarnings(
+    "ignore", message="mmap_mode .* is not compatible with compressed file", category=UserWarning
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def find_artifact(model_dir, filename):
+    """
+    Locate a model artifact inside AZUREML_MODEL_DIR.
+    
+    A model registered from a single file lands directly in the model
+    directory; a model registered from the job's outputs folder lands one
+    level down (e.g. <model_dir>/outputs/model.pkl).
+    
+    Args:
+        model_dir: The AZUREML_MODEL_DIR path
+        filename: Artifact file (or bundle directory) name to look for
+        
+    Returns:
+        Full path to the artifact, or None if it is not present
+    """
+    candidate = os.path.join(model_dir, filename)
+    if os.path.exists(candidate):
+        return candidate
+    
+    for entry in sorted(os.listdir(model_dir)):
+        candidate = os.path.join(model_dir, entry, filename)
+        if os.path.exists(candidate):
+            return candidate
+    
+    return None
+
+
+def load_feature_schema(model_dir):
+    """
+    Load the training feature schema, falling back to the built-in default.
+    
+    Args:
+        model_dir: The AZUREML_MODEL_DIR path
+        
+    Returns:
+        Feature schema dict
+    """
+    schema_path = find_artifact(model_dir, "feature_schema.json")
+    if schema_path is None:
+        logger.warning("No feature_schema.json found, using default feature layout")
+        return DEFAULT_FEATURE_SCHEMA
+    
+    logger.info(f"Loading feature schema from: {schema_path}")
+    with open(schema_path) as f:
+        return json.load(f)
+
+
+def load_feature_encoder(model_dir, feature_schema):
+    """
+    Load the feature encoder fitted in training.
+    
+    Models saved before train.py wrote encoder.json get an encoder derived
+    from the feature schema instead.
+    
+    Args:
+        model_dir: The AZUREML_MODEL_DIR path
+        feature_schema: Feature schema from load_feature_schema()
+        
+    Returns:
+        FeatureEncoder instance
+    """
+    encoder_path = find_artifact(model_dir, "encoder.json")
+    if encoder_path is None:
+        logger.info("No encoder.json found, deriving the encoder from the feature schema")
+        return FeatureEncoder.from_schema(feature_schema)
+    
+    logger.info(f"Loading feature encoder from: {encoder_path}")
+    with open(encoder_path) as f:
+        return FeatureEncoder.from_dict(json.load(f))
+
+
+class ScoringModel:
+    """
+    One loaded model version and everything needed to score with it.
+    
+    Each version gets its own prediction cache and (optionally) its own
+    micro-batcher, so cached predictions never leak across versions.
+    """
+    
+    def __init__(self, version, encoder, validator, predictor, model=None, size_bytes=0):
+        """
+        Wrap a loaded model version.
+        
+        Args:
+            version: Version label
+            encoder: FeatureEncoder compiled from the feature schema
+            validator: RecordValidator compiled from the feature schema
+            predictor: Object with predict(X) (FlatForest or sklearn model)
+            model: The scikit-learn model, if it was loaded
+            size_bytes: Approximate memory held by the model
+        """
+        self.version = version
+        self.encoder = encoder
+        self.validator = validator
+        self.predictor = predictor
+        self.model = model
+        self.size_bytes = size_bytes
+        
+        self.batcher = None
+        if BATCHING_ENABLED:
+            self.batcher = MicroBatcher(
+                predictor.predict,
+                max_batch_size=BATCH_MAX_SIZE,
+                max_wait_ms=BATCH_MAX_WAIT_MS,
+            )
+        
+        self.cache = PredictionCache(CACHE_SIZE, CACHE_TTL_S) if CACHE_SIZE > 0 else None
+    
+    def score_records(self, records, stages=None):
+        """
+        Encode and score records, bypassing the cache.
+        
+        Args:
+            records: List of dicts with the raw input fields
+            stages: Optional dict that receives "encode" and "predict"
+                durations in seconds
+            
+        Returns:
+            NumPy array of predictions
+        """
+        stages = {} if stages is None else stages
+        
+        # Encode records straight into the training column order
+        # (validates required columns, one-hot encodes categoricals)
+        started = time.perf_counter()
+        X = self.encoder.encode(records)
+        encoded = time.perf_counter()
+        stages["encode"] = encoded - started
+        
+        # Make predictions (coalesced with concurrent requests if enabled)
+        if self.batcher is not None:
+            predictions = self.batcher.submit(X)
+        else:
+            predictions = self.predictor.predict(X)
+        stages["predict"] = time.perf_counter() - encoded
+        return predictions
+    
+    def predict_records(self, records, stages=None):
+        """
+        Validate records and predict prices for the valid ones.
+        
+        Invalid rows are reported individually and don't fail the batch;
+        repeated houses are served from the cache.
+        
+        Args:
+            records: List of dicts with the raw input fields
+            stages: Optional dict that receives per-stage durations in
+                seconds ("validate", "cache", "encode", "predict", "serialize")
+            
+        Returns:
+            Tuple of (list of predictions, None for invalid rows; list of
+            per-row errors)
+        """
+        stages = {} if stages is None else stages
+        
+        started = time.perf_counter()
+        valid_rows, errors = self.validator.validate(records)
+        stages["validate"] = time.perf_counter() - started
+        if errors:
+            predictions = [None] * len(records)
+            if len(valid_rows):
+                scored = self._predict_valid([records[i] for i in valid_rows], stages)
+                for i, prediction in zip(valid_rows.tolist(), scored):
+                    predictions[i] = prediction
+            return predictions, errors
+        
+        return self._predict_valid(records, stages), errors
+    
+    def _predict_valid(self, records, stages):
+        """Predict validated records through the cache; returns a list of floats."""
+        if self.cache is None:
+            predictions = self.score_records(records, stages)
+            started = time.perf_counter()
+            predictions_list = predictions.tolist()
+            stages["serialize"] = time.perf_counter() - started
+            return predictions_list
+        
+        started = time.perf_counter()
+        keys = self.encoder.row_keys(records)
+        predictions = self.cache.get_many(keys)
+        stages["cache"] = time.perf_counter() - started
+        
+        # Only encode and score the houses we haven't seen
+        misses = [i for i, prediction in enumerate(predictions) if prediction is None]
+        if misses:
+            scored = self.score_records([records[i] for i in misses], stages)
+            started = time.perf_counter()
+            scored = scored.tolist()
+            self.cache.put_many([keys[i] for i in misses], scored)
+            for i, prediction in zip(misses, scored):
+                predictions[i] = prediction
+            stages["serialize"] = time.perf_counter() - started
+        
+        return predictions
+    
+    def score_columns(self, columns, stages=None):
+        """
+        Validate and score a columnar batch ({field: [values, ...]}).
+        
+        Columnar requests are encoded straight from the column arrays and,
+        like bulk payloads, bypass the cache and micro-batcher.
+        
+        Args:
+            columns: Dict of input field -> list of values
+            stages: Optional dict that receives per-stage durations in
+                seconds ("validate", "encode", "predict")
+            
+        Returns:
+            Tuple of (NumPy array of predictions, NaN for invalid rows;
+            list of per-row errors)
+        """
+        stages = {} if stages is None else stages
+        X, valid_rows, n_rows, errors = self._encode_valid(None, columns, stages)
+        
+        started = time.perf_counter()
+        predictions = np.full(n_rows, np.nan)
+        if len(valid_rows):
+            predictions[valid_rows] = self.predictor.predict(X)
+        stages["predict"] = time.perf_counter() - started
+        return predictions, errors
+    
+    def predict_uncertainty(self, records=None, columns=None, quantiles=(), stages=None):
+        """
+        Predict the mean, standard deviation and quantiles across trees.
+        
+        All trees are evaluated in one vectorized pass (FlatForest) and the
+        per-tree predictions summarized together. Uncertainty requests
+        bypass the cache, which only holds point predictions.
+        
+        Args:
+            records: List of dicts with the raw input fields, or None
+            columns: Dict of input field -> list of values, or None
+            quantiles: Quantiles to compute, each between 0 and 1
+            stages: Optional dict that receives per-stage durations in
+                seconds ("validate", "encode", "predict")
+            
+        Returns:
+            Tuple of (mean, std and (len(quantiles), n_rows) quantile
+            arrays, NaN for invalid rows; list of per-row errors)
+        """
+        stages = {} if stages is None else stages
+        X, valid_rows, n_rows, errors = self._encode_valid(records, columns, stages)
+        
+        started = time.perf_counter()
+        mean = np.full(n_rows, np.nan)
+        std = np.full(n_rows, np.nan)
+        values = np.full((len(quantiles), n_rows), np.nan)
+        if len(valid_rows):
+            per_tree = self.tree_predictions(X)
+            mean[valid_rows], std[valid_rows], values[:, valid_rows] = tree_distribution(
+                per_tree, quantiles
+            )
+        stages["predict"] = time.perf_counter() - started
+        return mean, std, values, errors
+    
+    def tree_predictions(self, X):
+        """
+        Predict with every tree separately.
+        
+        Args:
+            X: Feature matrix
+            
+        Returns:
+            Array of per-tree predictions with shape (n_trees, n_rows)
+        """
+        if hasattr(self.predictor, "tree_predictions"):
+            return self.predictor.tree_predictions(X)
+        if not hasattr(self.predictor, "estimators_"):
+            # Boosted trees each predict a correction, not the price, so
+            # their spread says nothing about uncertainty
+            raise ValueError(
+                f"Uncertainty estimates need a random forest; model version "
+                f"{self.version!r} is a {type(self.predictor).__name__}"
+            )
+        # scikit-learn fallback (artifacts without the forest/ bundle):
+        # one predict() call per tree
+        return np.stack([tree.predict(X) for tree in self.predictor.estimators_])
+    
+    def _encode_valid(self, records, columns, stages):
+        """
+        Validate records or columns and encode the valid rows.
+        
+        Returns:
+            Tuple of (feature matrix of valid rows, indices of valid rows,
+            total number of rows, list of per-row errors)
+        """
+        started = time.perf_counter()
+        if columns is not None:
+            valid_rows, errors = self.validator.validate_columns(columns)
+            n_rows = len(columns[self.encoder.required_columns[0]])
+        else:
+            valid_rows, errors = self.validator.validate(records)
+            n_rows = len(records)
+        validated = time.perf_counter()
+        stages["validate"] = validated - started
+        
+        if columns is not None:
+            if errors:
+                columns = {
+                    name: np.asarray(columns[name])[valid_rows]
+                    for name in self.encoder.required_columns
+                }
+            X = self.encoder.encode_columns(columns)
+        else:
+            X = self.encoder.encode([records[i] for i in valid_rows] if errors else records)
+        stages["encode"] = time.perf_counter() - validated
+        return X, valid_rows, n_rows, errors
+    
+    def score_bulk(self, text, fmt):
+        """
+        Score an NDJSON or CSV bulk payload in fixed-size chunks.
+        
+        Bulk jobs bypass the cache and micro-batcher: chunks are already
+        large batches, and one-off revaluations would only churn the cache.
+        
+        Args:
+            text: Raw request body
+            fmt: bulk.NDJSON or bulk.CSV
+            
+        Returns:
+            Tuple of (NumPy array of predictions, NaN for invalid rows;
+            list of per-row errors)
+        """
+        return bulk.score_text(
+            self.encoder, self.predictor, text, fmt, BULK_CHUNK_SIZE, self.validator
+        )
+    
+    def stats(self):
+        """Return cache and micro-batching stats (None when disabled)."""
+        return {
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "batching": self.batcher.stats() if self.batcher is not None else None,
+        }
+    
+    def close(self):
+        """Stop the micro-batcher, if any."""
+        if self.batcher is not None:
+            self.batcher.close()
+
+
+def load_scoring_model(model_dir, version):
+    """
+    Load one model version from its directory.
+    
+    Args:
+        model_dir: Directory holding the model artifacts
+        version: Version label for this model
+        
+    Returns:
+        ScoringModel instance
+    """
+    started = time.perf_counter()
+    
+    feature_schema = load_feature_schema(model_dir)
+    expected_columns = feature_schema["feature_columns"]
+    
+    # Compile once: the encoder fitted in training (column positions and
+    # one-hot slots), plus the per-column type/range/vocabulary checks
+    encoder = load_feature_encoder(model_dir, feature_schema)
+    if encoder.feature_columns != expected_columns:
+        raise ValueError(
+            f"Encoder feature columns {encoder.feature_columns} do not match "
+            f"feature schema columns {expected_columns}"
+        )
+    validator = RecordValidator.from_schema(feature_schema, RANGE_MARGIN)
+    
+    # Prefer the flat forest bundle exported by train.py: it is memory-mapped
+    # rather than unpickled, so startup is near-instant and worker processes
+    # share its pages. Fall back to the scikit-learn model for artifacts
+    # trained before it existed, and for model types without one
+    # (histogram gradient boosting).
+    forest_path = find_artifact(model_dir, "forest")
+    model = None
+    try:
+        if forest_path is not None:
+            logger.info(f"Loading flat forest from: {forest_path}")
+            predictor = FlatForest.load(forest_path)
+            trained_columns = predictor.feature_columns
+            size_bytes = predictor.nbytes
+            if predictor.n_features != encoder.n_features:
+                raise ValueError(
+                    f"Flat forest expects {predictor.n_features} features, "
+                    f"feature schema has {encoder.n_features}"
+                )
+        else:
+            model_path = find_artifact(model_dir, "model.pkl")
+            if model_path is None:
+                raise FileNotFoundError(f"model.pkl not found under {model_dir}")
+            logger.info(f"Loading model from: {model_path}")
+            model = joblib.load(model_path, mmap_mode="r")
+            predictor = model
+            trained_columns = getattr(model, "feature_names_in_", None)
+            size_bytes = os.path.getsize(model_path)
+        logger.info(
+            f"Model version {version!r} loaded successfully in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+    except Exception as e:
+        logger.error(f"Failed to load model: {e}")
+        raise
+    
+    # The encoder writes columns by position, so the model must agree on order
+    if trained_columns is not None and list(trained_columns) != expected_columns:
+        raise ValueError(
+            f"Model feature columns {list(trained_columns)} do not match "
+            f"feature schema columns {expected_columns}"
+        )
+    
+    return ScoringModel(version, encoder, validator, predictor, model=model, size_bytes=size_bytes)
+
+
 def init():
     """
     Initialize the model.
@@ -26,43 +528,205 @@ def init():
     This function is called when the endpoint is created or updated.
     It loads the model from the AZUREML_MODEL_DIR environment variable.
     """
-    global model
+    global registry
     
     # Get the path to the model directory
     model_dir = os.getenv("AZUREML_MODEL_DIR")
     if not model_dir:
         raise ValueError("AZUREML_MODEL_DIR environment variable not set")
     
-    # Load the model
-    model_path = os.path.join(model_dir, "model.pkl")
-    logger.info(f"Loading model from: {model_path}")
+    if registry is not None:
+        registry.close()
+        registry = None
     
-    try:
-        model = joblib.load(model_path)
-        logger.info("Model loaded successfully")
-    except Exception as e:
-        logger.error(f"Failed to load model: {e}")
-        raise
+    if BATCHING_ENABLED:
+        logger.info(
+            f"Micro-batching enabled (max batch size {BATCH_MAX_SIZE}, "
+            f"max wait {BATCH_MAX_WAIT_MS} ms)"
+        )
+    if MULTI_VERSION:
+        logger.info(f"Serving multiple model versions from: {model_dir}")
+    
+    registry = ModelRegistry(
+        model_dir,
+        load_scoring_model,
+        multi_version=MULTI_VERSION,
+        default_version=DEFAULT_MODEL_VERSION,
+        memory_budget_mb=MODEL_MEMORY_MB,
+        poll_interval_s=MODEL_POLL_S,
+    )
+    logger.info(f"Default model version: {registry.default_version}")
+
+
+def get_stats():
+    """
+    Collect runtime stats from the registry and each loaded model version.
+    
+    Returns:
+        Dict with per-stage latency percentiles, registry stats and
+        per-version cache/batching stats
+    """
+    return {
+        "latency_ms": stage_timings.summary(),
+        "registry": registry.stats(),
+        "models": {version: m.stats() for version, m in registry.loaded()},
+    }
+
+
+def maybe_log_stats():
+    """Log a stats line at most once per STATS_LOG_INTERVAL_S seconds."""
+    global last_stats_log
+    
+    now = time.monotonic()
+    if STATS_LOG_INTERVAL_S > 0 and now - last_stats_log >= STATS_LOG_INTERVAL_S:
+        last_stats_log = now
+        logger.info(f"Scoring stats: {json.dumps(get_stats())}")
+
+
+def json_values(values, compact=False):
+    """
+    Convert predictions to a JSON-ready list.
+    
+    Args:
+        values: List or NumPy array (None or NaN marks invalid rows)
+        compact: Round to cents
+        
+    Returns:
+        List of floats, with None for invalid rows
+    """
+    if compact:
+        values = np.round(np.asarray(values, dtype=np.float64), 2)
+    if isinstance(values, np.ndarray):
+        missing = bool(np.isnan(values).any())
+        values = values.tolist()
+    else:
+        missing = any(v is None for v in values)
+    if missing:
+        values = [None if v is None or v != v else v for v in values]
+    return values
+
+
+def build_response(predictions, errors, version, response_format="full", uncertainty=None):
+    """
+    Assemble the response body.
+    
+    Args:
+        predictions: List or NumPy array of predictions (None or NaN for
+            invalid rows)
+        errors: List of per-row validation errors
+        version: Model version that produced the predictions
+        response_format: "full" or "compact" (predictions rounded to cents,
+            serialized here with the fast JSON backend when the server
+            accepts raw responses)
+        uncertainty: Optional dict with "std" and "quantiles" ({label:
+            values}) arrays to return alongside the predictions
+        
+    Returns:
+        Response dict, or a raw JSON AMLResponse for compact responses
+        inside the inference server; "errors" is only present when some
+        rows failed
+    """
+    compact = response_format == "compact"
+    if compact or errors or not isinstance(predictions, list):
+        predictions = json_values(predictions, compact)
+    
+    response = {"predictions": predictions, "model_version": version}
+    if uncertainty is not None:
+        response["uncertainty"] = {
+            "std": json_values(uncertainty["std"], compact),
+            "quantiles": {
+                label: json_values(values, compact)
+                for label, values in uncertainty["quantiles"].items()
+            },
+        }
+    if errors:
+        logger.debug("%d row(s) failed validation", len(errors))
+        response["errors"] = errors
+    
+    if compact and AMLResponse is not None:
+        return AMLResponse(
+            fast_json.dumps(response), 200, {"Content-Type": "application/json"}, json_str=False
+        )
+    return response
+
+
+def parse_quantiles(option):
+    """
+    Read the quantiles requested by an "uncertainty" option.
+    
+    Args:
+        option: true for the default quantiles, or {"quantiles": [...]}
+        
+    Returns:
+        List of quantiles between 0 and 1
+    """
+    if option is True:
+        return UNCERTAINTY_QUANTILES
+    if isinstance(option, dict):
+        quantiles = [float(q) for q in option.get("quantiles", UNCERTAINTY_QUANTILES)]
+        if not all(0.0 <= q <= 1.0 for q in quantiles):
+            raise ValueError(f"Quantiles must be between 0 and 1, got {quantiles}")
+        return quantiles
+    raise ValueError("'uncertainty' must be true or an object with a 'quantiles' list")
 
 
 def run(data):
     """
     Make predictions on input data.
     
+    Besides JSON records, a request may be columnar ({"columns": {field:
+    [values, ...]}}), which is decoded straight into NumPy arrays, or a raw
+    body of newline-delimited JSON (one house per line) or CSV with a
+    header row; those bulk payloads are scored in chunks with the default
+    model version.
+    
+    JSON requests may set "response_format" to "compact" (see
+    build_response); the default comes from SCORE_RESPONSE_FORMAT. Setting
+    "uncertainty" to true (or {"quantiles": [0.1, 0.9]}) adds the standard
+    deviation and quantiles of the per-tree predictions to the response.
+    
+    Rows that fail validation get a null prediction and an entry in
+    "errors" ({"row": index, "errors": {field: message}}); the other rows
+    are still scored.
+    
     Args:
-        data: JSON string or dict containing input records
+        data: JSON string, dict, or NDJSON/CSV string containing input records
         
     Returns:
-        JSON-serializable dict with predictions
+        JSON-serializable dict with predictions (and errors, if any)
     """
+    started = time.perf_counter()
     try:
         # Parse input data
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
         if isinstance(data, str):
-            data = json.loads(data)
+            scoring_model = registry.get()
+            bulk_format = bulk.detect_bulk_format(data, scoring_model.encoder.required_columns)
+            if bulk_format is not None:
+                predictions, errors = scoring_model.score_bulk(data, bulk_format)
+                stage_timings.record({"bulk": time.perf_counter() - started})
+                maybe_log_stats()
+                logger.debug("Scored %d %s record(s)", len(predictions), bulk_format)
+                return build_response(predictions, errors, scoring_model.version, RESPONSE_FORMAT)
+            data = fast_json.loads(data)
         
-        # Extract records from the data object
+        # Extract records or columns (and optional model version and
+        # response format) from the data object
+        model_version = None
+        response_format = RESPONSE_FORMAT
+        quantiles = None
+        columns = None
         if isinstance(data, dict):
-            if "data" in data:
+            model_version = data.get("model_version")
+            response_format = data.get("response_format", response_format)
+            if data.get("uncertainty"):
+                quantiles = parse_quantiles(data["uncertainty"])
+            if "columns" in data:
+                columns = data["columns"]
+                if not isinstance(columns, dict):
+                    raise ValueError("'columns' must be an object of field -> list of values")
+            elif "data" in data:
                 records = data["data"]
             else:
                 records = [data]
@@ -70,61 +734,64 @@ def run(data):
             records = data
         else:
             raise ValueError(f"Unsupported input type: {type(data)}")
+        if response_format not in ("full", "compact"):
+            raise ValueError(f"Unsupported response_format: {response_format!r}")
         
-        logger.info(f"Processing {len(records)} record(s)")
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(records)
-        
-        # Validate required columns
-        required_columns = [
-            "sqft", "bedrooms", "bathrooms", "year_built",
-            "neighborhood_code", "garage_spaces", "condition_score",
-            "exterior_type"
-        ]
-        
-        missing_columns = set(required_columns) - set(df.columns)
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {missing_columns}")
-        
-        # Prepare features (same preprocessing as training)
-        X = df.copy()
-        
-        # One-hot encode categorical features
-        X = pd.get_dummies(X, columns=["neighborhood_code", "exterior_type"], drop_first=True)
-        
-        # Ensure all expected columns from training are present
-        # The model was trained with these columns (after one-hot encoding)
-        expected_columns = [
-            'sqft', 'bedrooms', 'bathrooms', 'year_built', 'garage_spaces',
-            'condition_score', 'neighborhood_code_N2', 'neighborhood_code_N3',
-            'neighborhood_code_N4', 'neighborhood_code_N5',
-            'exterior_type_fiber_cement', 'exterior_type_siding',
-            'exterior_type_stucco', 'exterior_type_wood'
-        ]
-        
-        # Add missing columns with 0 values
-        for col in expected_columns:
-            if col not in X.columns:
-                X[col] = 0
-        
-        # Reorder columns to match training
-        X = X[expected_columns]
-        
-        logger.info(f"Feature matrix shape: {X.shape}")
+        stages = {"parse": time.perf_counter() - started}
         
-        # Make predictions
-        predictions = model.predict(X)
+        # Route to the requested version (or the current default)
+        scoring_model = registry.get(None if model_version is None else str(model_version))
         
-        # Convert predictions to list
-        predictions_list = predictions.tolist()
+        # Per-request detail is DEBUG only (lazy formatting keeps it ~free);
+        # aggregate latencies are logged periodically by maybe_log_stats()
+        uncertainty = None
+        if quantiles is not None:
+            predictions, std, values, errors = scoring_model.predict_uncertainty(
+                None if columns is not None else records, columns, quantiles, stages
+            )
+            uncertainty = {"std": std, "quantiles": {f"{q:g}": v for q, v in zip(quantiles, values)}}
+            logger.debug("Processing %d record(s) with uncertainty", len(predictions))
+        elif columns is not None:
+            predictions, errors = scoring_model.score_columns(columns, stages)
+            logger.debug("Processing %d columnar record(s)", len(predictions))
+        else:
+            logger.debug("Processing %d record(s)", len(records))
+            predictions, errors = scoring_model.predict_records(records, stages)
         
-        logger.info(f"Generated {len(predictions_list)} prediction(s)")
+        serialize_started = time.perf_counter()
+        response = build_response(
+            predictions, errors, scoring_model.version, response_format, uncertainty
+        )
+        finished = time.perf_counter()
+        stages["serialize"] = stages.get("serialize", 0.0) + finished - serialize_started
+        stages["total"] = finished - started
+        stage_timings.record(stages)
+        maybe_log_stats()
         
         # Return predictions as JSON
-        return {"predictions": predictions_list}
+        return response
         
     except Exception as e:
         error_msg = f"Error during prediction: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg}
+
+
+def encode_response(response):
+    """
+    Encode a run() result as an HTTP status and JSON body.
+    
+    For callers other than the Azure ML inference server (serve.py,
+    load_test.py): run() returns a dict, or for compact responses inside
+    the inference server an AMLResponse that already holds the serialized
+    body, which is passed through unchanged.
+    
+    Args:
+        response: Return value of run()
+        
+    Returns:
+        Tuple of (status code, UTF-8 JSON body bytes)
+    """
+    if AMLResponse is not None and isinstance(response, AMLResponse):
+        return response.status_code, response.get_data()
+    return 200, fast_json.dumps(response)
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Self-hosted scoring server for score.py.
+
+Serves the same init()/run() contract as the Azure ML managed endpoint,
+for local testing and for running on our own nodes. An asyncio front end
+handles HTTP/1.1 connections (with keep-alive), and a pool of worker
+processes does the CPU-bound work. The pool is started before the server
+accepts traffic, and each worker calls score.init() once, so every core
+scores in parallel with the model already loaded.
+
+Backpressure: at most --max-inflight requests are scored or queued at a
+time. Beyond that, requests are answered immediately with 503 and a
+Retry-After header, so load balancers and clients back off instead of
+timing out.
+
+Endpoints:
+    POST /score   Request body is passed to score.run() unchanged
+    GET  /        Liveness (same as azmlinfsrv)
+    GET  /health  Liveness: the server process is up
+    GET  /ready   Readiness: 200 once every worker has loaded the model
+    GET  /stats   Server counters plus score.get_stats() from one worker
+
+Example:
+    python serve.py --model-dir ../ml-pipeline/outputs --workers 4 --port 5001
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger("serve")
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Serve score.py over HTTP with a pool of worker processes"
+    )
+    parser.add_argument(
+        "--model-dir",
+        default=os.getenv("AZUREML_MODEL_DIR"),
+        help="Model directory (default: $AZUREML_MODEL_DIR)",
+    )
+    parser.add_argument(
+        "--host",
+        default="0.0.0.0",
+        help="Address to listen on (default: 0.0.0.0)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=5001,
+        help="Port to listen on (default: 5001, as azmlinfsrv)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Scoring worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--max-inflight",
+        type=int,
+        help="Requests scored or queued at once before answering 503 "
+             "(default: 4 per worker)",
+    )
+    parser.add_argument(
+        "--max-body-mb",
+        type=float,
+        default=100,
+        help="Largest accepted request body in MB (default: 100)",
+    )
+    parser.add_argument(
+        "--keep-alive-s",
+        type=float,
+        default=5,
+        help="Seconds an idle keep-alive connection stays open (default: 5)",
+    )
+    return parser.parse_args()
+
+
+def _init_worker(init_done):
+    """
+    Load the model once in each worker process.
+
+    Args:
+        init_done: Queue that receives this worker's pid once init() returns
+    """
+    import score
+    score.init()
+    init_done.put(os.getpid())
+
+
+def _score(body):
+    """Worker: score one request body and return its status and JSON bytes."""
+    import score
+    # Serialize in the worker so only bytes cross the process boundary
+    return score.encode_response(score.run(body))
+
+
+def _worker_stats():
+    """Worker: return score.get_stats() for this process."""
+    import score
+    return score.get_stats()
+
+
+def _ping():
+    """Worker: short task that keeps workers busy so the pool starts all of them."""
+    time.sleep(0.05)
+    return os.getpid()
+
+
+class ScoringServer:
+    """asyncio HTTP front end that hands /score requests to a process pool."""
+
+    def __init__(self, pool, workers, max_inflight, max_body_bytes, keep_alive_s,
+                 init_done=None):
+        """
+        Set up the server state.
+
+        Args:
+            pool: ProcessPoolExecutor whose workers run score.init()
+            workers: Number of worker processes in the pool
+            max_inflight: Requests scored or queued before answering 503
+            max_body_bytes: Largest accepted request body
+            keep_alive_s: Idle timeout for keep-alive connections
+            init_done: Queue each worker puts its pid on after score.init()
+                (see _init_worker); readiness waits for all of them
+        """
+        self.pool = pool
+        self.init_done = init_done
+        self.workers = workers
+        self.max_inflight = max_inflight
+        self.max_body_bytes = max_body_bytes
+        self.keep_alive_s = keep_alive_s
+
+        self.ready = False
+        self.inflight = 0
+        self.requests = 0
+        self.rejected = 0
+        self.failures = 0
+        self.started = time.monotonic()
+
+    async def warm_up(self):
+        """
+        Start every worker and wait until each has run score.init().
+
+        Readiness only flips once a distinct pid per worker has come back
+        through init_done, so /ready really means every worker has the
+        model loaded. A worker whose init() fails breaks the pool, which
+        surfaces here as BrokenProcessPool.
+        """
+        loop = asyncio.get_running_loop()
+        pings = [loop.run_in_executor(self.pool, _ping) for _ in range(self.workers)]
+        if self.init_done is not None:
+            pids = set()
+            while len(pids) < self.workers:
+                try:
+                    pids.add(await loop.run_in_executor(None, self.init_done.get, True, 0.5))
+                except queue.Empty:
+                    for ping in pings:
+                        if ping.done() and ping.exception() is not None:
+                            raise ping.exception()
+        await asyncio.gather(*pings)
+        self.ready = True
+        logger.info(f"{self.workers} worker process(es) ready")
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until it closes or idles out."""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), self.keep_alive_s
+                    )
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, 431, {"error": "Request headers too large"}, False)
+                    return
+
+                try:
+                    method, path, version, headers = self.parse_head(head)
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "Malformed request"}, False)
+                    return
+                keep_alive = self.wants_keep_alive(version, headers)
+
+                body = b""
+                if method == "POST":
+                    if "content-length" not in headers:
+                        await self.respond(writer, 411, {"error": "Content-Length required"}, False)
+                        return
+                    length = self.parse_content_length(headers["content-length"])
+                    if length is None:
+                        await self.respond(writer, 400, {"error": "Invalid Content-Length"}, False)
+                        return
+                    if length > self.max_body_bytes:
+                        await self.respond(writer, 413, {"error": "Request body too large"}, False)
+                        return
+                    body = await reader.readexactly(length)
+
+                status, payload = await self.route(method, path, body)
+                extra = {"Retry-After": "1"} if status == 503 else None
+                await self.respond(writer, status, payload, keep_alive, extra)
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            writer.close()
+
+    @staticmethod
+    def parse_head(head):
+        """Split a request head into method, path, HTTP version and headers."""
+        lines = head.decode("latin-1").split("\r\n")
+        method, path, version = lines[0].split(" ")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        return method, path.split("?", 1)[0], version, headers
+
+    @staticmethod
+    def parse_content_length(value):
+        """Content-Length as a non-negative int, or None if it isn't one."""
+        # int() alone would also accept "+5", " 5" and "5_000"
+        if not value.isdigit():
+            return None
+        return int(value)
+
+    @staticmethod
+    def wants_keep_alive(version, headers):
+        """HTTP/1.1 keeps connections open unless told otherwise; 1.0 closes."""
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    async def route(self, method, path, body):
+        """
+        Dispatch one request.
+
+        Returns:
+            Tuple of (status code, response dict or pre-encoded JSON bytes)
+        """
+        if path in ("/", "/health"):
+            return 200, {"status": "alive"}
+        if path == "/ready":
+            return (200, {"status": "ready"}) if self.ready else (503, {"status": "starting"})
+        if path == "/stats" and method == "GET":
+            return 200, await self.stats()
+        if path != "/score":
+            return 404, {"error": f"Not found: {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST for /score"}
+        if not self.ready:
+            return 503, {"error": "Workers are still loading the model"}
+
+        # Backpressure: shed load instead of queueing without bound
+        if self.inflight >= self.max_inflight:
+            self.rejected += 1
+            return 503, {"error": "Server is at capacity, retry shortly"}
+
+        self.inflight += 1
+        self.requests += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, _score, body)
+        except BrokenProcessPool:
+            self.ready = False
+            self.failures += 1
+            logger.error("A scoring worker died; the server needs a restart")
+            return 500, {"error": "Scoring worker pool is broken"}
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Scoring failed: {e}")
+            return 500, {"error": f"Scoring failed: {e}"}
+        finally:
+            self.inflight -= 1
+
+    async def stats(self):
+        """Server counters plus the scoring stats of one worker."""
+        stats = {
+            "server": {
+                "ready": self.ready,
+                "workers": self.workers,
+                "inflight": self.inflight,
+                "max_inflight": self.max_inflight,
+                "requests": self.requests,
+                "rejected": self.rejected,
+                "failures": self.failures,
+                "uptime_s": time.monotonic() - self.started,
+            }
+        }
+        if self.ready:
+            loop = asyncio.get_running_loop()
+            stats["worker"] = await loop.run_in_executor(self.pool, _worker_stats)
+        return stats
+
+    async def respond(self, writer, status, payload, keep_alive, extra_headers=None):
+        """Write one JSON response."""
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            "Connection": "keep-alive" if keep_alive else "close",
+        }
+        headers.update(extra_headers or {})
+        head = f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()
+        )
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await writer.drain()
+
+
+async def serve(args):
+    """Start the worker pool and the HTTP server, and run until signalled."""
+    init_done = multiprocessing.Queue()
+    pool = ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init_worker, initargs=(init_done,)
+    )
+    server = ScoringServer(
+        pool,
+        workers=args.workers,
+        max_inflight=args.max_inflight or 4 * args.workers,
+        max_body_bytes=int(args.max_body_mb * 1024 * 1024),
+        keep_alive_s=args.keep_alive_s,
+        init_done=init_done,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    http_server = await asyncio.start_server(
+        server.handle_connection, args.host, args.port, limit=64 * 1024
+    )
+    logger.info(f"Listening on http://{args.host}:{args.port} with {args.workers} worker(s)")
+    try:
+        await server.warm_up()
+        await stop.wait()
+    finally:
+        logger.info("Shutting down")
+        http_server.close()
+        await http_server.wait_closed()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if not args.model_dir:
+        raise SystemExit("[ERROR] --model-dir or AZUREML_MODEL_DIR is required")
+    # Worker processes inherit the environment score.init() reads
+    os.environ["AZUREML_MODEL_DIR"] = os.path.abspath(args.model_dir)
+    asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
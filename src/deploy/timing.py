@@ -0,0 +1,106 @@
+"""
+Lightweight latency histograms for the scoring hot path.
+
+run() measures each stage of a request (parse, cache lookup, encoding,
+prediction, serialization) with time.perf_counter() and records all of them
+in one call. Each stage keeps a fixed-bucket log-scale histogram, so
+recording is O(1), memory is bounded, and p50/p95/p99 can be read at any
+time without storing individual samples.
+"""
+
+import bisect
+import threading
+
+# Bucket upper bounds in milliseconds: 10 per decade from 1 µs to 100 s,
+# so a reported percentile is within ~12% of the true value
+BUCKET_BOUNDS_MS = [10 ** (exponent / 10) for exponent in range(-30, 51)]
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (not thread-safe on its own)."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        """Add one latency sample in milliseconds."""
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q):
+        """
+        Estimate a percentile from the buckets.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Geometric midpoint of the bucket holding the percentile, in ms
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                if i == len(BUCKET_BOUNDS_MS):
+                    return self.max_ms
+                upper = BUCKET_BOUNDS_MS[i]
+                lower = BUCKET_BOUNDS_MS[i - 1] if i else upper / 10 ** 0.1
+                return min((lower * upper) ** 0.5, self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        """Return count, mean, p50/p95/p99 and max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean": self.total_ms / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max_ms,
+        }
+
+
+class StageTimings:
+    """Per-stage latency histograms shared by all request threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def record(self, stages):
+        """
+        Record one request's stage durations.
+
+        Args:
+            stages: Dict of stage name -> duration in seconds
+        """
+        with self._lock:
+            for stage, seconds in stages.items():
+                histogram = self._histograms.get(stage)
+                if histogram is None:
+                    histogram = self._histograms[stage] = LatencyHistogram()
+                histogram.record(seconds * 1000)
+
+    def summary(self):
+        """
+        Summarize every stage seen so far.
+
+        Returns:
+            Dict of stage name -> histogram summary (milliseconds)
+        """
+        with self._lock:
+            return {stage: h.summary() for stage, h in self._histograms.items()}
+
+    def reset(self):
+        """Forget all recorded samples."""
+        with self._lock:
+            self._histograms.clear()
@@ -0,0 +1,282 @@
+"""
+Request validation for the house price scoring path.
+
+A RecordValidator is compiled once per model version from the training
+feature schema. It checks a whole batch column by column: numeric fields
+must be finite numbers (whole numbers for integer fields) inside the
+training range, and categorical fields must be known levels. The checks
+are NumPy mask operations over the whole batch, so a clean batch costs a
+handful of array operations. Error messages are only built for the rows
+that fail, and those rows are reported individually while the rest of the
+batch is still scored.
+"""
+
+import itertools
+import operator
+
+import numpy as np
+
+# JSON true/false arrive as bool; NumPy columns may hold np.bool_
+_BOOL_TYPES = (bool, np.bool_)
+
+
+class RecordValidator:
+    """Check raw house records against the training schema."""
+
+    def __init__(self, numeric_features, categorical_levels, numeric_ranges=None,
+                 integer_features=(), range_margin=0.1):
+        """
+        Compile the per-column checks.
+
+        Args:
+            numeric_features: Names of the numeric input fields
+            categorical_levels: Dict of categorical input field -> known levels
+            numeric_ranges: Optional dict of numeric field -> [min, max] seen
+                in training; fields without a range are only type-checked
+            integer_features: Numeric fields that must be whole numbers
+            range_margin: Widen each range by this fraction of its span on
+                both sides, so values just past the training extremes pass
+        """
+        self.numeric_features = list(numeric_features)
+        self.categorical_features = list(categorical_levels)
+        self.required_columns = self.numeric_features + self.categorical_features
+        self.integer_features = set(integer_features)
+
+        # Per numeric column: accepted bounds (infinite when unknown) and
+        # whether whole numbers are required, laid out to match the matrix
+        # built in validate()
+        ranges = numeric_ranges or {}
+        self._low = np.full(len(self.numeric_features), -np.inf)
+        self._high = np.full(len(self.numeric_features), np.inf)
+        for i, name in enumerate(self.numeric_features):
+            if name in ranges:
+                low, high = ranges[name]
+                margin = range_margin * (high - low)
+                self._low[i], self._high[i] = low - margin, high + margin
+        self._numeric_values = _tuple_getter(self.numeric_features)
+        self._integer = np.array(
+            [name in self.integer_features for name in self.numeric_features], dtype=bool
+        )
+
+        self._levels = {
+            name: frozenset(str(level) for level in levels)
+            for name, levels in categorical_levels.items()
+        }
+
+    @classmethod
+    def from_schema(cls, schema, range_margin=0.1):
+        """
+        Build a validator from a feature schema written by train.py.
+
+        Integer fields come from the schema's dtypes and ranges from
+        numeric_ranges; schemas written before those existed get type and
+        vocabulary checks only.
+
+        Args:
+            schema: Feature schema dict
+            range_margin: See __init__
+
+        Returns:
+            RecordValidator instance
+        """
+        dtypes = schema.get("dtypes", {})
+        return cls(
+            schema["numeric_features"],
+            schema["categorical_features"],
+            numeric_ranges=schema.get("numeric_ranges"),
+            integer_features=[
+                name for name in schema["numeric_features"]
+                if dtypes.get(name, "").startswith("int")
+            ],
+            range_margin=range_margin,
+        )
+
+    def validate(self, records):
+        """
+        Validate a batch of records.
+
+        Args:
+            records: List of dicts with the raw input fields
+
+        Returns:
+            Tuple of (indices of valid rows, list of per-row error dicts
+            {"row": index, "errors": {field: message}})
+        """
+        n_rows = len(records)
+        numeric = self.numeric_features
+        try:
+            values = list(itertools.chain.from_iterable(map(self._numeric_values, records)))
+            if _has_bool(values):
+                # float() takes True/False as 1/0; let the slow path reject them
+                raise TypeError("booleans are not numbers")
+            matrix = np.fromiter(
+                values, dtype=np.float64, count=n_rows * len(numeric)
+            ).reshape(n_rows, len(numeric))
+        except (KeyError, TypeError, ValueError):
+            # Missing fields, booleans or non-numeric values: convert one by one
+            matrix = np.array(
+                [[_to_float(record.get(name)) for name in numeric] for record in records],
+                dtype=np.float64,
+            ).reshape(n_rows, len(numeric))
+
+        invalid = self._invalid_numeric(matrix)
+
+        for name, levels in self._levels.items():
+            try:
+                known = np.fromiter(
+                    (record.get(name) in levels for record in records), dtype=bool, count=n_rows
+                )
+            except TypeError:
+                # Unhashable values (lists, dicts) can't be set members
+                known = np.fromiter(
+                    (_is_level(record.get(name), levels) for record in records),
+                    dtype=bool,
+                    count=n_rows,
+                )
+            invalid |= ~known
+
+        if not invalid.any():
+            return np.arange(n_rows), []
+
+        # Cold path: build messages only for the failing rows
+        errors = [
+            {"row": row, "errors": self._row_errors(records[row])}
+            for row in np.flatnonzero(invalid).tolist()
+        ]
+        return np.flatnonzero(~invalid), errors
+
+    def validate_columns(self, columns):
+        """
+        Validate a columnar batch ({field: list or array of values}).
+
+        Missing columns or columns of different lengths make the whole
+        request invalid; bad values are reported per row as in validate().
+
+        Args:
+            columns: Dict of input field -> 1-D sequence of values
+
+        Returns:
+            Tuple of (indices of valid rows, list of per-row error dicts)
+        """
+        missing = {name for name in self.required_columns if name not in columns}
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+        lengths = {name: len(columns[name]) for name in self.required_columns}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"Columns have different lengths: {lengths}")
+        n_rows = lengths[self.required_columns[0]]
+
+        matrix = np.empty((n_rows, len(self.numeric_features)), dtype=np.float64)
+        for i, name in enumerate(self.numeric_features):
+            column = columns[name]
+            if not _has_bool(column):
+                try:
+                    matrix[:, i] = np.asarray(column, dtype=np.float64)
+                    continue
+                except (TypeError, ValueError):
+                    pass
+            matrix[:, i] = [_to_float(value) for value in column]
+        invalid = self._invalid_numeric(matrix)
+
+        for name, levels in self._levels.items():
+            # Check each distinct value once, then map back to the rows
+            values, inverse = np.unique(_as_str_array(columns[name]), return_inverse=True)
+            unknown = np.array([value not in levels for value in values.tolist()], dtype=bool)
+            invalid |= unknown[inverse.reshape(-1)]
+
+        if not invalid.any():
+            return np.arange(n_rows), []
+
+        errors = [
+            {
+                "row": row,
+                "errors": self._row_errors(
+                    {name: _python_value(columns[name][row]) for name in self.required_columns}
+                ),
+            }
+            for row in np.flatnonzero(invalid).tolist()
+        ]
+        return np.flatnonzero(~invalid), errors
+
+    def _invalid_numeric(self, matrix):
+        """Return a per-row mask of rows with a bad numeric value."""
+        # None and unparseable values are NaN here, which fails every check
+        with np.errstate(invalid="ignore"):
+            invalid = ~((matrix >= self._low) & (matrix <= self._high))
+            invalid |= ~np.isfinite(matrix)
+            invalid |= self._integer & (matrix != np.floor(matrix))
+        return invalid.any(axis=1)
+
+    def _row_errors(self, record):
+        """Describe every problem with one record."""
+        errors = {}
+        for i, name in enumerate(self.numeric_features):
+            if name not in record:
+                errors[name] = "missing"
+                continue
+            value = record[name]
+            number = _to_float(value)
+            if not np.isfinite(number):
+                errors[name] = f"expected a number, got {value!r}"
+            elif self._integer[i] and number != np.floor(number):
+                errors[name] = f"{value!r} is not a whole number"
+            elif not self._low[i] <= number <= self._high[i]:
+                errors[name] = (
+                    f"{value!r} is outside the accepted range "
+                    f"[{self._low[i]:g}, {self._high[i]:g}]"
+                )
+
+        for name, levels in self._levels.items():
+            if name not in record:
+                errors[name] = "missing"
+            elif not _is_level(record[name], levels):
+                known = ", ".join(sorted(levels))
+                errors[name] = f"unknown value {record[name]!r} (expected one of: {known})"
+        return errors
+
+
+def _tuple_getter(names):
+    """Return a function mapping a record to a tuple of its values for names."""
+    if len(names) == 1:
+        name = names[0]
+        return lambda record: (record[name],)
+    return operator.itemgetter(*names)
+
+
+def _as_str_array(values):
+    """Convert a column of category values to a NumPy string array."""
+    try:
+        return np.asarray(values).astype(str)
+    except ValueError:
+        # Ragged values (e.g. nested lists) can't form an array directly
+        return np.array([str(value) for value in values])
+
+
+def _python_value(value):
+    """Unwrap a NumPy scalar so error messages show plain values."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _has_bool(values):
+    """Return True if any value is a boolean (which float() accepts as 0/1)."""
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        return values.dtype.kind == "b"
+    return any(kind in _BOOL_TYPES for kind in set(map(type, values)))
+
+
+def _to_float(value):
+    """Convert one value to float, or NaN if it isn't a number (booleans included)."""
+    if isinstance(value, _BOOL_TYPES):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _is_level(value, levels):
+    """Return True if value is one of the known category levels."""
+    try:
+        return value in levels
+    except TypeError:
+        return False
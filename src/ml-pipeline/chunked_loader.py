@@ -0,0 +1,252 @@
+"""
+Out-of-core loader for the training data.
+
+load_mltable_data() materializes a whole split as a DataFrame, and
+prepare_features() copies it again (drop, get_dummies) before
+scikit-learn makes its own float32 copy. This module streams the split
+instead, in two passes over batches of rows:
+
+1. scan_schema() collects the row count, categorical levels, numeric
+   ranges and dtypes, which fixes the feature layout up front
+2. load_matrix() encodes each batch with the fitted FeatureEncoder
+   (feature_pipeline.py) straight into a preallocated float32 feature
+   matrix (the dtype scikit-learn's forests train on, so fit() makes no
+   further copy) and a float64 target vector
+
+Only one batch is ever held as a DataFrame.
+
+Local MLTable directories (as mounted into an Azure ML job) reading CSV
+with read_delimited or Parquet with read_parquet are streamed file by
+file; a .csv or .parquet file path is streamed directly. Anything else
+(remote URIs, other transformations) falls back to mltable, loaded in
+one piece and then encoded the same way.
+"""
+
+import glob
+import os
+import resource
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BATCH_ROWS = 250_000
+
+# MLTable transformations the streaming reader understands
+READ_TRANSFORMATIONS = {"read_delimited": "csv", "read_parquet": "parquet"}
+
+
+def peak_memory_mb() -> float:
+    """Peak resident memory of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class DataSource:
+    """A split's data files, read back in batches of rows."""
+
+    def __init__(self, path: str, batch_rows: int = DEFAULT_BATCH_ROWS):
+        """
+        Resolve the files behind a path.
+
+        Args:
+            path: MLTable directory, or a single .csv / .parquet file
+            batch_rows: Rows per batch
+        """
+        self.path = path
+        self.batch_rows = batch_rows
+        self.format, self.files, self.options = resolve_files(path)
+
+    @property
+    def streaming(self) -> bool:
+        """True when batches are read file by file rather than via mltable."""
+        return self.format is not None
+
+    def count_rows(self) -> int:
+        """Count the rows (from Parquet metadata when possible)."""
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            return sum(pq.ParquetFile(file).metadata.num_rows for file in self.files)
+        return sum(len(batch) for batch in self.iter_batches(usecols=[0]))
+
+    def iter_batches(self, categorical=(), usecols=None):
+        """
+        Yield DataFrames of at most batch_rows rows, in file order.
+
+        Args:
+            categorical: Columns to read as pandas categoricals (CSV parses
+                them straight to codes instead of one string object per row)
+            usecols: Optional subset of columns to read (CSV only)
+        """
+        if not self.streaming:
+            import mltable
+            df = mltable.load(self.path).to_pandas_dataframe()
+            for start in range(0, len(df), self.batch_rows):
+                yield df.iloc[start:start + self.batch_rows]
+            return
+
+        for file in self.files:
+            if self.format == "parquet":
+                import pyarrow.parquet as pq
+                for batch in pq.ParquetFile(file).iter_batches(batch_size=self.batch_rows):
+                    yield batch.to_pandas()
+            else:
+                with pd.read_csv(
+                    file,
+                    chunksize=self.batch_rows,
+                    dtype={name: "category" for name in categorical} or None,
+                    usecols=usecols,
+                    **self.options,
+                ) as reader:
+                    yield from reader
+
+
+def resolve_files(path: str):
+    """
+    Work out how to stream a path.
+
+    Args:
+        path: MLTable directory, or a single .csv / .parquet file
+
+    Returns:
+        Tuple of (format, files, read_csv options); format is None when the
+        path has to be loaded through mltable
+    """
+    local = Path(path)
+    if local.is_file():
+        if local.suffix == ".parquet":
+            return "parquet", [str(local)], {}
+        return "csv", [str(local)], {}
+
+    definition = local / "MLTable"
+    if not definition.is_file():
+        return None, [], {}
+
+    import yaml
+    with open(definition) as f:
+        spec = yaml.safe_load(f) or {}
+
+    transformations = spec.get("transformations") or []
+    if len(transformations) != 1:
+        return None, [], {}
+    transformation = transformations[0]
+    name = next(iter(transformation)) if isinstance(transformation, dict) else transformation
+    if name not in READ_TRANSFORMATIONS:
+        return None, [], {}
+    settings = (transformation.get(name) if isinstance(transformation, dict) else None) or {}
+
+    files = []
+    for entry in spec.get("paths") or []:
+        kind, value = next(iter(entry.items()))
+        if "://" in str(value):
+            return None, [], {}
+        target = str(local / value)
+        if kind == "file":
+            files.append(target)
+        elif kind == "folder":
+            files.extend(sorted(
+                p for p in glob.glob(os.path.join(target, "*")) if os.path.isfile(p)
+            ))
+        elif kind == "pattern":
+            files.extend(sorted(glob.glob(target, recursive=True)))
+        else:
+            return None, [], {}
+
+    options = {}
+    if name == "read_delimited":
+        options["sep"] = settings.get("delimiter", ",")
+        if settings.get("header") == "no_header":
+            return None, [], {}
+    return READ_TRANSFORMATIONS[name], files, options
+
+
+def scan_schema(source: DataSource, target_column: str) -> dict:
+    """
+    First pass: describe the split without keeping any rows.
+
+    Args:
+        source: DataSource for the training split
+        target_column: Name of the target column
+
+    Returns:
+        Dict with n_rows, numeric_features, categorical_features (field ->
+        sorted levels), numeric_ranges and dtypes, in the layout of
+        train.build_feature_schema()
+    """
+    n_rows = 0
+    columns = None
+    dtypes = {}
+    levels = {}
+    ranges = {}
+
+    for batch in source.iter_batches():
+        if target_column not in batch.columns:
+            raise ValueError(f"Target column '{target_column}' not found in data")
+        if columns is None:
+            columns = [c for c in batch.columns if c not in (target_column, "id")]
+        n_rows += len(batch)
+
+        for c in columns:
+            series = batch[c]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype(str)
+            if pd.api.types.is_numeric_dtype(series):
+                # Widen across batches (e.g. int64 in one, float64 in another)
+                dtype = np.result_type(dtypes[c], series.dtype) if c in dtypes else series.dtype
+                dtypes[c] = dtype
+                low, high = float(series.min()), float(series.max())
+                if c in ranges:
+                    low, high = min(low, ranges[c][0]), max(high, ranges[c][1])
+                ranges[c] = [low, high]
+            else:
+                dtypes.setdefault(c, series.dtype)
+                levels.setdefault(c, set()).update(str(level) for level in series.dropna().unique())
+
+    if columns is None:
+        raise ValueError(f"No rows found in {source.path}")
+
+    numeric_features = [c for c in columns if c not in levels]
+    return {
+        "n_rows": n_rows,
+        "numeric_features": numeric_features,
+        "categorical_features": {c: sorted(levels[c]) for c in columns if c in levels},
+        "numeric_ranges": {c: ranges[c] for c in numeric_features},
+        "dtypes": {c: str(dtypes[c]) for c in columns},
+    }
+
+
+def load_matrix(source: DataSource, encoder, target_column: str, n_rows: int = None):
+    """
+    Second pass: encode a split into a preallocated float32 matrix.
+
+    Args:
+        source: DataSource for the split
+        encoder: FeatureEncoder fitted on the training split
+        target_column: Name of the target column
+        n_rows: Rows in the split (counted with count_rows() when omitted)
+
+    Returns:
+        Tuple of (X float32 array of shape (n_rows, n_features), y float64 array)
+    """
+    if n_rows is None:
+        n_rows = source.count_rows()
+
+    X = np.empty((n_rows, encoder.n_features), dtype=np.float32)
+    y = np.empty(n_rows, dtype=np.float64)
+
+    start = 0
+    for batch in source.iter_batches(categorical=list(encoder.categorical_levels)):
+        stop = start + len(batch)
+        if stop > n_rows:
+            raise ValueError(f"{source.path} has more than the {n_rows} rows scanned")
+        if target_column not in batch.columns:
+            raise ValueError(f"Target column '{target_column}' not found in data")
+        y[start:stop] = batch[target_column].to_numpy(dtype=np.float64)
+        encoder.transform(batch, out=X[start:stop])
+        start = stop
+
+    if start != n_rows:
+        raise ValueError(f"{source.path} has {start} rows, expected {n_rows}")
+    return X, y
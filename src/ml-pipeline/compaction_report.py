@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Report what compaction does to a trained random forest artifact.
+
+Takes a model directory written by train.py (model.pkl and encoder.json,
+e.g. ./outputs) and re-exports the forest in each variant, under
+<output-dir>/<variant>/:
+
+- baseline: uncompressed model.pkl and the full-precision forest/ bundle
+- compact: float32 thresholds/values and narrow indices
+- compact_compressed: compact, with model.pkl and forest/ compressed
+- pruned: compact_compressed, pruned to --prune-rmse-budget (if given)
+
+For each it reports the artifact size (model.pkl + forest/, what model
+registration uploads and every endpoint instance downloads), the time to
+load model.pkl, the endpoint's cold start (loading the forest bundle with
+src/deploy/forest_engine.py and scoring a first row), scoring latency per
+batch size, validation RMSE, and the largest prediction change against
+the baseline. Files are read from the page cache, so load times exclude
+disk and network. With --prune-rmse-budget, part of the validation rows
+(--prune-holdout-fraction) is held out to choose the pruning and every
+variant is measured on the rest.
+
+The report is also written to <output-dir>/compaction_report.json.
+
+Example:
+    python compaction_report.py --model-dir outputs --val-data ../data/mltable/val \\
+        --prune-rmse-budget 0.01
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from chunked_loader import DEFAULT_BATCH_ROWS, DataSource, load_matrix
+from feature_pipeline import FeatureEncoder
+from forest_export import export_flat_forest
+from model_compaction import split_holdout
+from train import save_model
+from warm_start import find_prior_artifact
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Report artifact size, load time and latency before/after compaction"
+    )
+    parser.add_argument("--model-dir", required=True,
+                        help="Directory holding model.pkl and encoder.json")
+    parser.add_argument("--val-data", required=True,
+                        help="Path or URI to the validation MLTable")
+    parser.add_argument("--target-column", default="price",
+                        help="Name of the target column (default: price)")
+    parser.add_argument("--prune-rmse-budget", type=float,
+                        help="Also report a pruned variant within this relative RMSE budget")
+    parser.add_argument("--prune-holdout-fraction", type=float, default=0.5,
+                        help="Share of the validation rows used to choose the pruning "
+                             "and left out of the report (default: 0.5)")
+    parser.add_argument("--batch-sizes", default="1,1000",
+                        help="Comma-separated scoring batch sizes (default: 1,1000)")
+    parser.add_argument("--repeats", type=int, default=20,
+                        help="Timed loads and scoring calls per variant (default: 20)")
+    parser.add_argument("--output-dir", default="./outputs/compaction",
+                        help="Directory for each variant and the report "
+                             "(default: ./outputs/compaction)")
+    parser.add_argument("--deploy-dir",
+                        default=str(Path(__file__).parent.parent / "deploy"),
+                        help="Directory holding forest_engine.py (default: ../deploy)")
+    return parser.parse_args()
+
+
+def median_ms(fn, repeats: int) -> float:
+    """Median wall-clock milliseconds of repeated calls."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def artifact_bytes(model_dir: Path) -> dict:
+    """Bytes of model.pkl and of the forest/ bundle."""
+    return {
+        "model_pkl_bytes": (model_dir / "model.pkl").stat().st_size,
+        "forest_bytes": sum(p.stat().st_size for p in (model_dir / "forest").iterdir()),
+    }
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    sys.path.insert(0, args.deploy_dir)
+    from forest_engine import FlatForest
+
+    model_path = find_prior_artifact(args.model_dir, "model.pkl")
+    encoder_path = find_prior_artifact(args.model_dir, "encoder.json")
+    if model_path is None or encoder_path is None:
+        raise SystemExit(f"[ERROR] model.pkl and encoder.json are required in {args.model_dir}")
+    model = joblib.load(model_path)
+    if not hasattr(model, "estimators_"):
+        raise SystemExit(f"[ERROR] {model_path} is a {type(model).__name__}, not a random forest")
+    encoder = FeatureEncoder.load(encoder_path)
+    X_val, y_val = load_matrix(DataSource(args.val_data, DEFAULT_BATCH_ROWS), encoder,
+                               args.target_column)
+
+    variants = [
+        ("baseline", {}),
+        ("compact", {"compact": True}),
+        ("compact_compressed", {"compact": True, "compress": True}),
+    ]
+    if args.prune_rmse_budget is not None:
+        X_val, y_val, X_prune, y_prune = split_holdout(X_val, y_val, args.prune_holdout_fraction)
+        variants.append(("pruned", {"compact": True, "compress": True,
+                                    "prune_rmse_budget": args.prune_rmse_budget,
+                                    "X_prune": X_prune, "y_prune": y_prune}))
+
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+    output_dir = Path(args.output_dir)
+    results = []
+    baseline = None
+    for name, options in variants:
+        print()
+        print(f"[compact] {name}")
+        variant_dir = output_dir / name
+        save_model(model, variant_dir, compress=options.get("compress", False))
+        export_flat_forest(model, variant_dir, X_check=X_val,
+                           feature_columns=encoder.feature_columns, **options)
+
+        pkl_load_ms = median_ms(lambda: joblib.load(variant_dir / "model.pkl"), args.repeats)
+        forest_dir = variant_dir / "forest"
+        cold_start_ms = median_ms(
+            lambda: FlatForest.load(forest_dir).predict(X_val[:1]), args.repeats
+        )
+        forest = FlatForest.load(forest_dir)
+        latency_ms = {
+            batch_size: median_ms(
+                lambda X=X_val[np.arange(batch_size) % len(X_val)]: forest.predict(X),
+                args.repeats,
+            )
+            for batch_size in batch_sizes
+        }
+        predictions = forest.predict(X_val)
+        if baseline is None:
+            baseline = predictions
+
+        results.append({
+            "variant": name,
+            **artifact_bytes(variant_dir),
+            "n_trees": forest.n_estimators,
+            "n_nodes": len(forest.value),
+            "memory_bytes": forest.nbytes,
+            "pkl_load_ms": pkl_load_ms,
+            "cold_start_ms": cold_start_ms,
+            "latency_ms": latency_ms,
+            "val_rmse": float(np.sqrt(np.mean((predictions - y_val) ** 2))),
+            "max_abs_diff": float(np.max(np.abs(predictions - baseline))),
+        })
+
+    print()
+    print("=" * 100)
+    print(f"Compaction report ({len(X_val):,} validation rows, median of {args.repeats})")
+    print("=" * 100)
+    header = (f"{'variant':<19} {'pkl MB':>7} {'forest MB':>9} {'trees':>5} {'nodes':>9} "
+              f"{'pkl load ms':>11} {'cold ms':>8}")
+    header += "".join(f" {f'p50 ms@{b}':>11}" for b in batch_sizes)
+    header += f" {'val RMSE':>11} {'max diff':>9}"
+    print(header)
+    for r in results:
+        line = (f"{r['variant']:<19} {r['model_pkl_bytes'] / 1e6:>7.2f} "
+                f"{r['forest_bytes'] / 1e6:>9.2f} {r['n_trees']:>5} {r['n_nodes']:>9,} "
+                f"{r['pkl_load_ms']:>11.1f} {r['cold_start_ms']:>8.2f}")
+        line += "".join(f" {r['latency_ms'][b]:>11.3f}" for b in batch_sizes)
+        line += f" {r['val_rmse']:>11,.2f} {r['max_abs_diff']:>9.3g}"
+        print(line)
+    print("=" * 100)
+
+    report_path = output_dir / "compaction_report.json"
+    with open(report_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"[compact] Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
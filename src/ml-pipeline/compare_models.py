@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Compare the random forest with histogram gradient boosting, side by side.
+
+Trains both model types on the same training and validation splits with
+train.py's functions (one-hot features for the forest, ordinal codes with
+native categorical splits for boosting), saves each one's artifacts under
+<output-dir>/<model type>/, and reports:
+
+- fit time
+- model size: model.pkl, and what the endpoint actually loads (the flat
+  forest bundle for the forest, model.pkl for boosting)
+- validation RMSE
+- scoring latency per batch size, through the endpoint's own scoring path
+  (src/deploy/score.py: validate, encode, predict; cache disabled) when it
+  can be imported, otherwise encoder + model.predict
+
+The report is also written to <output-dir>/model_comparison.json.
+
+Example:
+    python compare_models.py --train-data ../data/mltable/train \\
+        --val-data ../data/mltable/val
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+from sklearn.metrics import mean_squared_error
+
+from chunked_loader import DEFAULT_BATCH_ROWS, DataSource
+from forest_export import export_flat_forest
+from train import (
+    MODEL_TYPES,
+    load_features_chunked,
+    save_model,
+    train_boosting_model,
+    train_model,
+)
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compare random forest and histogram gradient boosting models"
+    )
+    parser.add_argument("--train-data", required=True,
+                        help="Path or URI to the training MLTable")
+    parser.add_argument("--val-data", required=True,
+                        help="Path or URI to the validation MLTable")
+    parser.add_argument("--target-column", default="price",
+                        help="Name of the target column (default: price)")
+    parser.add_argument("--n-estimators", type=int, default=100,
+                        help="Forest trees and boosting iterations (default: 100)")
+    parser.add_argument("--batch-sizes", default="1,100,1000",
+                        help="Comma-separated scoring batch sizes (default: 1,100,1000)")
+    parser.add_argument("--repeats", type=int, default=50,
+                        help="Timed scoring calls per batch size (default: 50)")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS,
+                        help=f"Rows per batch when loading (default: {DEFAULT_BATCH_ROWS})")
+    parser.add_argument("--output-dir", default="./outputs/compare",
+                        help="Directory for each model's artifacts and the report "
+                             "(default: ./outputs/compare)")
+    parser.add_argument("--deploy-dir",
+                        default=str(Path(__file__).parent.parent / "deploy"),
+                        help="Directory holding score.py (default: ../deploy)")
+    return parser.parse_args()
+
+
+def load_scorer(deploy_dir: str):
+    """
+    Import the endpoint's model loader, with its prediction cache disabled.
+
+    Returns:
+        score.load_scoring_model, or None when score.py can't be imported
+    """
+    os.environ["SCORE_CACHE_SIZE"] = "0"
+    sys.path.insert(0, deploy_dir)
+    try:
+        import score
+    except ImportError as e:
+        print(f"[compare] Can't import score.py from {deploy_dir} ({e}); "
+              f"timing encoder + model.predict instead")
+        return None
+    return score.load_scoring_model
+
+
+def artifact_bytes(path: Path) -> int:
+    """Size of a file, or of every file under a directory."""
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return path.stat().st_size
+
+
+def time_scoring(score_fn, records: list, batch_sizes: list, repeats: int) -> dict:
+    """
+    Median scoring latency per batch size.
+
+    Args:
+        score_fn: Callable scoring a list of records
+        records: Records to build batches from (reused cyclically)
+        batch_sizes: Batch sizes to time
+        repeats: Timed calls per batch size
+
+    Returns:
+        Dict of batch size -> median milliseconds per call
+    """
+    latencies = {}
+    for batch_size in batch_sizes:
+        batch = [records[i % len(records)] for i in range(batch_size)]
+        score_fn(batch)  # warm-up
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            score_fn(batch)
+            timings.append((time.perf_counter() - start) * 1000)
+        latencies[batch_size] = statistics.median(timings)
+    return latencies
+
+
+def val_records(val_path: str, target_column: str, batch_rows: int, limit: int) -> list:
+    """Raw validation rows as request records (without target and id)."""
+    records = []
+    for batch in DataSource(val_path, batch_rows).iter_batches():
+        batch = batch.drop(columns=[c for c in (target_column, "id") if c in batch.columns])
+        for column in batch.columns:
+            if isinstance(batch[column].dtype, pd.CategoricalDtype):
+                batch[column] = batch[column].astype(str)
+        records.extend(batch.to_dict("records"))
+        if len(records) >= limit:
+            break
+    return records[:limit]
+
+
+def compare(args) -> list:
+    """Train, save and measure each model type; returns one result dict per type."""
+    output_dir = Path(args.output_dir)
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+    records = val_records(args.val_data, args.target_column, args.batch_rows, max(batch_sizes))
+    load_scoring_model = load_scorer(args.deploy_dir)
+
+    results = []
+    for model_type, categorical_encoding in MODEL_TYPES.items():
+        print()
+        print(f"[compare] {model_type}")
+        X_train, y_train, X_val, y_val, encoder, feature_schema = load_features_chunked(
+            args.train_data, args.val_data, args.target_column, args.batch_rows,
+            categorical_encoding=categorical_encoding,
+        )
+
+        started = time.perf_counter()
+        if model_type == "hist_gradient_boosting":
+            model = train_boosting_model(X_train, y_train, encoder.categorical_columns,
+                                         args.n_estimators)
+        else:
+            model = train_model(X_train, y_train, args.n_estimators)
+        fit_s = time.perf_counter() - started
+        val_rmse = mean_squared_error(y_val, model.predict(X_val)) ** 0.5
+
+        model_dir = output_dir / model_type
+        save_model(model, model_dir, feature_schema, encoder)
+        served = model_dir / "model.pkl"
+        if model_type == "random_forest":
+            export_flat_forest(model, model_dir, X_check=X_val,
+                               feature_columns=encoder.feature_columns)
+            served = model_dir / "forest"
+
+        if load_scoring_model is not None:
+            scoring_model = load_scoring_model(str(model_dir), model_type)
+            score_fn = scoring_model.predict_records
+        else:
+            score_fn = lambda batch: model.predict(encoder.transform(pd.DataFrame(batch)))
+        latency_ms = time_scoring(score_fn, records, batch_sizes, args.repeats)
+
+        results.append({
+            "model_type": model_type,
+            "n_features": encoder.n_features,
+            "fit_s": fit_s,
+            "model_pkl_bytes": artifact_bytes(model_dir / "model.pkl"),
+            "served_artifact": served.name,
+            "served_bytes": artifact_bytes(served),
+            "val_rmse": float(val_rmse),
+            "latency_ms": latency_ms,
+            "scoring_path": "score.py" if load_scoring_model is not None else "model.predict",
+        })
+    return results
+
+
+def print_report(results: list, repeats: int):
+    """Print the comparison table."""
+    batch_sizes = list(results[0]["latency_ms"])
+    print()
+    print("=" * 78)
+    print(f"Model comparison (scoring via {results[0]['scoring_path']}, "
+          f"median of {repeats} calls)")
+    print("=" * 78)
+    header = (f"{'model':<24} {'features':>8} {'fit s':>7} {'pkl MB':>7} "
+              f"{'served MB':>9} {'val RMSE':>11}")
+    header += "".join(f" {f'p50 ms@{b}':>11}" for b in batch_sizes)
+    print(header)
+    for r in results:
+        line = (f"{r['model_type']:<24} {r['n_features']:>8} {r['fit_s']:>7.2f} "
+                f"{r['model_pkl_bytes'] / 1e6:>7.2f} {r['served_bytes'] / 1e6:>9.2f} "
+                f"{r['val_rmse']:>11,.2f}")
+        line += "".join(f" {r['latency_ms'][b]:>11.3f}" for b in batch_sizes)
+        print(line)
+    print("=" * 78)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    results = compare(args)
+    print_report(results, args.repeats)
+
+    report_path = Path(args.output_dir) / "model_comparison.json"
+    with open(report_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"[compare] Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Fitted feature encoder shared by training, evaluation and scoring.
+
+The encoder is fitted once on the training split. Numeric inputs keep their
+positions, and categorical inputs are encoded one of two ways:
+
+- onehot (random forest): every level gets a fixed one-hot column, with
+  the first (sorted) level of each field as the all-zeros baseline, which
+  is the layout pd.get_dummies(drop_first=True) produced
+- ordinal (histogram gradient boosting): one column per field holding the
+  level's index in the sorted levels (NaN when unknown), for models with
+  native categorical support
+
+Applying it is one vectorized pass per batch: numeric columns are copied
+in and categorical columns are mapped through category codes, so no
+string column names are built per split and a validation split missing a
+level needs no patching afterwards.
+
+The fitted state is written to encoder.json next to the model as plain
+integer lookups (field -> column, level -> column or code), in the format
+src/deploy/feature_encoder.py loads, so the endpoint encodes requests
+with exactly the mapping the model was trained with.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ENCODER_FORMAT = "feature-encoder"
+ENCODER_VERSION = 1
+CATEGORICAL_ENCODINGS = ["onehot", "ordinal"]
+
+
+class FeatureEncoder:
+    """Encode raw house columns into the model's float32 feature matrix."""
+
+    def __init__(self, numeric_features, categorical_levels, categorical_encoding="onehot"):
+        """
+        Assign every feature column its position.
+
+        Args:
+            numeric_features: Numeric input fields, in column order
+            categorical_levels: Dict of categorical input field -> levels
+            categorical_encoding: "onehot" (the first sorted level is the
+                baseline and gets no column) or "ordinal" (one code column
+                per field)
+        """
+        if categorical_encoding not in CATEGORICAL_ENCODINGS:
+            raise ValueError(f"Unknown categorical encoding: {categorical_encoding}")
+        self.categorical_encoding = categorical_encoding
+        self.numeric_features = list(numeric_features)
+        self.categorical_levels = {
+            name: sorted(str(level) for level in levels)
+            for name, levels in categorical_levels.items()
+        }
+
+        self.numeric_index = {name: i for i, name in enumerate(self.numeric_features)}
+        self.feature_columns = list(self.numeric_features)
+        # onehot: field -> {level: column}; ordinal: field -> column
+        self.category_slots = {}
+        self.category_positions = {}
+        for name, levels in self.categorical_levels.items():
+            if categorical_encoding == "ordinal":
+                self.category_positions[name] = len(self.feature_columns)
+                self.feature_columns.append(name)
+                continue
+            slots = {}
+            for level in levels[1:]:
+                slots[level] = len(self.feature_columns)
+                self.feature_columns.append(f"{name}_{level}")
+            self.category_slots[name] = slots
+        self.n_features = len(self.feature_columns)
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, target_column: str, categorical_encoding="onehot"):
+        """
+        Fit the encoder on a training DataFrame.
+
+        Numeric-typed columns are numeric features; every other column
+        (except the target and id) is categorical.
+
+        Args:
+            df: Raw training DataFrame
+            target_column: Name of the target column
+            categorical_encoding: See __init__
+
+        Returns:
+            Fitted FeatureEncoder
+        """
+        raw = df.drop(columns=[c for c in (target_column, "id") if c in df.columns])
+        numeric_features = [c for c in raw.columns if pd.api.types.is_numeric_dtype(raw[c])]
+        categorical_levels = {
+            c: raw[c].dropna().astype(str).unique()
+            for c in raw.columns
+            if c not in numeric_features
+        }
+        return cls(numeric_features, categorical_levels, categorical_encoding)
+
+    @property
+    def categorical_columns(self) -> list:
+        """Positions of the ordinal category columns (for native splits)."""
+        return list(self.category_positions.values())
+
+    def transform(self, df: pd.DataFrame, out=None) -> np.ndarray:
+        """
+        Encode a DataFrame (a whole split or one batch of it).
+
+        One-hot: levels without a column (the baseline, or one not seen in
+        training) and missing values encode as all zeros. Ordinal: unknown
+        levels and missing values encode as NaN.
+
+        Args:
+            df: DataFrame with the raw input columns
+            out: Optional preallocated float32 array of shape
+                (len(df), n_features) to fill in place
+
+        Returns:
+            float32 NumPy array of shape (len(df), n_features)
+        """
+        required = self.numeric_features + list(self.categorical_levels)
+        missing = [c for c in required if c not in df.columns]
+        if missing:
+            raise ValueError(f"Missing feature columns: {missing}")
+
+        n_rows = len(df)
+        if out is None:
+            X = np.zeros((n_rows, self.n_features), dtype=np.float32)
+        else:
+            X = out
+            X.fill(0.0)
+
+        for name, position in self.numeric_index.items():
+            X[:, position] = df[name].to_numpy(dtype=np.float32)
+
+        rows = np.arange(n_rows)
+        for name, slots in self.category_slots.items():
+            categories, codes = _category_codes(df[name])
+            # Map each distinct level to its column once, then index by code
+            level_cols = np.array(
+                [slots.get(str(level), -1) for level in categories] + [-1], dtype=np.intp
+            )
+            cols = level_cols[codes]  # code -1 (missing) -> -1
+            hit = cols >= 0
+            X[rows[hit], cols[hit]] = 1.0
+
+        for name, position in self.category_positions.items():
+            categories, codes = _category_codes(df[name])
+            lookup = {level: i for i, level in enumerate(self.categorical_levels[name])}
+            level_codes = np.array(
+                [lookup.get(str(level), np.nan) for level in categories] + [np.nan],
+                dtype=np.float32,
+            )
+            X[:, position] = level_codes[codes]
+
+        return X
+
+    def to_dict(self) -> dict:
+        """JSON-serializable fitted state, as loaded by the scoring side."""
+        return {
+            "format": ENCODER_FORMAT,
+            "version": ENCODER_VERSION,
+            "n_features": self.n_features,
+            "feature_columns": self.feature_columns,
+            "categorical_encoding": self.categorical_encoding,
+            "numeric": self.numeric_index,
+            "categorical": self.category_slots,
+            "ordinal": {
+                name: {
+                    "position": position,
+                    "codes": {level: i for i, level in enumerate(self.categorical_levels[name])},
+                }
+                for name, position in self.category_positions.items()
+            },
+            "categorical_levels": self.categorical_levels,
+        }
+
+    def save(self, path: Path):
+        """Write the fitted state to encoder.json (normally in outputs/)."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: Path):
+        """
+        Load an encoder written by save().
+
+        Args:
+            path: Path to encoder.json
+
+        Returns:
+            FeatureEncoder with the saved layout
+        """
+        with open(path) as f:
+            spec = json.load(f)
+        if spec.get("format") != ENCODER_FORMAT:
+            raise ValueError(f"{path} is not a feature encoder file")
+        numeric_features = sorted(spec["numeric"], key=spec["numeric"].get)
+        encoder = cls(numeric_features, spec["categorical_levels"],
+                      spec.get("categorical_encoding", "onehot"))
+        if encoder.feature_columns != spec["feature_columns"]:
+            raise ValueError(f"{path} has an inconsistent column layout")
+        return encoder
+
+
+def _category_codes(series: pd.Series):
+    """
+    Category codes of a column.
+
+    Returns:
+        Tuple of (categories, int codes with -1 for missing values)
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    return series.cat.categories, series.cat.codes.to_numpy()
@@ -0,0 +1,220 @@
+"""
+Export a trained RandomForestRegressor as flat NumPy arrays.
+
+All trees are concatenated into one set of contiguous node arrays
+(feature, threshold, children, value) so the scoring side can walk the
+whole forest for a batch with a handful of vectorized NumPy operations,
+without loading scikit-learn estimators at all.
+
+The arrays are written as a forest/ bundle of plain .npy files in the exact
+dtype and layout src/deploy/forest_engine.py scores with, so the endpoint
+can memory-map them instead of unpickling anything. For a smaller
+artifact the bundle can be pruned and compacted (see model_compaction.py)
+and stored as one compressed arrays.npz instead, which the endpoint reads
+into memory.
+"""
+
+import json
+from pathlib import Path
+import numpy as np
+
+from model_compaction import (
+    NODE_ARRAYS,
+    choose_pruning,
+    compact_arrays,
+    prune_flat_forest,
+)
+
+# scikit-learn marks leaves with this child index
+TREE_LEAF = -1
+
+
+def flatten_forest(model) -> dict:
+    """
+    Flatten every tree of a fitted forest into shared node arrays.
+
+    Leaves are rewritten to point at themselves with an infinite threshold,
+    so a traversal can simply run max_depth steps: once a row reaches a
+    leaf it stays there. Children are interleaved per node as
+    [right, left], so the next node is children[2 * node + (x <= threshold)].
+
+    Args:
+        model: Fitted RandomForestRegressor
+
+    Returns:
+        Dict of node arrays plus max_depth and n_features
+    """
+    features, thresholds, children, values, roots = [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+        node_ids = np.arange(offset, offset + n_nodes, dtype=np.int64)
+        is_leaf = tree.children_left == TREE_LEAF
+
+        features.append(np.where(is_leaf, 0, tree.feature).astype(np.int64))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        left = np.where(is_leaf, node_ids, tree.children_left + offset)
+        right = np.where(is_leaf, node_ids, tree.children_right + offset)
+        children.append(np.stack([right, left], axis=1).ravel().astype(np.int64))
+        values.append(tree.value[:, 0, 0].astype(np.float64))
+        roots.append(offset)
+
+        offset += n_nodes
+        max_depth = max(max_depth, tree.max_depth)
+
+    return {
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds),
+        "children": np.concatenate(children),
+        "value": np.concatenate(values),
+        "roots": np.array(roots, dtype=np.int64),
+        "max_depth": int(max_depth),
+        "n_features": int(model.n_features_in_),
+    }
+
+
+def predict_flat(arrays: dict, X) -> np.ndarray:
+    """
+    Score a batch with flattened forest arrays.
+
+    A plain reference version of the traversal in
+    src/deploy/forest_engine.py, used to check parity before the export
+    is written.
+
+    Args:
+        arrays: Output of flatten_forest()
+        X: Feature matrix (n_rows, n_features)
+
+    Returns:
+        NumPy array of predictions
+    """
+    X = np.asarray(X, dtype=np.float32)
+    rows = np.arange(X.shape[0])
+    node = np.repeat(arrays["roots"][:, None], X.shape[0], axis=1)
+    for _ in range(arrays["max_depth"]):
+        go_left = X[rows, arrays["feature"][node]] <= arrays["threshold"][node]
+        node = arrays["children"][2 * node + go_left]
+    return arrays["value"][node].mean(axis=0, dtype=np.float64)
+
+
+def load_flat_forest(bundle_dir: Path) -> dict:
+    """
+    Read a forest/ bundle back into flat forest arrays.
+
+    Args:
+        bundle_dir: Directory written by export_flat_forest()
+
+    Returns:
+        Dict of node arrays plus max_depth and n_features, as stored
+        (compact bundles keep their narrow dtypes)
+    """
+    with open(bundle_dir / "meta.json") as f:
+        meta = json.load(f)
+    if meta.get("storage") == "npz":
+        with np.load(bundle_dir / "arrays.npz") as stored:
+            arrays = {name: stored[name] for name in NODE_ARRAYS}
+    else:
+        arrays = {name: np.load(bundle_dir / f"{name}.npy") for name in NODE_ARRAYS}
+    arrays["max_depth"] = meta["max_depth"]
+    arrays["n_features"] = meta["n_features"]
+    return arrays
+
+
+def export_flat_forest(model, output_dir: Path, X_check=None, rtol: float = 1e-9,
+                       feature_columns=None, compact: bool = False, compress: bool = False,
+                       prune_rmse_budget: float = None, X_prune=None, y_prune=None):
+    """
+    Flatten the forest, verify it against model.predict and save it.
+
+    Args:
+        model: Fitted RandomForestRegressor
+        output_dir: Directory to write the forest/ bundle into
+        X_check: Optional feature matrix used for the parity check
+        rtol: Relative tolerance allowed between the two predictions
+        feature_columns: Feature column names, for models fitted on a
+            plain array (defaults to model.feature_names_in_)
+        compact: Store float32 thresholds/values and narrow integer indices
+        compress: Store the node arrays as one compressed arrays.npz rather
+            than memory-mappable .npy files
+        prune_rmse_budget: Optionally prune to the smallest forest whose
+            RMSE on (X_prune, y_prune) is within this relative budget of the
+            full forest's (e.g. 0.01)
+        X_prune: Holdout features to choose the pruning on, required for
+            pruning; keep them apart from the split the served model's
+            RMSE is reported on (see model_compaction.split_holdout())
+        y_prune: Target for X_prune
+
+    Returns:
+        Path to the written forest/ bundle directory
+    """
+    print("[train] Flattening forest for the scoring engine ...")
+    arrays = flatten_forest(model)
+
+    if X_check is not None:
+        expected = model.predict(X_check)
+        actual = predict_flat(arrays, X_check)
+        if not np.allclose(actual, expected, rtol=rtol, atol=0.0):
+            max_diff = float(np.max(np.abs(actual - expected)))
+            raise ValueError(f"Flat forest does not match model.predict (max diff {max_diff})")
+        print(f"[train] Parity check passed on {len(expected)} rows")
+
+    pruning = None
+    if prune_rmse_budget is not None:
+        if X_prune is None or y_prune is None:
+            raise ValueError("Pruning needs a holdout split (X_prune and y_prune)")
+        pruning = choose_pruning(arrays, X_prune, y_prune, prune_rmse_budget)
+        n_nodes = len(arrays["value"])
+        arrays = prune_flat_forest(arrays, pruning["n_trees"], pruning["depth"])
+        print(f"[train] Pruned to {pruning['n_trees']} tree(s) cut at depth {pruning['depth']}: "
+              f"{pruning['n_nodes']:,} of {n_nodes:,} nodes, holdout RMSE "
+              f"{pruning['holdout_rmse']:,.2f} (full forest {pruning['full_holdout_rmse']:,.2f})")
+
+    if compact:
+        reference = predict_flat(arrays, X_check) if X_check is not None else None
+        arrays = compact_arrays(arrays)
+        if reference is not None:
+            # Rounded-down thresholds keep every split decision; only the
+            # float32 leaf values move the predictions, each by at most one
+            # float32 rounding step of the largest value
+            actual = predict_flat(arrays, X_check)
+            atol = float(np.abs(arrays["value"]).max()) * np.finfo(np.float32).eps
+            if not np.allclose(actual, reference, rtol=0.0, atol=atol):
+                max_diff = float(np.max(np.abs(actual - reference)))
+                raise ValueError(f"Compact forest drifted from the full forest (max diff {max_diff})")
+            print(f"[train] Compact parity check passed on {len(reference)} rows "
+                  f"(max diff {float(np.max(np.abs(actual - reference))):.4g})")
+
+    bundle_dir = output_dir / "forest"
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    if compress:
+        np.savez_compressed(bundle_dir / "arrays.npz", **{name: arrays[name] for name in NODE_ARRAYS})
+    else:
+        for name in NODE_ARRAYS:
+            np.save(bundle_dir / f"{name}.npy", arrays[name])
+
+    if feature_columns is None:
+        feature_columns = getattr(model, "feature_names_in_", None)
+    meta = {
+        "format": "flat-forest",
+        "version": 2,
+        "n_estimators": len(arrays["roots"]),
+        "n_nodes": len(arrays["value"]),
+        "max_depth": arrays["max_depth"],
+        "n_features": arrays["n_features"],
+        "feature_columns": list(feature_columns) if feature_columns is not None else None,
+        "storage": "npz" if compress else "npy",
+        "compact": compact,
+        "pruning": pruning,
+    }
+    with open(bundle_dir / "meta.json", "w") as f:
+        json.dump(meta, f, indent=2)
+
+    size = sum(p.stat().st_size for p in bundle_dir.iterdir())
+    print(
+        f"[train] Flat forest saved to {bundle_dir} "
+        f"({meta['n_estimators']} trees, {meta['n_nodes']} nodes, {size / 1e6:,.2f} MB)"
+    )
+    return bundle_dir
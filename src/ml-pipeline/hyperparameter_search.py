@@ -0,0 +1,247 @@
+"""
+Successive-halving hyperparameter search for the house price forest.
+
+Every candidate configuration is first fitted with a small number of trees
+and scored on the validation split. Only the best 1/factor of them are
+promoted to the next rung, which refits with factor times as many trees,
+until the survivors are fitted with the full tree count. Most of the
+compute therefore goes to the few promising configurations instead of
+fitting the whole space at full size. The winner of the last rung is
+already the final model (full tree count, same random state as
+train.py), so it is returned rather than refitted.
+
+Candidates of a rung are fitted in parallel on a process pool, one
+single-threaded forest per worker. The feature matrices are written once
+to .npy files that every worker memory-maps, so they are shared rather
+than copied into each process.
+
+The search space is a JSON object of RandomForestRegressor parameter ->
+list of values, for example:
+
+    {"max_depth": [6, 10, 14, null], "min_samples_leaf": [1, 2, 5]}
+
+It is searched exhaustively (grid) or by sampling distinct combinations
+(random).
+"""
+
+import itertools
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+
+# Searched when no --search-space file is given
+DEFAULT_SEARCH_SPACE = {
+    "max_depth": [6, 10, 14, None],
+    "min_samples_leaf": [1, 2, 5],
+    "max_features": [1.0, 0.5, "sqrt"],
+}
+
+# Matrices shared with the worker processes (memory-mapped .npy files)
+_data = {}
+
+
+def load_search_space(path: str = None) -> dict:
+    """
+    Load a search space from JSON, or return the default space.
+
+    Args:
+        path: Optional path to a JSON file of parameter -> list of values
+
+    Returns:
+        Dict of parameter -> list of values
+    """
+    if path is None:
+        return DEFAULT_SEARCH_SPACE
+    with open(path) as f:
+        space = json.load(f)
+    for name, values in space.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"Search space entry '{name}' must be a non-empty list")
+    return space
+
+
+def grid_candidates(space: dict) -> list:
+    """Every combination of the space's values, as parameter dicts."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_candidates(space: dict, n_candidates: int, seed: int = 42) -> list:
+    """
+    Sample distinct combinations of the space's values.
+
+    Args:
+        space: Dict of parameter -> list of values
+        n_candidates: Combinations to sample (capped at the grid size)
+        seed: Random seed
+
+    Returns:
+        List of parameter dicts
+    """
+    grid = grid_candidates(space)
+    return random.Random(seed).sample(grid, min(n_candidates, len(grid)))
+
+
+def halving_schedule(n_candidates: int, min_trees: int, max_trees: int, factor: int) -> list:
+    """
+    Plan the rungs of a successive-halving search.
+
+    Tree counts step down from max_trees by factor while they stay at or
+    above min_trees (e.g. 11, 33, 100). A lone survivor goes straight to
+    the last rung.
+
+    Args:
+        n_candidates: Candidates in the first rung
+        min_trees: Fewest trees per forest in the first rung
+        max_trees: Trees per forest in the last rung
+        factor: Tree multiplier between rungs (and candidate divisor)
+
+    Returns:
+        List of (n_estimators, candidates fitted) per rung
+    """
+    if factor < 2:
+        raise ValueError("Halving factor must be at least 2")
+    trees = [max_trees]
+    while trees[0] // factor >= max(min_trees, 1):
+        trees.insert(0, trees[0] // factor)
+
+    schedule = []
+    survivors = n_candidates
+    for n_trees in trees[:-1]:
+        if survivors == 1:
+            break
+        schedule.append((n_trees, survivors))
+        survivors = math.ceil(survivors / factor)
+    schedule.append((max_trees, survivors))
+    return schedule
+
+
+def _load_data(data_dir):
+    """Process pool initializer: memory-map the shared matrices."""
+    for name in ("X_train", "y_train", "X_val", "y_val"):
+        _data[name] = np.load(os.path.join(data_dir, f"{name}.npy"), mmap_mode="r")
+
+
+def _fit_candidate(task):
+    """
+    Worker: fit one candidate and score it on the validation split.
+
+    Args:
+        task: Tuple of (candidate index, parameters, n_estimators,
+            random_state, return the fitted model)
+
+    Returns:
+        Result dict with the validation RMSE and timings (and the fitted
+        model under "model" when asked for)
+    """
+    index, params, n_estimators, random_state, keep_model = task
+    started = time.perf_counter()
+    model = RandomForestRegressor(
+        n_estimators=n_estimators, random_state=random_state, n_jobs=1, **params
+    )
+    model.fit(_data["X_train"], _data["y_train"])
+    fit_s = time.perf_counter() - started
+    rmse = mean_squared_error(_data["y_val"], model.predict(_data["X_val"])) ** 0.5
+    result = {
+        "candidate": index,
+        "params": params,
+        "n_estimators": n_estimators,
+        "val_rmse": float(rmse),
+        "fit_s": fit_s,
+        "wall_s": time.perf_counter() - started,
+    }
+    if keep_model:
+        result["model"] = model
+    return result
+
+
+def run_search(X_train, y_train, X_val, y_val, candidates: list, min_trees: int = 10,
+               max_trees: int = 100, factor: int = 3, workers: int = None,
+               random_state: int = 42):
+    """
+    Run successive halving over the candidates.
+
+    Args:
+        X_train, y_train: Training features and target
+        X_val, y_val: Validation features and target
+        candidates: List of RandomForestRegressor parameter dicts
+        min_trees: Fewest trees per forest in the first rung
+        max_trees: Trees per forest in the last rung
+        factor: Tree multiplier between rungs; the best 1/factor of each
+            rung is promoted
+        workers: Worker processes (default: number of CPUs)
+        random_state: Random state for every fit
+
+    Returns:
+        Tuple of (best parameters, the best candidate's forest fitted with
+        max_trees trees, list of per-fit result dicts with a rung index,
+        search wall-clock seconds)
+    """
+    if not candidates:
+        raise ValueError("No candidates to search")
+    workers = workers or os.cpu_count() or 1
+    schedule = halving_schedule(len(candidates), min_trees, max_trees, factor)
+    print(f"[search] {len(candidates)} candidate(s), {workers} worker(s), rungs: "
+          + ", ".join(f"{n} x {trees} trees" for trees, n in schedule))
+
+    started = time.perf_counter()
+    results = []
+    survivors = list(range(len(candidates)))
+    last_rung = len(schedule) - 1
+    models = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        for name, array in (("X_train", X_train), ("y_train", y_train),
+                            ("X_val", X_val), ("y_val", y_val)):
+            np.save(Path(data_dir) / f"{name}.npy", np.ascontiguousarray(array))
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_load_data,
+                                 initargs=(data_dir,)) as pool:
+            for rung, (n_trees, n_keep) in enumerate(schedule):
+                survivors = survivors[:n_keep]
+                rung_started = time.perf_counter()
+                # Only the last rung's forests come back from the workers
+                tasks = [(i, candidates[i], n_trees, random_state, rung == last_rung)
+                         for i in survivors]
+                rung_results = list(pool.map(_fit_candidate, tasks))
+                for result in rung_results:
+                    result["rung"] = rung
+                    if "model" in result:
+                        models[result["candidate"]] = result.pop("model")
+                results.extend(rung_results)
+
+                rung_results.sort(key=lambda r: r["val_rmse"])
+                survivors = [r["candidate"] for r in rung_results]
+                print(f"[search] Rung {rung}: {len(tasks)} fit(s) x {n_trees} trees in "
+                      f"{time.perf_counter() - rung_started:.1f}s, best val RMSE "
+                      f"{rung_results[0]['val_rmse']:,.2f}")
+
+    best_model = models[survivors[0]]
+    # Fitted single-threaded in a worker; predict with every core as train.py does
+    best_model.set_params(n_jobs=-1)
+    return candidates[survivors[0]], best_model, results, time.perf_counter() - started
+
+
+def print_search_report(results: list, elapsed_s: float):
+    """Print every fit of a search, ordered by rung and validation RMSE."""
+    print()
+    print(f"[search] {len(results)} fit(s) in {elapsed_s:.1f}s wall-clock "
+          f"({sum(r['wall_s'] for r in results):.1f}s of worker time)")
+    print(f"  {'rung':>4}  {'trees':>5}  {'val RMSE':>12}  {'wall s':>7}  params")
+    for r in sorted(results, key=lambda r: (-r["rung"], r["val_rmse"])):
+        print(f"  {r['rung']:>4}  {r['n_estimators']:>5}  {r['val_rmse']:>12,.2f}  "
+              f"{r['wall_s']:>7.2f}  {json.dumps(r['params'])}")
+
+
+def save_search_results(path: Path, best: dict, results: list, elapsed_s: float):
+    """Write the search outcome as JSON (normally outputs/search_results.json)."""
+    with open(path, "w") as f:
+        json.dump({"best_params": best, "wall_s": elapsed_s, "fits": results}, f, indent=2)
@@ -0,0 +1,217 @@
+"""
+Shrink a flattened forest (see forest_export.py) for deployment.
+
+The flat bundle already drops everything the endpoint never reads
+(impurity, sample counts and the like, which make up most of model.pkl).
+Compaction then narrows what is left:
+
+- thresholds become float32, rounded down to the nearest float32 at or
+  below the float64 value. Features are float32 at scoring time, so
+  x <= threshold gives the same answer for every input and each row still
+  reaches the same leaf
+- values become float32 (a relative change of at most ~6e-8 per tree)
+- feature indices, child indices and roots use the narrowest integer type
+  that holds them
+
+Pruning is optional and lossy: choose_pruning() looks for the smallest
+forest (fewest nodes) whose RMSE on a holdout split stays within a budget
+of the full forest's, over two knobs: keeping only the first n trees (the trees
+are independent draws, so any prefix is an unbiased smaller forest) and
+cutting every tree at a depth (a node's value is the mean of its training
+samples, so an internal node is a valid coarser leaf). The holdout comes
+from split_holdout() and is kept apart from the validation split, so the
+validation RMSE reported for the pruned forest is not the one it was
+chosen on.
+"""
+
+import numpy as np
+
+# The node arrays of a flat forest, as saved in the forest/ bundle
+NODE_ARRAYS = ("feature", "threshold", "children", "value", "roots")
+
+
+def round_down_float32(values: np.ndarray) -> np.ndarray:
+    """
+    Convert to float32, rounding each value down to the nearest float32.
+
+    For any float32 x, x <= value holds exactly when x <= the result.
+
+    Args:
+        values: float64 array
+
+    Returns:
+        float32 array
+    """
+    rounded = values.astype(np.float32)
+    above = rounded > values
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def narrowest_int(max_value: int):
+    """Smallest signed integer dtype holding 0..max_value."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if max_value <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def compact_arrays(arrays: dict) -> dict:
+    """
+    Narrow the node arrays of a flat forest.
+
+    Args:
+        arrays: Output of forest_export.flatten_forest() (or of
+            prune_flat_forest())
+
+    Returns:
+        New dict with the same keys and compact node arrays
+    """
+    n_nodes = len(arrays["value"])
+    index_dtype = np.int32 if n_nodes <= np.iinfo(np.int32).max else np.int64
+    compact = dict(arrays)
+    compact.update({
+        "feature": arrays["feature"].astype(narrowest_int(arrays["n_features"] - 1)),
+        "threshold": round_down_float32(arrays["threshold"]),
+        "children": arrays["children"].astype(index_dtype),
+        "value": arrays["value"].astype(np.float32),
+        "roots": arrays["roots"].astype(index_dtype),
+    })
+    return compact
+
+
+def node_depths(arrays: dict) -> np.ndarray:
+    """
+    Depth of every node (roots are at depth 0).
+
+    Args:
+        arrays: Output of forest_export.flatten_forest()
+
+    Returns:
+        int64 array with one depth per node
+    """
+    n_nodes = len(arrays["value"])
+    children = arrays["children"].reshape(n_nodes, 2)
+    internal = np.flatnonzero(children[:, 0] != np.arange(n_nodes))
+    depth = np.zeros(n_nodes, dtype=np.int64)
+    # Each pass settles one more level below the roots
+    for _ in range(arrays["max_depth"]):
+        depth[children[internal, 0]] = depth[internal] + 1
+        depth[children[internal, 1]] = depth[internal] + 1
+    return depth
+
+
+def prune_flat_forest(arrays: dict, n_trees: int, depth: int) -> dict:
+    """
+    Keep the first n_trees trees, each cut at the given depth.
+
+    Nodes at the cut depth become leaves and everything below them is
+    dropped; the remaining nodes are renumbered.
+
+    Args:
+        arrays: Output of forest_export.flatten_forest()
+        n_trees: Trees to keep
+        depth: Depth to cut at (0 keeps only the roots)
+
+    Returns:
+        New flat forest arrays dict
+    """
+    n_nodes = len(arrays["value"])
+    depths = node_depths(arrays)
+    end = arrays["roots"][n_trees] if n_trees < len(arrays["roots"]) else n_nodes
+    keep = (np.arange(n_nodes) < end) & (depths <= depth)
+    new_index = np.cumsum(keep) - 1
+
+    kept = np.flatnonzero(keep)
+    feature = arrays["feature"][kept].copy()
+    threshold = arrays["threshold"][kept].copy()
+    children = new_index[arrays["children"].reshape(n_nodes, 2)[kept]]
+
+    cut = depths[kept] == depth
+    feature[cut] = 0
+    threshold[cut] = np.inf
+    children[cut] = np.arange(len(kept))[cut, None]
+
+    return {
+        "feature": feature,
+        "threshold": threshold,
+        "children": children.ravel(),
+        "value": arrays["value"][kept].copy(),
+        "roots": new_index[arrays["roots"][:n_trees]],
+        "max_depth": min(arrays["max_depth"], int(depth)),
+        "n_features": arrays["n_features"],
+    }
+
+
+def split_holdout(X, y, fraction: float, seed: int = 42):
+    """
+    Split a random fraction of the rows off as a holdout.
+
+    Args:
+        X: Feature matrix
+        y: Target values
+        fraction: Share of the rows to hold out (0 < fraction < 1)
+        seed: Seed for choosing the rows
+
+    Returns:
+        Tuple of (X_rest, y_rest, X_holdout, y_holdout), each in the
+        original row order
+    """
+    if not 0 < fraction < 1:
+        raise ValueError(f"Holdout fraction must be between 0 and 1, got {fraction}")
+    n_holdout = max(1, round(len(X) * fraction))
+    holdout = np.zeros(len(X), dtype=bool)
+    holdout[np.random.default_rng(seed).permutation(len(X))[:n_holdout]] = True
+    return X[~holdout], y[~holdout], X[holdout], y[holdout]
+
+
+def choose_pruning(arrays: dict, X_holdout, y_holdout, rmse_budget: float):
+    """
+    Find the smallest pruned forest within a holdout-RMSE budget.
+
+    Every (tree count, depth) pair is scored from one traversal per depth:
+    the per-tree predictions at that depth, averaged over growing prefixes
+    of the trees.
+
+    Args:
+        arrays: Output of forest_export.flatten_forest()
+        X_holdout: Holdout features (not the validation split)
+        y_holdout: Holdout target
+        rmse_budget: Allowed relative RMSE increase (e.g. 0.01 for 1%)
+
+    Returns:
+        Dict with n_trees, depth, n_nodes, holdout_rows, holdout_rmse and
+        full_holdout_rmse
+    """
+    X_holdout = np.asarray(X_holdout, dtype=np.float32)
+    y_holdout = np.asarray(y_holdout, dtype=np.float64)
+    n_trees = len(arrays["roots"])
+    n_nodes = len(arrays["value"])
+    depths = node_depths(arrays)
+    tree_of_node = np.searchsorted(arrays["roots"], np.arange(n_nodes), side="right") - 1
+    counts = np.arange(1, n_trees + 1)[:, None]
+
+    rows = np.arange(X_holdout.shape[0])
+    node = np.repeat(arrays["roots"][:, None], X_holdout.shape[0], axis=1)
+    candidates = []
+    for depth in range(arrays["max_depth"] + 1):
+        if depth:
+            go_left = X_holdout[rows, arrays["feature"][node]] <= arrays["threshold"][node]
+            node = arrays["children"][2 * node + go_left]
+        prefix_mean = np.cumsum(arrays["value"][node], axis=0) / counts
+        rmse = np.sqrt(np.mean((prefix_mean - y_holdout) ** 2, axis=1))
+        nodes = np.cumsum(np.bincount(tree_of_node[depths <= depth], minlength=n_trees))
+        candidates.extend(zip(nodes.tolist(), rmse.tolist(), range(1, n_trees + 1),
+                              [depth] * n_trees))
+
+    full_rmse = candidates[-1][1]
+    limit = full_rmse * (1 + rmse_budget)
+    size, rmse, trees, depth = min(c for c in candidates if c[1] <= limit)
+    return {
+        "n_trees": trees,
+        "depth": depth,
+        "n_nodes": size,
+        "holdout_rows": len(y_holdout),
+        "holdout_rmse": rmse,
+        "full_holdout_rmse": full_rmse,
+    }
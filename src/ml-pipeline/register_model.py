@@ -89,9 +89,12 @@ def main():
         print(f"[WARNING] Job is not in 'Completed' status.")
         print(f"[WARNING] Model registration may fail if outputs are not available.")
     
-    # Construct the path to the model artifact
+    # Construct the path to the model artifacts
     # Azure ML jobs save outputs to azureml://jobs/<job-name>/outputs/
-    model_path = f"azureml://jobs/{args.job_name}/outputs/artifacts/paths/outputs/model.pkl"
+    # Register the whole outputs folder so model.pkl ships together with
+    # feature_schema.json, encoder.json and the forest/ bundle (the scoring
+    # script reads them all)
+    model_path = f"azureml://jobs/{args.job_name}/outputs/artifacts/paths/outputs/"
     
     print(f"[model] Model artifact path: {model_path}")
     
@@ -55,6 +55,16 @@ def parse_args():
         default="../deploy/env-train.yml",
         help="Path to environment YAML file (default: ../deploy/env-train.yml)",
     )
+    parser.add_argument(
+        "--train-args",
+        default="",
+        help="Extra arguments for train.py, e.g. \"--search grid --n-estimators 200\"",
+    )
+    parser.add_argument(
+        "--warm-start-model",
+        help="Registered model <name>:<version> to grow new trees onto "
+             "(passed to train.py as --warm-start-from)",
+    )
     return parser.parse_args()
 
 
@@ -110,22 +120,37 @@ def main():
     print(f"  Training:   {train_data_name}")
     print(f"  Validation: {val_data_name}")
     
+    inputs = {
+        "train_data": Input(
+            type=AssetTypes.MLTABLE,
+            path=f"azureml:{train_data_name}:{data_version}",
+        ),
+        "val_data": Input(
+            type=AssetTypes.MLTABLE,
+            path=f"azureml:{val_data_name}:{data_version}",
+        ),
+    }
+    train_command = (
+        "python train.py --train-data ${{inputs.train_data}} "
+        "--val-data ${{inputs.val_data}} --target-column price"
+    )
+    if args.warm_start_model:
+        print(f"  Warm start: {args.warm_start_model}")
+        inputs["prior_model"] = Input(
+            type=AssetTypes.CUSTOM_MODEL,
+            path=f"azureml:{args.warm_start_model}",
+        )
+        train_command += " --warm-start-from ${{inputs.prior_model}}"
+    if args.train_args:
+        train_command += f" {args.train_args}"
+    
     # Create the command job
     print(f"[job] Creating command job ...")
     try:
         job = command(
             code=str(script_dir),
-            command="python train.py --train-data ${{inputs.train_data}} --val-data ${{inputs.val_data}} --target-column price",
-            inputs={
-                "train_data": Input(
-                    type=AssetTypes.MLTABLE,
-                    path=f"azureml:{train_data_name}:{data_version}",
-                ),
-                "val_data": Input(
-                    type=AssetTypes.MLTABLE,
-                    path=f"azureml:{val_data_name}:{data_version}",
-                ),
-            },
+            command=train_command,
+            inputs=inputs,
             environment=environment,
             compute=args.compute_cluster,
             experiment_name=args.experiment_name,
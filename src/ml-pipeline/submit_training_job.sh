@@ -6,11 +6,13 @@
 # submit_training_job.py with the appropriate Azure configuration.
 #
 # Usage:
-#   ./submit_training_job.sh [--experiment-name <name>] [--base-data-name <name>]
+#   ./submit_training_job.sh [--experiment-name <name>] [--base-data-name <name>] [--train-args "<args>"]
 #
 # Example:
 #   ./submit_training_job.sh
 #   ./submit_training_job.sh --experiment-name my-experiment
+#   ./submit_training_job.sh --train-args "--search grid"
+#   ./submit_training_job.sh --warm-start-model house-price-regressor:3 --train-args "--max-trees 150"
 
 set -euo pipefail
 
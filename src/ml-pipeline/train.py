@@ -4,17 +4,99 @@ Train a scikit-learn regression model for house price prediction.
 
 This script trains a simple regression model on MLTable-based data and saves
 the trained model to ./outputs for Azure ML job capture.
+
+By default the data is streamed in batches into a compact float32 feature
+matrix (see chunked_loader.py), so splits larger than memory as a
+DataFrame can still be trained on; --loader pandas loads each split as a
+DataFrame instead.
+
+With --search grid or --search random, the forest's hyperparameters are
+tuned first by successive halving on a process pool (see
+hyperparameter_search.py). The best configuration's forest from the
+search's last rung, already fitted with --n-estimators trees, is the
+final model.
+
+With --warm-start-from, the prior model and its encoder are loaded and
+--new-trees trees are grown on the new data instead (see warm_start.py),
+optionally retiring trees beyond --max-trees. --retire worst picks the
+trees to retire on a holdout taken from the training rows
+(--holdout-fraction), so the reported validation RMSE stays comparable
+with a cold-start run.
+
+--model-type hist_gradient_boosting trains a HistGradientBoostingRegressor
+instead of the random forest. Its categorical inputs are encoded as one
+ordinal code column per field and split on natively, so neighborhood_code
+and exterior_type are not expanded into one-hot columns. It is served
+from model.pkl (there is no flat forest bundle), and search and warm start
+stay random-forest only. compare_models.py trains both side by side.
+
+Each stage of the run is timed (wall-clock, CPU, resident memory) and the
+breakdown is written to ./outputs/training_profile.json and logged as
+MLflow metrics (see training_profile.py); --profile adds a cProfile dump.
+
+For a smaller artifact to register and deploy, --compact stores the flat
+forest with float32 thresholds/values and narrow indices, --compress
+writes model.pkl and the forest bundle compressed, and
+--prune-rmse-budget prunes the flat forest to the smallest one within
+that relative RMSE budget on a holdout split taken from the training rows
+(--holdout-fraction; see model_compaction.py). The served
+artifact's validation RMSE is reported next to the full forest's;
+compaction_report.py measures the effect on an existing model.
 """
 
 import argparse
+import json
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import joblib
 import mltable
 
+from chunked_loader import (
+    DEFAULT_BATCH_ROWS,
+    DataSource,
+    load_matrix,
+    peak_memory_mb,
+    scan_schema,
+)
+from feature_pipeline import FeatureEncoder
+from forest_export import export_flat_forest, load_flat_forest, predict_flat
+from model_compaction import split_holdout
+from training_profile import TrainingProfiler
+from hyperparameter_search import (
+    grid_candidates,
+    load_search_space,
+    print_search_report,
+    random_candidates,
+    run_search,
+    save_search_results,
+)
+from warm_start import (
+    RETIREMENT_POLICIES,
+    grow_forest,
+    load_prior_model,
+    merge_numeric_ranges,
+    retire_trees,
+    warn_unseen_levels,
+)
+
+# Forest hyperparameters used when no search is run
+DEFAULT_MODEL_PARAMS = {"max_depth": 10}
+
+# Gradient boosting hyperparameters (--n-estimators sets the iterations);
+# no early stopping, so every run fits the same number of trees
+DEFAULT_BOOSTING_PARAMS = {"learning_rate": 0.1, "max_leaf_nodes": 31, "early_stopping": False}
+
+# Model type -> how its categorical inputs are encoded
+MODEL_TYPES = {"random_forest": "onehot", "hist_gradient_boosting": "ordinal"}
+
+# joblib compression for model.pkl with --compress: zlib decompresses
+# several times faster than lzma for a slightly larger file
+PICKLE_COMPRESSION = ("zlib", 3)
+
 
 def parse_args():
     """Parse command-line arguments."""
@@ -36,6 +118,122 @@ def parse_args():
         default="price",
         help="Name of the target column (default: price)",
     )
+    parser.add_argument(
+        "--loader",
+        choices=["chunked", "pandas"],
+        default="chunked",
+        help="Stream batches into a float32 matrix (chunked) or load whole "
+             "DataFrames (pandas) (default: chunked)",
+    )
+    parser.add_argument(
+        "--batch-rows",
+        type=int,
+        default=DEFAULT_BATCH_ROWS,
+        help=f"Rows per batch for the chunked loader (default: {DEFAULT_BATCH_ROWS})",
+    )
+    parser.add_argument(
+        "--model-type",
+        choices=list(MODEL_TYPES),
+        default="random_forest",
+        help="Random forest on one-hot features, or histogram gradient boosting "
+             "with native categorical splits (default: random_forest)",
+    )
+    parser.add_argument(
+        "--n-estimators",
+        type=int,
+        default=100,
+        help="Trees in the final forest (and in the last search rung), or boosting "
+             "iterations for hist_gradient_boosting (default: 100)",
+    )
+    parser.add_argument(
+        "--search",
+        choices=["none", "grid", "random"],
+        default="none",
+        help="Tune hyperparameters by successive halving before the final fit "
+             "(default: none)",
+    )
+    parser.add_argument(
+        "--search-space",
+        help="JSON file of parameter -> list of values (default: built-in space)",
+    )
+    parser.add_argument(
+        "--search-candidates",
+        type=int,
+        default=20,
+        help="Candidates sampled by --search random (default: 20)",
+    )
+    parser.add_argument(
+        "--min-trees",
+        type=int,
+        default=10,
+        help="Fewest trees per forest in the first search rung (default: 10)",
+    )
+    parser.add_argument(
+        "--halving-factor",
+        type=int,
+        default=3,
+        help="Keep the best 1/factor of each rung and multiply its trees by "
+             "factor (default: 3)",
+    )
+    parser.add_argument(
+        "--search-workers",
+        type=int,
+        help="Worker processes for the search (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--warm-start-from",
+        help="Prior model directory (model.pkl, encoder.json, feature_schema.json) "
+             "to grow new trees onto instead of training from scratch",
+    )
+    parser.add_argument(
+        "--new-trees",
+        type=int,
+        default=20,
+        help="Trees to grow on the new data with --warm-start-from (default: 20)",
+    )
+    parser.add_argument(
+        "--max-trees",
+        type=int,
+        help="Retire trees beyond this many after a warm start (default: keep all)",
+    )
+    parser.add_argument(
+        "--retire",
+        choices=RETIREMENT_POLICIES,
+        default="oldest",
+        help="Which trees to retire beyond --max-trees: the oldest, or the "
+             "worst on a holdout of the training rows, never the validation "
+             "split (see --holdout-fraction; default: oldest)",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Store the flat forest with float32 thresholds/values and narrow indices",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Write model.pkl and the flat forest compressed",
+    )
+    parser.add_argument(
+        "--prune-rmse-budget",
+        type=float,
+        help="Prune the flat forest (fewer trees, shallower cut) to the smallest "
+             "one whose holdout RMSE is within this fraction of the full "
+             "forest's, e.g. 0.01 (model.pkl keeps every tree)",
+    )
+    parser.add_argument(
+        "--holdout-fraction",
+        type=float,
+        default=0.1,
+        help="Share of the training rows held out (not trained on) to choose "
+             "the pruning with --prune-rmse-budget and the trees to retire "
+             "with --retire worst (default: 0.1)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the run with cProfile (outputs/profile.prof and profile.txt)",
+    )
     return parser.parse_args()
 
 
@@ -43,6 +241,10 @@ def load_mltable_data(path: str) -> pd.DataFrame:
     """
     Load data from an MLTable path.
     
+    The MLTable may read CSV or Parquet files. Dictionary-encoded Parquet
+    columns arrive as pandas categoricals; they are converted to plain
+    strings so the features, one-hot columns and schema match the CSV path.
+    
     Args:
         path: Path or URI to the MLTable directory
         
@@ -52,64 +254,223 @@ def load_mltable_data(path: str) -> pd.DataFrame:
     print(f"[train] Loading data from {path} ...")
     tbl = mltable.load(path)
     df = tbl.to_pandas_dataframe()
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(str)
     print(f"[train] Loaded {len(df)} rows, {len(df.columns)} columns")
     return df
 
 
-def prepare_features(df: pd.DataFrame, target_column: str):
+def prepare_features(df: pd.DataFrame, target_column: str, encoder: FeatureEncoder):
     """
     Split DataFrame into features (X) and target (y).
     
     Args:
         df: Input DataFrame
         target_column: Name of the target column
+        encoder: FeatureEncoder fitted on the training split
         
     Returns:
-        Tuple of (X, y) where X is features and y is target
+        Tuple of (X, y) where X is the float32 feature matrix and y is target
     """
     if target_column not in df.columns:
         raise ValueError(f"Target column '{target_column}' not found in data")
     
-    y = df[target_column]
-    X = df.drop(columns=[target_column])
-    
-    # Drop non-numeric columns or ID columns if present
-    if 'id' in X.columns:
-        X = X.drop(columns=['id'])
-    
-    # Convert categorical columns to dummy variables
-    X = pd.get_dummies(X, drop_first=True)
+    y = df[target_column].to_numpy(dtype="float64")
+    X = encoder.transform(df)
     
-    print(f"[train] Features: {list(X.columns)}")
     print(f"[train] Feature matrix shape: {X.shape}")
     
     return X, y
 
 
-def train_model(X_train: pd.DataFrame, y_train: pd.Series):
+def build_feature_schema(df: pd.DataFrame, encoder: FeatureEncoder, target_column: str) -> dict:
+    """
+    Describe the feature layout the model is trained on.
+    
+    The scoring script loads this schema instead of hard-coding column names,
+    so a retrain that changes the one-hot columns can't silently break it.
+    
+    Args:
+        df: Raw training DataFrame (before encoding)
+        encoder: FeatureEncoder fitted on df
+        target_column: Name of the target column
+        
+    Returns:
+        JSON-serializable dict with column order, vocabularies, numeric
+        ranges and dtypes
+    """
+    raw = df.drop(columns=[c for c in (target_column, "id") if c in df.columns])
+    
+    return {
+        "schema_version": 1,
+        "target_column": target_column,
+        "feature_columns": encoder.feature_columns,
+        "numeric_features": encoder.numeric_features,
+        "categorical_features": encoder.categorical_levels,
+        # Training min/max per numeric field; the endpoint validates against these
+        "numeric_ranges": {
+            c: [float(raw[c].min()), float(raw[c].max())] for c in encoder.numeric_features
+        },
+        "dtypes": {c: str(raw[c].dtype) for c in raw.columns},
+    }
+
+
+def load_features_chunked(train_path: str, val_path: str, target_column: str,
+                          batch_rows: int = DEFAULT_BATCH_ROWS, encoder: FeatureEncoder = None,
+                          categorical_encoding: str = "onehot"):
+    """
+    Stream both splits into float32 feature matrices.
+    
+    The training split is read twice (schema scan, then encoding) and the
+    validation split is encoded with the training layout, so only one batch
+    is held as a DataFrame at a time.
+    
+    Args:
+        train_path: Path or URI to the training MLTable
+        val_path: Path or URI to the validation MLTable
+        target_column: Name of the target column
+        batch_rows: Rows per batch
+        encoder: Already fitted FeatureEncoder to reuse (warm start); by
+            default one is fitted on the scanned training split
+        categorical_encoding: Encoding of a newly fitted encoder ("onehot"
+            or "ordinal")
+        
+    Returns:
+        Tuple of (X_train, y_train, X_val, y_val, encoder, feature_schema)
+    """
+    train_source = DataSource(train_path, batch_rows)
+    val_source = DataSource(val_path, batch_rows)
+    for source in (train_source, val_source):
+        if source.streaming:
+            print(f"[train] Streaming {len(source.files)} {source.format} file(s) from {source.path}")
+        else:
+            print(f"[train] Loading {source.path} through mltable (not streamable)")
+    
+    print(f"[train] Scanning {train_path} in batches of {batch_rows:,} rows ...")
+    scanned = scan_schema(train_source, target_column)
+    if encoder is None:
+        encoder = FeatureEncoder(scanned["numeric_features"], scanned["categorical_features"],
+                                 categorical_encoding)
+    else:
+        warn_unseen_levels(encoder, scanned["categorical_features"])
+    feature_schema = {
+        "schema_version": 1,
+        "target_column": target_column,
+        "feature_columns": encoder.feature_columns,
+        "numeric_features": encoder.numeric_features,
+        "categorical_features": encoder.categorical_levels,
+        "numeric_ranges": scanned["numeric_ranges"],
+        "dtypes": scanned["dtypes"],
+    }
+    print(f"[train] Features: {encoder.feature_columns}")
+    
+    X_train, y_train = load_matrix(train_source, encoder, target_column, n_rows=scanned["n_rows"])
+    X_val, y_val = load_matrix(val_source, encoder, target_column)
+    
+    print(f"[train] Feature matrix shape: {X_train.shape} "
+          f"({X_train.nbytes / 1e6:,.1f} MB float32); validation: {X_val.shape}")
+    print(f"[train] Peak memory after loading: {peak_memory_mb():,.1f} MB")
+    return X_train, y_train, X_val, y_val, encoder, feature_schema
+
+
+def train_model(X_train: np.ndarray, y_train: np.ndarray, n_estimators: int = 100,
+                params: dict = None):
     """
     Train a RandomForestRegressor model.
     
     Args:
         X_train: Training features
         y_train: Training target
+        n_estimators: Number of trees
+        params: Other RandomForestRegressor parameters (default:
+            DEFAULT_MODEL_PARAMS)
         
     Returns:
         Trained model
     """
-    print("[train] Training RandomForestRegressor ...")
+    params = DEFAULT_MODEL_PARAMS if params is None else params
+    print(f"[train] Training RandomForestRegressor ({n_estimators} trees, {params}) ...")
     model = RandomForestRegressor(
-        n_estimators=100,
-        max_depth=10,
+        n_estimators=n_estimators,
         random_state=42,
         n_jobs=-1,
+        **params,
     )
     model.fit(X_train, y_train)
     print("[train] Training complete")
     return model
 
 
-def evaluate_model(model, X: pd.DataFrame, y: pd.Series, dataset_name: str):
+def train_boosting_model(X_train: np.ndarray, y_train: np.ndarray, categorical_columns: list,
+                         max_iter: int = 100, params: dict = None):
+    """
+    Train a HistGradientBoostingRegressor model.
+    
+    Args:
+        X_train: Training features (categoricals as ordinal codes)
+        y_train: Training target
+        categorical_columns: Positions of the ordinal category columns,
+            split on natively
+        max_iter: Number of boosting iterations
+        params: Other HistGradientBoostingRegressor parameters (default:
+            DEFAULT_BOOSTING_PARAMS)
+        
+    Returns:
+        Trained model
+    """
+    params = DEFAULT_BOOSTING_PARAMS if params is None else params
+    print(f"[train] Training HistGradientBoostingRegressor ({max_iter} iterations, "
+          f"categorical columns {categorical_columns}, {params}) ...")
+    model = HistGradientBoostingRegressor(
+        max_iter=max_iter,
+        categorical_features=categorical_columns or None,
+        random_state=42,
+        **params,
+    )
+    model.fit(X_train, y_train)
+    print("[train] Training complete")
+    return model
+
+
+def search_hyperparameters(args, X_train, y_train, X_val, y_val, output_dir: Path):
+    """
+    Tune the forest's hyperparameters with successive halving.
+    
+    Args:
+        args: Parsed command-line arguments
+        X_train, y_train: Training features and target
+        X_val, y_val: Validation features and target
+        output_dir: Directory to write search_results.json into
+        
+    Returns:
+        Tuple of (best parameter dict found, that configuration's forest
+        fitted with --n-estimators trees in the search's last rung)
+    """
+    space = load_search_space(args.search_space)
+    if args.search == "grid":
+        candidates = grid_candidates(space)
+    else:
+        candidates = random_candidates(space, args.search_candidates)
+    
+    best, best_model, results, elapsed_s = run_search(
+        X_train, y_train, X_val, y_val, candidates,
+        min_trees=args.min_trees,
+        max_trees=args.n_estimators,
+        factor=args.halving_factor,
+        workers=args.search_workers,
+    )
+    print_search_report(results, elapsed_s)
+    
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results_path = output_dir / "search_results.json"
+    save_search_results(results_path, best, results, elapsed_s)
+    print(f"[search] Best parameters: {best}")
+    print(f"[search] Results saved to {results_path}")
+    return best, best_model
+
+
+def evaluate_model(model, X: np.ndarray, y: np.ndarray, dataset_name: str):
     """
     Evaluate model and print metrics.
     
@@ -119,7 +480,18 @@ def evaluate_model(model, X: pd.DataFrame, y: pd.Series, dataset_name: str):
         y: Target values
         dataset_name: Name of the dataset (e.g., "train", "validation")
     """
-    predictions = model.predict(X)
+    return report_metrics(y, model.predict(X), dataset_name)
+
+
+def report_metrics(y: np.ndarray, predictions: np.ndarray, dataset_name: str):
+    """
+    Print and return RMSE, MAE and R² of a set of predictions.
+    
+    Args:
+        y: Target values
+        predictions: Predicted values
+        dataset_name: Name of the dataset (e.g., "train", "validation")
+    """
     rmse = mean_squared_error(y, predictions) ** 0.5
     mae = mean_absolute_error(y, predictions)
     r2 = r2_score(y, predictions)
@@ -132,60 +504,191 @@ def evaluate_model(model, X: pd.DataFrame, y: pd.Series, dataset_name: str):
     return {"rmse": rmse, "mae": mae, "r2": r2}
 
 
-def save_model(model, output_dir: Path):
+def save_model(model, output_dir: Path, feature_schema: dict = None,
+               encoder: FeatureEncoder = None, compress: bool = False):
     """
-    Save the trained model to the outputs directory.
+    Save the trained model (with its feature schema and encoder) to the outputs directory.
     
     Args:
         model: Trained model
         output_dir: Directory to save the model
+        feature_schema: Optional schema from build_feature_schema(), written
+            next to the model as feature_schema.json
+        encoder: Optional fitted FeatureEncoder, written next to the model
+            as encoder.json (the scoring script encodes requests with it)
+        compress: Compress model.pkl with PICKLE_COMPRESSION
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     model_path = output_dir / "model.pkl"
     
     print(f"[train] Saving model to {model_path} ...")
-    joblib.dump(model, model_path)
-    print(f"[train] Model saved successfully")
+    joblib.dump(model, model_path, compress=PICKLE_COMPRESSION if compress else 0)
+    print(f"[train] Model saved successfully ({model_path.stat().st_size / 1e6:,.2f} MB)")
+    
+    if feature_schema is not None:
+        schema_path = output_dir / "feature_schema.json"
+        with open(schema_path, "w") as f:
+            json.dump(feature_schema, f, indent=2)
+        print(f"[train] Feature schema saved to {schema_path}")
+    
+    if encoder is not None:
+        encoder_path = output_dir / "encoder.json"
+        encoder.save(encoder_path)
+        print(f"[train] Feature encoder saved to {encoder_path}")
 
 
 def main():
     """Main entry point."""
     args = parse_args()
+    profiler = TrainingProfiler(profile=args.profile)
     
     print("=" * 60)
     print("House Price Model Training")
     print("=" * 60)
     print()
     
-    # Load data
-    train_df = load_mltable_data(args.train_data)
-    val_df = load_mltable_data(args.val_data)
+    categorical_encoding = MODEL_TYPES[args.model_type]
+    if args.model_type != "random_forest" and (
+        args.search != "none" or args.warm_start_from or args.compact
+        or args.prune_rmse_budget is not None
+    ):
+        raise SystemExit("[ERROR] --search, --warm-start-from, --compact and "
+                         "--prune-rmse-budget need --model-type random_forest")
+    
+    prior_model = prior_encoder = prior_schema = None
+    if args.warm_start_from:
+        if args.search != "none":
+            raise SystemExit("[ERROR] --search can't be combined with --warm-start-from")
+        with profiler.stage("load_prior_model"):
+            prior_model, prior_encoder, prior_schema = load_prior_model(args.warm_start_from)
     
-    # Prepare features
-    X_train, y_train = prepare_features(train_df, args.target_column)
-    X_val, y_val = prepare_features(val_df, args.target_column)
+    if args.loader == "chunked":
+        # Loading and encoding happen together, batch by batch
+        with profiler.stage("load_features"):
+            X_train, y_train, X_val, y_val, encoder, feature_schema = load_features_chunked(
+                args.train_data, args.val_data, args.target_column, args.batch_rows,
+                encoder=prior_encoder, categorical_encoding=categorical_encoding,
+            )
+    else:
+        # Load data
+        with profiler.stage("load_data"):
+            train_df = load_mltable_data(args.train_data)
+            val_df = load_mltable_data(args.val_data)
+        
+        # Fit the encoder on the training split (or reuse the prior one),
+        # then apply it to both
+        with profiler.stage("prepare_features"):
+            encoder = FeatureEncoder.fit(train_df, args.target_column, categorical_encoding)
+            if prior_encoder is not None:
+                warn_unseen_levels(prior_encoder, encoder.categorical_levels)
+                encoder = prior_encoder
+            print(f"[train] Features: {encoder.feature_columns}")
+            X_train, y_train = prepare_features(train_df, args.target_column, encoder)
+            X_val, y_val = prepare_features(val_df, args.target_column, encoder)
+            
+            feature_schema = build_feature_schema(train_df, encoder, args.target_column)
+        print(f"[train] Peak memory after loading: {peak_memory_mb():,.1f} MB")
+    
+    if prior_schema is not None:
+        feature_schema["numeric_ranges"] = merge_numeric_ranges(
+            prior_schema.get("numeric_ranges", {}), feature_schema["numeric_ranges"]
+        )
     
-    # Ensure validation data has the same columns as training data
-    # (in case of categorical encoding differences)
-    missing_cols = set(X_train.columns) - set(X_val.columns)
-    for col in missing_cols:
-        X_val[col] = 0
-    X_val = X_val[X_train.columns]
+    # Rows held out from training to choose the pruning and the trees to
+    # retire on, so the validation RMSE is measured on rows no choice saw
+    X_holdout = y_holdout = None
+    holdout_uses = []
+    if prior_model is not None and args.max_trees and args.retire == "worst":
+        holdout_uses.append("trees to retire")
+    if args.prune_rmse_budget is not None:
+        holdout_uses.append("pruning")
+    if holdout_uses:
+        X_train, y_train, X_holdout, y_holdout = split_holdout(
+            X_train, y_train, args.holdout_fraction
+        )
+        print(f"[train] Holding out {len(X_holdout):,} training rows to choose the "
+              f"{' and the '.join(holdout_uses)}")
     
-    # Train model
+    profiler.context.update({
+        "model_type": args.model_type,
+        "compact": args.compact,
+        "compress": args.compress,
+        "prune_rmse_budget": args.prune_rmse_budget,
+        "holdout_rows": len(X_holdout) if X_holdout is not None else 0,
+        "loader": args.loader,
+        "train_rows": len(X_train),
+        "val_rows": len(X_val),
+        "n_features": encoder.n_features,
+        "n_estimators": args.new_trees if prior_model is not None else args.n_estimators,
+        "search": args.search,
+        "warm_start": bool(args.warm_start_from),
+    })
+    
+    output_dir = Path("./outputs")
+    
+    # Tune hyperparameters; the search's last rung fits the final model
+    searched_model = None
+    if args.search != "none":
+        print()
+        with profiler.stage("search"):
+            _, searched_model = search_hyperparameters(args, X_train, y_train, X_val, y_val,
+                                                       output_dir)
+    
+    # Train model (or grow the prior one)
     print()
-    model = train_model(X_train, y_train)
+    with profiler.stage("train"):
+        if searched_model is not None:
+            print("[train] Using the best forest fitted in the search's last rung")
+            model = searched_model
+        elif prior_model is not None:
+            model = grow_forest(prior_model, X_train, y_train, args.new_trees)
+            if args.max_trees:
+                retire_trees(model, args.max_trees, args.retire, X_holdout, y_holdout)
+        elif args.model_type == "hist_gradient_boosting":
+            model = train_boosting_model(X_train, y_train, encoder.categorical_columns,
+                                         args.n_estimators)
+        else:
+            model = train_model(X_train, y_train, args.n_estimators)
     
     # Evaluate
     print()
-    train_metrics = evaluate_model(model, X_train, y_train, "Training")
-    print()
-    val_metrics = evaluate_model(model, X_val, y_val, "Validation")
+    with profiler.stage("evaluate"):
+        train_metrics = evaluate_model(model, X_train, y_train, "Training")
+        print()
+        val_metrics = evaluate_model(model, X_val, y_val, "Validation")
+    for prefix, metrics in (("train", train_metrics), ("val", val_metrics)):
+        profiler.metrics.update({f"{prefix}_{name}": float(value) for name, value in metrics.items()})
     
     # Save model
     print()
-    output_dir = Path("./outputs")
-    save_model(model, output_dir)
+    bundle_dir = None
+    with profiler.stage("save_model"):
+        save_model(model, output_dir, feature_schema, encoder, compress=args.compress)
+        if args.model_type == "random_forest":
+            bundle_dir = export_flat_forest(model, output_dir, X_check=X_val,
+                                            feature_columns=encoder.feature_columns,
+                                            compact=args.compact, compress=args.compress,
+                                            prune_rmse_budget=args.prune_rmse_budget,
+                                            X_prune=X_holdout, y_prune=y_holdout)
+    
+    # Evaluate what the endpoint serves: the forest/ bundle as written,
+    # after any compaction and pruning
+    served_metrics = None
+    if bundle_dir is not None:
+        print()
+        with profiler.stage("evaluate_served"):
+            served = load_flat_forest(bundle_dir)
+            served_metrics = report_metrics(y_val, predict_flat(served, X_val),
+                                            "Served forest/ Validation")
+        profiler.metrics.update({f"served_val_{name}": float(value)
+                                 for name, value in served_metrics.items()})
+        profiler.context["served_n_trees"] = len(served["roots"])
+        profiler.context["served_n_nodes"] = len(served["value"])
+    
+    print()
+    profiler.print_summary()
+    profiler.save(output_dir)
+    profiler.log_mlflow()
     
     print()
     print("=" * 60)
@@ -193,6 +696,9 @@ def main():
     print("=" * 60)
     print(f"Model saved to: {output_dir / 'model.pkl'}")
     print(f"Validation RMSE: {val_metrics['rmse']:,.2f}")
+    if served_metrics is not None:
+        print(f"Served forest/ validation RMSE: {served_metrics['rmse']:,.2f}")
+    print(f"Peak memory: {peak_memory_mb():,.1f} MB")
     print("=" * 60)
 
 
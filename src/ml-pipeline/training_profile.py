@@ -0,0 +1,180 @@
+"""
+Stage timers and a resource report for a training run.
+
+train.py wraps each stage of a run (loading, feature preparation, search,
+training, evaluation, saving) in TrainingProfiler.stage(), which records
+its wall-clock and CPU time, the resident memory before and after, and
+the process's peak resident memory once it finishes (the peak only ever
+grows, so a stage that raised it set the new peak).
+
+At the end of the run the report is written to training_profile.json next
+to model.pkl and, when an MLflow tracking URI is configured (as it is
+inside an Azure ML job), logged as MLflow metrics so runs can be compared
+in the studio. With profile=True the whole run is also profiled with
+cProfile, dumped to profile.prof (for snakeviz or pstats) with the top
+functions by cumulative time in profile.txt.
+"""
+
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from chunked_loader import peak_memory_mb
+
+# Functions listed in profile.txt
+PROFILE_TOP_N = 40
+
+
+def current_memory_mb():
+    """Current resident memory of this process in MB (None where unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class TrainingProfiler:
+    """Collect per-stage timings and memory for one training run."""
+
+    def __init__(self, profile: bool = False):
+        """
+        Start timing the run.
+
+        Args:
+            profile: Also profile the whole run with cProfile
+        """
+        self.stages = []
+        self.context = {}
+        self.metrics = {}
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self.profiler = None
+        if profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a stage of the run.
+
+        Args:
+            name: Stage name (e.g. "load_data", "train")
+        """
+        rss_before = current_memory_mb()
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield
+        finally:
+            wall_s = time.perf_counter() - wall_started
+            cpu_s = time.process_time() - cpu_started
+            rss_after = current_memory_mb()
+            self.stages.append({
+                "stage": name,
+                "wall_s": wall_s,
+                "cpu_s": cpu_s,
+                "rss_before_mb": rss_before,
+                "rss_after_mb": rss_after,
+                # ru_maxrss can lag the current RSS by a page or two
+                "peak_rss_mb": max(peak_memory_mb(), rss_after or 0.0),
+            })
+
+    def report(self) -> dict:
+        """The run's report as a JSON-serializable dict."""
+        import numpy
+        import sklearn
+
+        return {
+            "total_wall_s": time.perf_counter() - self.started,
+            "total_cpu_s": time.process_time() - self.cpu_started,
+            "peak_rss_mb": peak_memory_mb(),
+            "stages": self.stages,
+            "metrics": self.metrics,
+            "context": {
+                **self.context,
+                "cpu_count": os.cpu_count(),
+                "python": platform.python_version(),
+                "numpy": numpy.__version__,
+                "scikit_learn": sklearn.__version__,
+            },
+        }
+
+    def print_summary(self):
+        """Print the per-stage breakdown."""
+        report = self.report()
+        total = report["total_wall_s"] or 1.0
+        print(f"[train] Stage breakdown ({report['total_wall_s']:.1f}s wall, "
+              f"peak RSS {report['peak_rss_mb']:,.1f} MB):")
+        print(f"  {'stage':<18} {'wall s':>8} {'share':>6} {'cpu s':>8} {'peak MB':>9}")
+        for stage in self.stages:
+            print(f"  {stage['stage']:<18} {stage['wall_s']:>8.2f} "
+                  f"{stage['wall_s'] / total:>6.0%} {stage['cpu_s']:>8.2f} "
+                  f"{stage['peak_rss_mb']:>9,.1f}")
+
+    def save(self, output_dir: Path) -> Path:
+        """
+        Write training_profile.json (and the cProfile dump, if profiling).
+
+        Args:
+            output_dir: Directory to write into (normally ./outputs)
+
+        Returns:
+            Path of the JSON report
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(output_dir / "profile.prof")
+            text = io.StringIO()
+            pstats.Stats(self.profiler, stream=text).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+            (output_dir / "profile.txt").write_text(text.getvalue())
+            print(f"[train] cProfile output saved to {output_dir / 'profile.prof'} "
+                  f"(top {PROFILE_TOP_N} in profile.txt)")
+
+        report_path = output_dir / "training_profile.json"
+        with open(report_path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"[train] Training profile saved to {report_path}")
+        return report_path
+
+    def log_mlflow(self):
+        """
+        Log the stage timings, peak memory and model metrics to MLflow.
+
+        Skipped when mlflow isn't installed or no tracking URI is set, so
+        local runs don't create an mlruns/ directory.
+        """
+        if not os.getenv("MLFLOW_TRACKING_URI"):
+            return
+        try:
+            import mlflow
+        except ImportError:
+            print("[train] mlflow not installed; skipping MLflow metrics")
+            return
+
+        report = self.report()
+        metrics = {
+            "total_wall_s": report["total_wall_s"],
+            "total_cpu_s": report["total_cpu_s"],
+            "peak_rss_mb": report["peak_rss_mb"],
+        }
+        for stage in self.stages:
+            metrics[f"{stage['stage']}_wall_s"] = stage["wall_s"]
+            metrics[f"{stage['stage']}_peak_rss_mb"] = stage["peak_rss_mb"]
+        metrics.update(self.metrics)
+        try:
+            mlflow.log_metrics(metrics)
+        except Exception as e:
+            # Metrics are a convenience; never fail a finished training run
+            print(f"[WARNING] Could not log MLflow metrics: {e}")
+            return
+        print(f"[train] Logged {len(metrics)} MLflow metric(s)")
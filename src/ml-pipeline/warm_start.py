@@ -0,0 +1,221 @@
+"""
+Warm-start retraining from a previously trained model.
+
+Instead of refitting the whole forest, a retrain can load the prior
+model.pkl and grow a few new trees on recent data with scikit-learn's
+warm_start: the existing trees are kept as they are and only the new ones
+are fitted. The prior fitted encoder is reused, so the feature layout
+(and therefore every existing tree) stays valid.
+
+Trees are kept oldest first. To stop the forest growing without bound, a
+retirement policy trims it back to a maximum size after each retrain:
+
+- oldest: drop the oldest trees (a sliding window over recent data)
+- worst: drop the trees with the highest error on a holdout split (train.py
+  carves it from the training rows, so the validation split it reports on
+  plays no part in the choice)
+
+scikit-learn seeds the trees a warm start adds by their position in
+estimators_, so after a retirement new trees would reuse the seeds of
+trees still in the forest. grow_forest() instead counts every tree ever
+grown (saved on the model as trees_grown_) and seeds new trees from
+there, as if no tree had been retired.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from feature_pipeline import FeatureEncoder
+
+RETIREMENT_POLICIES = ["oldest", "worst"]
+
+# Upper bound of the per-tree seeds scikit-learn draws (its forest MAX_INT)
+TREE_SEED_MAX = np.iinfo(np.int32).max
+
+
+def find_prior_artifact(model_dir: str, filename: str):
+    """
+    Locate an artifact of a prior model.
+
+    A registered model directory holds the artifacts either directly or one
+    level down (e.g. <model_dir>/outputs/model.pkl), as in score.py.
+
+    Args:
+        model_dir: Prior model directory
+        filename: Artifact name to look for
+
+    Returns:
+        Path to the artifact, or None if it is not present
+    """
+    candidate = Path(model_dir) / filename
+    if candidate.exists():
+        return candidate
+    for entry in sorted(os.listdir(model_dir)):
+        candidate = Path(model_dir) / entry / filename
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def load_prior_model(model_dir: str):
+    """
+    Load the model, fitted encoder and feature schema of a prior run.
+
+    Args:
+        model_dir: Directory holding the prior model.pkl, encoder.json and
+            feature_schema.json
+
+    Returns:
+        Tuple of (model, encoder, feature schema)
+    """
+    paths = {name: find_prior_artifact(model_dir, name)
+             for name in ("model.pkl", "encoder.json", "feature_schema.json")}
+    missing = [name for name, path in paths.items() if path is None]
+    if missing:
+        raise FileNotFoundError(f"Prior model in {model_dir} is missing {missing}")
+
+    print(f"[train] Loading prior model from {paths['model.pkl']} ...")
+    model = joblib.load(paths["model.pkl"])
+    encoder = FeatureEncoder.load(paths["encoder.json"])
+    with open(paths["feature_schema.json"]) as f:
+        schema = json.load(f)
+
+    if not hasattr(model, "estimators_"):
+        raise ValueError(f"Warm start needs a random forest; {model_dir} holds a "
+                         f"{type(model).__name__}")
+    if getattr(model, "n_features_in_", encoder.n_features) != encoder.n_features:
+        raise ValueError(
+            f"Prior model expects {model.n_features_in_} features, "
+            f"its encoder produces {encoder.n_features}"
+        )
+    print(f"[train] Prior model has {len(model.estimators_)} trees")
+    return model, encoder, schema
+
+
+def merge_numeric_ranges(prior_ranges: dict, new_ranges: dict) -> dict:
+    """
+    Widen the prior schema's numeric ranges to cover the new data.
+
+    The forest still contains trees fitted on the prior data, so the
+    endpoint should keep accepting values from either.
+
+    Args:
+        prior_ranges: Dict of field -> [min, max] from the prior schema
+        new_ranges: Dict of field -> [min, max] from the new training data
+
+    Returns:
+        Dict of field -> [min, max]
+    """
+    merged = dict(prior_ranges)
+    for name, (low, high) in new_ranges.items():
+        if name in merged:
+            low, high = min(low, merged[name][0]), max(high, merged[name][1])
+        merged[name] = [low, high]
+    return merged
+
+
+def warn_unseen_levels(encoder: FeatureEncoder, categorical_levels: dict):
+    """
+    Warn about categorical levels the prior encoder has no column for.
+
+    A warm start keeps the prior feature layout, so such levels encode as
+    the all-zeros baseline; a full retrain is needed to learn them.
+
+    Args:
+        encoder: Prior FeatureEncoder
+        categorical_levels: Dict of field -> levels seen in the new data
+    """
+    for name, levels in categorical_levels.items():
+        unseen = sorted(set(levels) - set(encoder.categorical_levels.get(name, [])))
+        if unseen:
+            print(f"[WARNING] New {name} level(s) {unseen} are unknown to the prior "
+                  f"encoder and encode as the baseline; retrain from scratch to learn them")
+
+
+def grow_forest(model, X_train, y_train, new_trees: int):
+    """
+    Add trees fitted on new data to a fitted forest.
+
+    With an integer random_state, the new trees get the seeds a forest
+    with that random_state gives its trees from position trees_grown_ on,
+    so they never repeat the seed of an earlier tree, retired or not.
+    Models saved before trees_grown_ existed count their current trees.
+
+    Args:
+        model: Fitted RandomForestRegressor
+        X_train: Features of the new training data
+        y_train: Target of the new training data
+        new_trees: Number of trees to add
+
+    Returns:
+        The same model, with new_trees more trees
+    """
+    n_before = len(model.estimators_)
+    print(f"[train] Growing {new_trees} new tree(s) on {len(X_train):,} rows "
+          f"(warm start from {n_before}) ...")
+    started = time.perf_counter()
+    trees_grown = getattr(model, "trees_grown_", n_before)
+    seed = model.random_state
+    if isinstance(seed, (int, np.integer)):
+        # fit() skips one seed per tree in estimators_; skip the seeds of
+        # the retired trees as well
+        random_state = np.random.RandomState(seed)
+        random_state.randint(TREE_SEED_MAX, size=trees_grown - n_before)
+        model.set_params(random_state=random_state)
+    # n_estimators may have been lowered by retirement; grow from the actual count
+    model.set_params(warm_start=True, n_estimators=n_before + new_trees)
+    try:
+        model.fit(X_train, y_train)
+    finally:
+        model.set_params(warm_start=False, random_state=seed)
+    model.trees_grown_ = trees_grown + len(model.estimators_) - n_before
+    print(f"[train] Grew {len(model.estimators_) - n_before} tree(s) in "
+          f"{time.perf_counter() - started:.1f}s")
+    return model
+
+
+def retire_trees(model, max_trees: int, policy: str = "oldest", X_holdout=None,
+                 y_holdout=None) -> int:
+    """
+    Trim a forest back to at most max_trees trees.
+
+    Surviving trees keep their oldest-first order, so later retrains can
+    keep retiring by age.
+
+    Args:
+        model: Fitted RandomForestRegressor
+        max_trees: Trees to keep
+        policy: "oldest" or "worst" (see the module docstring)
+        X_holdout, y_holdout: Holdout split, required by the "worst" policy;
+            keep it apart from the split the model is evaluated on
+
+    Returns:
+        Number of trees retired
+    """
+    if policy not in RETIREMENT_POLICIES:
+        raise ValueError(f"Unknown retirement policy: {policy}")
+    n_retire = len(model.estimators_) - max_trees
+    if n_retire <= 0:
+        return 0
+
+    if policy == "oldest":
+        keep = np.arange(n_retire, len(model.estimators_))
+    else:
+        if X_holdout is None or y_holdout is None:
+            raise ValueError("The 'worst' policy needs a holdout split (X_holdout and y_holdout)")
+        X_holdout = np.asarray(X_holdout, dtype=np.float32)
+        errors = np.array([
+            np.mean((tree.predict(X_holdout) - y_holdout) ** 2) for tree in model.estimators_
+        ])
+        # Lowest error first, then back in age order
+        keep = np.sort(np.argsort(errors, kind="stable")[:max_trees])
+
+    model.estimators_ = [model.estimators_[i] for i in keep]
+    model.n_estimators = len(model.estimators_)
+    print(f"[train] Retired {n_retire} tree(s) ({policy}); {model.n_estimators} remain")
+    return n_retire
@@ -0,0 +1,59 @@
+"""
+Shared pytest setup.
+
+The scoring code (src/deploy) and the training code (src/ml-pipeline) are
+flat script directories rather than packages, as Azure ML uploads each one
+on its own, so both are put on sys.path for the tests.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+for directory in ("deploy", "ml-pipeline"):
+    path = str(SRC / directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@pytest.fixture(scope="session")
+def model_dir(tmp_path_factory):
+    """A small trained model directory, laid out as train.py writes it."""
+    from sklearn.ensemble import RandomForestRegressor
+
+    from feature_pipeline import FeatureEncoder
+    from forest_export import export_flat_forest
+
+    rng = np.random.default_rng(5)
+    n = 200
+    df = pd.DataFrame({
+        "sqft": rng.integers(600, 4000, n),
+        "bedrooms": rng.integers(1, 6, n),
+        "neighborhood_code": rng.choice(["N1", "N2", "N3"], n),
+    })
+    df["price"] = df["sqft"] * 150 + df["bedrooms"] * 10_000 + rng.normal(0, 5000, n)
+
+    encoder = FeatureEncoder.fit(df, "price")
+    X = encoder.transform(df)
+    model = RandomForestRegressor(n_estimators=5, max_depth=4, random_state=0)
+    model.fit(X, df["price"].to_numpy())
+
+    path = tmp_path_factory.mktemp("model")
+    joblib.dump(model, path / "model.pkl")
+    encoder.save(path / "encoder.json")
+    schema = {
+        "feature_columns": encoder.feature_columns,
+        "numeric_features": encoder.numeric_features,
+        "categorical_features": encoder.categorical_levels,
+        "numeric_ranges": {c: [int(df[c].min()), int(df[c].max())] for c in ("sqft", "bedrooms")},
+        "dtypes": {"sqft": "int64", "bedrooms": "int64", "neighborhood_code": "object"},
+    }
+    (path / "feature_schema.json").write_text(json.dumps(schema))
+    export_flat_forest(model, path, X_check=X, feature_columns=encoder.feature_columns)
+    return path
@@ -0,0 +1,90 @@
+"""batch_score.py shard planning and reading for CSV and Parquet inputs."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import batch_score
+
+
+@pytest.fixture
+def houses():
+    rng = np.random.default_rng(2)
+    n = 1000
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "sqft": rng.integers(600, 4000, n),
+        "neighborhood_code": rng.choice(["N1", "N2", "N3"], n),
+        "price": rng.normal(400_000, 50_000, n).round(2),
+    })
+
+
+def read_all(path, shard_bytes):
+    tasks = batch_score.plan_tasks(path, shard_bytes)
+    frames = [batch_score.load_shard(task, ["neighborhood_code"]) for task in tasks]
+    return tasks, pd.concat([f for f in frames if f is not None], ignore_index=True)
+
+
+def test_csv_byte_ranges_cover_every_row_once(houses, tmp_path):
+    path = tmp_path / "houses.csv"
+    houses.to_csv(path, index=False)
+    tasks, df = read_all(path, shard_bytes=1000)
+    assert len(tasks) > 10
+    pd.testing.assert_frame_equal(df, houses, check_dtype=False)
+
+
+def test_parquet_row_groups_match_csv(houses, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "houses.parquet"
+    table = houses.assign(neighborhood_code=houses["neighborhood_code"].astype("category"))
+    table.to_parquet(path, index=False, row_group_size=300)
+    tasks, df = read_all(path, shard_bytes=1000)
+    assert [task[2] for task in tasks] == [0, 1, 2, 3]
+    assert df["neighborhood_code"].to_numpy().tolist() == houses["neighborhood_code"].tolist()
+    pd.testing.assert_frame_equal(df.drop(columns="neighborhood_code"),
+                                  houses.drop(columns="neighborhood_code"))
+
+
+def test_directories_expand_to_csv_and_parquet_files(tmp_path):
+    for name in ("b.parquet", "a.csv", "MLTable", "notes.txt"):
+        (tmp_path / name).write_text("")
+    assert [p.name for p in batch_score.resolve_inputs([str(tmp_path)])] == ["a.csv", "b.parquet"]
+
+
+def test_invalid_rows_are_rejected_not_scored(houses, tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from feature_encoder import FeatureEncoder
+    from validation import RecordValidator
+
+    schema = {
+        "feature_columns": ["sqft", "neighborhood_code_N2", "neighborhood_code_N3"],
+        "numeric_features": ["sqft"],
+        "categorical_features": {"neighborhood_code": ["N1", "N2", "N3"]},
+        "numeric_ranges": {"sqft": [600, 4000]},
+        "dtypes": {"sqft": "int64"},
+    }
+    predictor = SimpleNamespace(predict=lambda X: X[:, 0])
+    monkeypatch.setattr(batch_score, "_worker_model", SimpleNamespace(
+        encoder=FeatureEncoder.from_schema(schema),
+        validator=RecordValidator.from_schema(schema),
+        predictor=predictor,
+    ))
+    houses = houses.astype({"sqft": float})
+    houses.loc[3, "sqft"] = None
+    houses.loc[4, "neighborhood_code"] = "N9"
+    path = tmp_path / "houses.csv"
+    houses.to_csv(path, index=False)
+
+    (task,) = batch_score.plan_tasks(path, shard_bytes=1 << 20)
+    ids, predictions, errors = batch_score._score_shard(task)
+    assert [error["row"] for error in errors] == [3, 4]
+    assert errors[0]["errors"] == {"sqft": "expected a number, got nan"}
+    assert np.isnan(predictions[[3, 4]]).all()
+    np.testing.assert_array_equal(np.delete(predictions, [3, 4]),
+                                  np.delete(houses["sqft"].to_numpy(), [3, 4]))
+
+    batch_score.write_rejected(tmp_path / "rejected.csv", ids, errors, append=False)
+    rejected = pd.read_csv(tmp_path / "rejected.csv")
+    assert rejected["id"].tolist() == [3, 4]
+    assert "N9" in rejected["errors"][1]
@@ -0,0 +1,71 @@
+"""MicroBatcher coalescing of concurrent predict() calls."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from batching import MicroBatcher
+
+
+class RecordingPredict:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, X):
+        self.batch_sizes.append(len(X))
+        return X[:, 0] * 2
+
+
+def submit_concurrently(batcher, matrices):
+    results = [None] * len(matrices)
+    start = threading.Barrier(len(matrices))
+
+    def call(i):
+        start.wait()
+        results[i] = batcher.submit(matrices[i])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(matrices))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_requests_share_batches_and_get_their_rows():
+    predict = RecordingPredict()
+    batcher = MicroBatcher(predict, max_batch_size=64, max_wait_ms=50, log_interval_s=0)
+    matrices = [np.full((i % 3 + 1, 2), float(i)) for i in range(12)]
+    try:
+        results = submit_concurrently(batcher, matrices)
+    finally:
+        batcher.close()
+
+    for matrix, result in zip(matrices, results):
+        np.testing.assert_array_equal(result, matrix[:, 0] * 2)
+    assert sum(predict.batch_sizes) == sum(len(m) for m in matrices)
+    assert len(predict.batch_sizes) < len(matrices)
+    assert batcher.stats()["requests"] == len(matrices)
+
+
+def test_large_requests_and_closed_batcher_score_directly():
+    predict = RecordingPredict()
+    batcher = MicroBatcher(predict, max_batch_size=4, max_wait_ms=1, log_interval_s=0)
+    batcher.submit(np.ones((4, 2)))
+    batcher.close()
+    batcher.submit(np.ones((1, 2)))
+    assert predict.batch_sizes == [4, 1]
+    assert batcher.stats()["batches"] == 0
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    def failing(X):
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(failing, max_batch_size=64, max_wait_ms=20, log_interval_s=0)
+    try:
+        with pytest.raises(RuntimeError, match="boom"):
+            batcher.submit(np.ones((1, 2)))
+    finally:
+        batcher.close()
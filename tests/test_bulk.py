@@ -0,0 +1,66 @@
+"""Bulk NDJSON/CSV payload detection and chunked scoring."""
+
+import json
+
+import numpy as np
+import pytest
+
+import bulk
+from feature_encoder import FeatureEncoder
+from validation import RecordValidator
+
+SCHEMA = {
+    "feature_columns": ["sqft", "neighborhood_code_N2"],
+    "numeric_features": ["sqft"],
+    "categorical_features": {"neighborhood_code": ["N1", "N2"]},
+    "numeric_ranges": {"sqft": [500, 4000]},
+}
+
+
+class SumPredictor:
+    """Predicts sqft + 1000 * is_N2, so predictions identify their rows."""
+
+    def predict(self, X):
+        return X[:, 0] + 1000 * X[:, 1]
+
+
+@pytest.mark.parametrize("body, expected", [
+    ('{"sqft": 1}\n{"sqft": 2}\n', bulk.NDJSON),
+    ("sqft,neighborhood_code\n1800,N1\n", bulk.CSV),
+    ('{"data": [{"sqft": 1}]}', None),
+    ('{\n  "data": []\n}', None),
+    ('[{"sqft": 1}]', None),
+    ("", None),
+    ("sqft,neighborhood_code,id", bulk.CSV),
+    ("null", None),
+    ("garbage", None),
+    ('"x"', None),
+    ("sqft,bedrooms", None),
+])
+def test_detect_bulk_format(body, expected):
+    assert bulk.detect_bulk_format(body, ["sqft", "neighborhood_code"]) == expected
+
+
+@pytest.mark.parametrize("fmt", [bulk.NDJSON, bulk.CSV])
+def test_score_text_in_chunks_with_errors(fmt):
+    houses = [{"sqft": 1000 + i, "neighborhood_code": "N2" if i % 2 else "N1"} for i in range(10)]
+    houses[3]["neighborhood_code"] = "N9"
+    if fmt == bulk.NDJSON:
+        text = "".join(json.dumps(h) + "\n" for h in houses)
+    else:
+        text = "sqft,neighborhood_code\n" + "".join(
+            f"{h['sqft']},{h['neighborhood_code']}\n" for h in houses
+        )
+
+    predictions, errors = bulk.score_text(
+        FeatureEncoder.from_schema(SCHEMA), SumPredictor(), text, fmt, chunk_size=4,
+        validator=RecordValidator.from_schema(SCHEMA),
+    )
+    expected = [1000 + i + (1000 if i % 2 else 0) for i in range(10)]
+    expected[3] = np.nan
+    np.testing.assert_array_equal(predictions, expected)
+    assert [error["row"] for error in errors] == [3]
+
+
+def test_iter_chunks():
+    assert [len(c) for c in bulk.iter_chunks(range(10), 4)] == [4, 4, 2]
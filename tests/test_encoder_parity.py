@@ -0,0 +1,74 @@
+"""The scoring encoder reproduces the training encoder's feature matrix."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_encoder import FeatureEncoder as ScoringEncoder
+from feature_pipeline import FeatureEncoder
+
+
+@pytest.fixture
+def train_df():
+    rng = np.random.default_rng(1)
+    n = 50
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "sqft": rng.integers(600, 4000, n),
+        "bathrooms": rng.choice([1.0, 1.5, 2.0, 2.5], n),
+        "neighborhood_code": rng.choice(["N1", "N2", "N3"], n),
+        "exterior_type": rng.choice(["brick", "siding", "stucco"], n),
+        "price": rng.normal(400_000, 50_000, n),
+    })
+
+
+def scoring_records(df):
+    return df.drop(columns=["id", "price"]).to_dict("records")
+
+
+@pytest.mark.parametrize("encoding", ["onehot", "ordinal"])
+def test_scoring_encoder_matches_training(train_df, encoding, tmp_path):
+    encoder = FeatureEncoder.fit(train_df, "price", encoding)
+    encoder.save(tmp_path / "encoder.json")
+    loaded = FeatureEncoder.load(tmp_path / "encoder.json")
+    scoring = ScoringEncoder.from_dict(loaded.to_dict())
+
+    # An unseen level encodes as the baseline (one-hot) or NaN (ordinal)
+    df = train_df.copy()
+    df.loc[0, "neighborhood_code"] = "N9"
+    expected = encoder.transform(df).astype(np.float64)
+    records = scoring_records(df)
+    columns = {name: [record[name] for record in records] for name in records[0]}
+
+    assert scoring.feature_columns == encoder.feature_columns
+    np.testing.assert_array_equal(scoring.encode(records), expected)
+    np.testing.assert_array_equal(scoring.encode_columns(columns), expected)
+
+
+def test_onehot_layout_matches_get_dummies(train_df):
+    encoder = FeatureEncoder.fit(train_df, "price")
+    dummies = pd.get_dummies(train_df.drop(columns=["id", "price"]), drop_first=True)
+    assert encoder.feature_columns == list(dummies.columns)
+    np.testing.assert_array_equal(encoder.transform(train_df), dummies.to_numpy(dtype=np.float32))
+
+
+def test_from_schema_matches_encoder_json(train_df):
+    encoder = FeatureEncoder.fit(train_df, "price")
+    schema = {
+        "feature_columns": encoder.feature_columns,
+        "numeric_features": encoder.numeric_features,
+        "categorical_features": encoder.categorical_levels,
+    }
+    records = scoring_records(train_df)
+    np.testing.assert_array_equal(
+        ScoringEncoder.from_schema(schema).encode(records),
+        ScoringEncoder.from_dict(encoder.to_dict()).encode(records),
+    )
+
+
+def test_missing_field_is_a_value_error(train_df):
+    scoring = ScoringEncoder.from_dict(FeatureEncoder.fit(train_df, "price").to_dict())
+    record = scoring_records(train_df)[0]
+    del record["sqft"]
+    with pytest.raises(ValueError, match="sqft"):
+        scoring.encode([record])
@@ -0,0 +1,150 @@
+"""Parity of the flat forest engine and its bundles with model.predict."""
+
+import json
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from forest_engine import FlatForest
+from forest_export import export_flat_forest, flatten_forest, load_flat_forest, predict_flat
+from model_compaction import (
+    choose_pruning,
+    prune_flat_forest,
+    round_down_float32,
+    split_holdout,
+)
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 6)).astype(np.float32)
+    X[:, 5] = rng.integers(0, 2, size=600)  # a one-hot style column
+    y = 3 * X[:, 0] - 2 * X[:, 1] ** 2 + 5 * X[:, 5] + rng.normal(scale=0.3, size=600)
+    return X[:400], y[:400], X[400:], y[400:]
+
+
+@pytest.fixture(scope="module")
+def model(data):
+    X_train, y_train, _, _ = data
+    return RandomForestRegressor(n_estimators=15, max_depth=8, random_state=0).fit(X_train, y_train)
+
+
+def in_memory_forest(arrays):
+    return FlatForest(
+        **{name: arrays[name] for name in ("feature", "threshold", "children", "value", "roots")},
+        max_depth=arrays["max_depth"],
+        n_features=arrays["n_features"],
+    )
+
+
+def float32_atol(forest):
+    """Largest prediction change float32 leaf values can cause."""
+    return float(np.abs(forest.value).max()) * np.finfo(np.float32).eps
+
+
+def test_flat_engines_match_model_predict(model, data):
+    _, _, X_val, _ = data
+    arrays = flatten_forest(model)
+    expected = model.predict(X_val)
+
+    np.testing.assert_allclose(predict_flat(arrays, X_val), expected, rtol=1e-12)
+    np.testing.assert_allclose(in_memory_forest(arrays).predict(X_val), expected, rtol=1e-12)
+
+
+def test_per_tree_predictions_match_estimators(model, data):
+    _, _, X_val, _ = data
+    per_tree = in_memory_forest(flatten_forest(model)).tree_predictions(X_val)
+    expected = np.stack([tree.predict(X_val) for tree in model.estimators_])
+    np.testing.assert_allclose(per_tree, expected, rtol=1e-12)
+
+
+def test_mmap_bundle_matches_model_predict(model, data, tmp_path):
+    _, _, X_val, _ = data
+    export_flat_forest(model, tmp_path, X_check=X_val, feature_columns=[f"f{i}" for i in range(6)])
+
+    forest = FlatForest.load(tmp_path / "forest")
+    assert isinstance(forest.threshold, np.memmap)
+    assert forest.feature_columns == [f"f{i}" for i in range(6)]
+    np.testing.assert_allclose(forest.predict(X_val), model.predict(X_val), rtol=1e-12)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_compact_bundle_reaches_the_same_leaves(model, data, tmp_path, compress):
+    _, _, X_val, _ = data
+    export_flat_forest(model, tmp_path, X_check=X_val, compact=True, compress=compress)
+
+    forest = FlatForest.load(tmp_path / "forest")
+    assert forest.threshold.dtype == np.float32
+    assert forest.feature.dtype == np.int8
+    full = in_memory_forest(flatten_forest(model))
+    np.testing.assert_array_equal(forest.apply(X_val), full.apply(X_val))
+    np.testing.assert_allclose(forest.predict(X_val), model.predict(X_val), rtol=0,
+                               atol=float32_atol(forest))
+
+
+def test_round_down_float32_keeps_split_decisions():
+    thresholds = np.array([0.1, 1 / 3, -2.5000001, 1e10 + 0.5, np.inf])
+    rounded = round_down_float32(thresholds)
+    assert np.all(rounded.astype(np.float64) <= thresholds)
+    # Every float32 near a threshold compares the same way either side
+    for t, r in zip(thresholds[:-1], rounded[:-1]):
+        probes = np.array([np.nextafter(r, np.float32(-np.inf)), r, np.nextafter(r, np.float32(np.inf))],
+                          dtype=np.float32)
+        np.testing.assert_array_equal(probes <= t, probes <= r)
+
+
+def test_pruning_to_full_size_is_identity(model):
+    arrays = flatten_forest(model)
+    pruned = prune_flat_forest(arrays, len(arrays["roots"]), arrays["max_depth"])
+    for name in ("feature", "threshold", "children", "value", "roots"):
+        np.testing.assert_array_equal(pruned[name], arrays[name])
+
+
+def test_pruned_bundle_matches_chosen_rmse(model, data, tmp_path):
+    _, _, X_val, y_val = data
+    X_val, y_val, X_prune, y_prune = split_holdout(X_val, y_val, 0.5)
+    arrays = flatten_forest(model)
+    choice = choose_pruning(arrays, X_prune, y_prune, rmse_budget=0.2)
+    assert choice["holdout_rmse"] <= choice["full_holdout_rmse"] * 1.2
+    assert choice["holdout_rows"] == len(y_prune)
+    assert choice["n_nodes"] < len(arrays["value"])
+
+    pruned = prune_flat_forest(arrays, choice["n_trees"], choice["depth"])
+    rmse = np.sqrt(np.mean((predict_flat(pruned, X_prune) - y_prune) ** 2))
+    assert rmse == pytest.approx(choice["holdout_rmse"], rel=1e-9)
+
+    export_flat_forest(model, tmp_path, X_check=X_val, compact=True, prune_rmse_budget=0.2,
+                       X_prune=X_prune, y_prune=y_prune)
+    forest = FlatForest.load(tmp_path / "forest")
+    meta = json.loads((tmp_path / "forest" / "meta.json").read_text())
+    assert forest.n_estimators == choice["n_trees"] == meta["pruning"]["n_trees"]
+    np.testing.assert_allclose(forest.predict(X_val), predict_flat(pruned, X_val), rtol=0,
+                               atol=float32_atol(forest))
+
+
+def test_pruning_needs_a_holdout(model, data, tmp_path):
+    _, _, X_val, _ = data
+    with pytest.raises(ValueError, match="holdout"):
+        export_flat_forest(model, tmp_path, X_check=X_val, prune_rmse_budget=0.2)
+
+
+def test_split_holdout_is_disjoint_and_ordered():
+    X = np.arange(20, dtype=np.float32).reshape(10, 2)
+    y = np.arange(10, dtype=np.float64)
+    X_rest, y_rest, X_hold, y_hold = split_holdout(X, y, 0.3)
+    assert len(y_hold) == 3
+    assert sorted(np.concatenate([y_rest, y_hold]).tolist()) == y.tolist()
+    assert np.all(np.diff(y_hold) > 0) and np.all(np.diff(y_rest) > 0)
+    np.testing.assert_array_equal(X_hold[:, 0], 2 * y_hold)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_load_flat_forest_reads_back_the_served_bundle(model, data, tmp_path, compress):
+    _, _, X_val, _ = data
+    bundle_dir = export_flat_forest(model, tmp_path, compact=True, compress=compress)
+    arrays = load_flat_forest(bundle_dir)
+    assert arrays["threshold"].dtype == np.float32
+    np.testing.assert_array_equal(predict_flat(arrays, X_val),
+                                  FlatForest.load(bundle_dir).predict(X_val))
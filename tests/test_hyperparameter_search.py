@@ -0,0 +1,33 @@
+"""Successive-halving search schedule and its returned forest."""
+
+import numpy as np
+import pytest
+
+from sklearn.ensemble import RandomForestRegressor
+
+from hyperparameter_search import halving_schedule, run_search
+
+
+@pytest.mark.parametrize("n_candidates, expected", [
+    (9, [(11, 9), (33, 3), (100, 1)]),
+    (1, [(100, 1)]),
+    (4, [(11, 4), (33, 2), (100, 1)]),
+])
+def test_halving_schedule(n_candidates, expected):
+    assert halving_schedule(n_candidates, 10, 100, 3) == expected
+
+
+def test_search_returns_the_winning_forest_at_full_size():
+    rng = np.random.default_rng(4)
+    X = rng.normal(size=(240, 5)).astype(np.float32)
+    y = X[:, 0] * 2 + X[:, 1] ** 2 + rng.normal(scale=0.1, size=240)
+    candidates = [{"max_depth": d} for d in (1, 2, 6)]
+
+    best, model, results, _ = run_search(X[:160], y[:160], X[160:], y[160:], candidates,
+                                         min_trees=4, max_trees=12, factor=2, workers=1)
+    assert best == {"max_depth": 6}
+    assert all("model" not in r for r in results)
+    assert len(model.estimators_) == 12
+    # Same forest train.py would have refitted (train_model uses random_state=42)
+    refit = RandomForestRegressor(n_estimators=12, random_state=42, **best).fit(X[:160], y[:160])
+    np.testing.assert_array_equal(model.predict(X), refit.predict(X))
@@ -0,0 +1,42 @@
+"""load_test.py's in-process client on top of score.run()."""
+
+import json
+
+import pytest
+
+import load_test
+import score
+
+HOUSE = {"sqft": 1800, "bedrooms": 3, "neighborhood_code": "N2"}
+
+
+class StubAMLResponse:
+    """Stand-in for azureml's AMLResponse (a Flask Response)."""
+
+    def __init__(self, message, status_code, response_headers=None, json_str=False):
+        self.data = message
+        self.status_code = status_code
+
+    def get_data(self):
+        return self.data
+
+
+@pytest.fixture
+def send(model_dir, monkeypatch):
+    monkeypatch.setattr(score, "CACHE_SIZE", 0)
+    # inproc_client() sets this itself; monkeypatch restores it afterwards
+    monkeypatch.setenv("AZUREML_MODEL_DIR", str(model_dir))
+    return load_test.inproc_client(model_dir)
+
+
+@pytest.mark.parametrize("aml_response", [None, StubAMLResponse])
+def test_inproc_client_accepts_compact_responses(send, monkeypatch, aml_response):
+    monkeypatch.setattr(score, "RESPONSE_FORMAT", "compact")
+    monkeypatch.setattr(score, "AMLResponse", aml_response)
+
+    assert send(json.dumps({"data": [HOUSE]}))
+
+
+def test_inproc_client_reports_errors(send):
+    assert send(json.dumps({"data": [HOUSE]}))
+    assert not send("not json")
@@ -0,0 +1,115 @@
+"""ModelRegistry hot swap, lazy loading and eviction."""
+
+import os
+
+import pytest
+
+from model_registry import ModelRegistry
+
+
+class FakeModel:
+    def __init__(self, path, version, size_bytes=1024 * 1024):
+        self.path = path
+        self.version = version
+        self.size_bytes = size_bytes
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def add_version(root, version, content="v"):
+    path = root / version
+    path.mkdir()
+    (path / "model.pkl").write_text(content)
+    return path
+
+
+@pytest.fixture
+def loads():
+    return []
+
+
+@pytest.fixture
+def loader(loads):
+    def load(path, version):
+        loads.append(version)
+        return FakeModel(path, version)
+    return load
+
+
+def test_single_version_mode_serves_the_directory(tmp_path, loader):
+    registry = ModelRegistry(str(tmp_path), loader, poll_interval_s=0)
+    assert registry.get().path == str(tmp_path)
+    assert registry.default_version == tmp_path.name
+
+
+def test_newest_version_becomes_default_on_refresh(tmp_path, loader, loads):
+    add_version(tmp_path, "1")
+    add_version(tmp_path, "9")
+    registry = ModelRegistry(str(tmp_path), loader, multi_version=True, poll_interval_s=0)
+    old = registry.get()
+    assert old.version == "9"
+
+    add_version(tmp_path, "10")
+    registry.refresh()
+    assert registry.default_version == "10"
+    assert registry.get().version == "10"
+    assert registry.stats()["swaps"] == 1
+    # The request that started on the old default keeps a usable model
+    assert old.version == "9" and not old.closed
+
+
+def test_changed_default_files_are_reloaded(tmp_path, loader, loads):
+    path = add_version(tmp_path, "1")
+    registry = ModelRegistry(str(tmp_path), loader, multi_version=True, poll_interval_s=0)
+    first = registry.get()
+
+    (path / "model.pkl").write_text("retrained")
+    os.utime(path / "model.pkl", ns=(1, 1))
+    registry.refresh()
+    assert registry.get() is not first
+    assert first.closed
+    assert loads == ["1", "1"]
+
+
+def test_pinned_default_and_lazy_versions(tmp_path, loader, loads):
+    for version in ("1", "2", "3"):
+        add_version(tmp_path, version)
+    registry = ModelRegistry(str(tmp_path), loader, multi_version=True, default_version="2",
+                             poll_interval_s=0)
+    assert registry.get().version == "2"
+    assert loads == ["2"]
+    assert registry.get("3").version == "3"
+    assert loads == ["2", "3"]
+    with pytest.raises(ValueError, match="Unknown model version"):
+        registry.get("7")
+
+
+def test_idle_versions_are_evicted_over_budget(tmp_path, loader):
+    for version in ("1", "2", "3"):
+        add_version(tmp_path, version)
+    # Budget of 2 MB: the 1 MB default plus one other version
+    registry = ModelRegistry(str(tmp_path), loader, multi_version=True, memory_budget_mb=2,
+                             poll_interval_s=0)
+    one = registry.get("1")
+    registry.get("2")
+    assert one.closed
+    assert registry.stats()["loaded_versions"] == ["3", "2"]
+    assert registry.stats()["evictions"] == 1
+
+
+def test_version_loaded_for_a_request_is_not_evicted(tmp_path, loader):
+    for version in ("1", "2"):
+        add_version(tmp_path, version)
+    # The default alone fills the budget
+    registry = ModelRegistry(str(tmp_path), loader, multi_version=True, memory_budget_mb=1,
+                             poll_interval_s=0)
+    one = registry.get("1")
+    assert not one.closed
+    assert registry.stats()["loaded_versions"] == ["2", "1"]
+    # The next lazy load evicts it instead
+    add_version(tmp_path, "0")
+    registry.refresh()
+    assert registry.get("0").version == "0"
+    assert one.closed
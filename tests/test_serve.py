@@ -0,0 +1,72 @@
+"""serve.py request handling on top of score.run()."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import score
+import serve
+
+HOUSE = {"sqft": 1800, "bedrooms": 3, "neighborhood_code": "N2"}
+
+
+class StubAMLResponse:
+    """Stand-in for azureml's AMLResponse (a Flask Response)."""
+
+    def __init__(self, message, status_code, response_headers=None, json_str=False):
+        self.data = message
+        self.status_code = status_code
+
+    def get_data(self):
+        return self.data
+
+
+@pytest.fixture
+def server(model_dir, monkeypatch):
+    monkeypatch.setenv("AZUREML_MODEL_DIR", str(model_dir))
+    monkeypatch.setattr(score, "CACHE_SIZE", 0)
+    score.init()
+    # Threads share this process's score module, stubs included
+    pool = ThreadPoolExecutor(max_workers=1)
+    server = serve.ScoringServer(pool, workers=1, max_inflight=4, max_body_bytes=1 << 20,
+                                 keep_alive_s=1)
+    server.ready = True
+    yield server
+    pool.shutdown()
+
+
+def post(server, payload):
+    body = json.dumps(payload).encode("utf-8")
+    return asyncio.run(server.route("POST", "/score", body))
+
+
+@pytest.mark.parametrize("aml_response", [None, StubAMLResponse])
+def test_compact_responses_are_served(server, monkeypatch, aml_response):
+    monkeypatch.setenv("SCORE_RESPONSE_FORMAT", "compact")
+    monkeypatch.setattr(score, "RESPONSE_FORMAT", "compact")
+    monkeypatch.setattr(score, "AMLResponse", aml_response)
+
+    status, body = post(server, {"data": [HOUSE, HOUSE]})
+    assert status == 200
+    response = json.loads(body)
+    assert len(response["predictions"]) == 2
+    assert response["predictions"][0] == round(response["predictions"][0], 2)
+
+
+def test_full_responses_and_errors_are_json(server):
+    status, body = post(server, {"data": [HOUSE, dict(HOUSE, sqft="big")]})
+    assert status == 200
+    response = json.loads(body)
+    assert response["predictions"][1] is None
+    assert response["errors"][0]["row"] == 1
+
+    status, body = post(server, "not a house")
+    assert status == 200 and "error" in json.loads(body)
+
+
+def test_invalid_content_length_is_rejected():
+    assert serve.ScoringServer.parse_content_length("12") == 12
+    for value in ("-1", "+5", " 5", "5_000", "", "1.5"):
+        assert serve.ScoringServer.parse_content_length(value) is None
@@ -0,0 +1,92 @@
+"""RecordValidator behavior on records and columnar batches."""
+
+import numpy as np
+import pytest
+
+from validation import RecordValidator
+
+SCHEMA = {
+    "numeric_features": ["sqft", "bedrooms"],
+    "categorical_features": {"neighborhood_code": ["N1", "N2"]},
+    "numeric_ranges": {"sqft": [500, 4000], "bedrooms": [1, 5]},
+    "dtypes": {"sqft": "int64", "bedrooms": "int64", "neighborhood_code": "object"},
+}
+
+
+@pytest.fixture
+def validator():
+    return RecordValidator.from_schema(SCHEMA, range_margin=0.1)
+
+
+def house(**overrides):
+    record = {"sqft": 1800, "bedrooms": 3, "neighborhood_code": "N1"}
+    record.update(overrides)
+    return record
+
+
+def test_clean_batch_has_no_errors(validator):
+    valid, errors = validator.validate([house(), house(sqft=2500.0, neighborhood_code="N2")])
+    assert valid.tolist() == [0, 1]
+    assert errors == []
+
+
+@pytest.mark.parametrize("overrides, field, message", [
+    ({"sqft": "big"}, "sqft", "expected a number"),
+    ({"sqft": None}, "sqft", "expected a number"),
+    ({"sqft": float("nan")}, "sqft", "expected a number"),
+    ({"bedrooms": 2.5}, "bedrooms", "not a whole number"),
+    ({"sqft": 10_000}, "sqft", "outside the accepted range"),
+    ({"neighborhood_code": "N9"}, "neighborhood_code", "unknown value"),
+    ({"neighborhood_code": ["N1"]}, "neighborhood_code", "unknown value"),
+    ({"bedrooms": True}, "bedrooms", "expected a number, got True"),
+    ({"sqft": np.bool_(False)}, "sqft", "expected a number"),
+    ({"neighborhood_code": True}, "neighborhood_code", "unknown value"),
+])
+def test_bad_rows_are_reported_and_others_kept(validator, overrides, field, message):
+    valid, errors = validator.validate([house(), house(**overrides), house()])
+    assert valid.tolist() == [0, 2]
+    assert [error["row"] for error in errors] == [1]
+    assert message in errors[0]["errors"][field]
+
+
+def test_missing_field(validator):
+    record = house()
+    del record["bedrooms"]
+    valid, errors = validator.validate([record])
+    assert valid.tolist() == []
+    assert errors[0]["errors"] == {"bedrooms": "missing"}
+
+
+def test_range_margin_widens_training_range(validator):
+    # sqft range 500..4000 widened by 10% of the span (350) on each side
+    valid, _ = validator.validate([house(sqft=4300), house(sqft=4400)])
+    assert valid.tolist() == [0]
+
+
+def test_columns_match_records(validator):
+    records = [house(), house(sqft="x"), house(neighborhood_code="N7"), house(bedrooms=4)]
+    columns = {name: [record[name] for record in records] for name in records[0]}
+    valid_rows, row_errors = validator.validate(records)
+    valid_cols, col_errors = validator.validate_columns(columns)
+    assert valid_cols.tolist() == valid_rows.tolist() == [0, 3]
+    assert col_errors == row_errors
+
+
+def test_columns_must_be_complete_and_aligned(validator):
+    with pytest.raises(ValueError, match="Missing required columns"):
+        validator.validate_columns({"sqft": [1800]})
+    with pytest.raises(ValueError, match="different lengths"):
+        validator.validate_columns(
+            {"sqft": [1800, 1900], "bedrooms": [3], "neighborhood_code": ["N1"]}
+        )
+
+
+def test_boolean_columns_are_rejected(validator):
+    columns = {"sqft": [1800, 1900], "bedrooms": [3, True], "neighborhood_code": ["N1", "N2"]}
+    valid, errors = validator.validate_columns(columns)
+    assert valid.tolist() == [0]
+    assert errors[0]["errors"] == {"bedrooms": "expected a number, got True"}
+
+    columns["bedrooms"] = np.array([True, False])
+    valid, errors = validator.validate_columns(columns)
+    assert valid.tolist() == []
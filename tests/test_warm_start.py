@@ -0,0 +1,53 @@
+"""Warm-start growth and retirement of a fitted forest."""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from warm_start import grow_forest, retire_trees
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(300, 4)).astype(np.float32)
+    y = X[:, 0] * 3 + rng.normal(size=300)
+    return X, y
+
+
+def tree_seeds(model):
+    return [tree.random_state for tree in model.estimators_]
+
+
+def fit_forest(X, y, n_estimators):
+    return RandomForestRegressor(n_estimators=n_estimators, max_depth=4,
+                                 random_state=42).fit(X, y)
+
+
+def test_growing_without_retirement_matches_a_cold_forest(data):
+    X, y = data
+    model = grow_forest(fit_forest(X, y, 5), X, y, new_trees=5)
+    assert tree_seeds(model) == tree_seeds(fit_forest(X, y, 10))
+    assert model.trees_grown_ == 10
+    assert model.random_state == 42 and not model.warm_start
+
+
+def test_new_trees_never_reuse_seeds_after_retirement(data):
+    X, y = data
+    model = fit_forest(X, y, 6)
+    for _ in range(3):
+        grow_forest(model, X, y, new_trees=4)
+        retire_trees(model, max_trees=6)
+    assert model.trees_grown_ == 18
+    # The surviving trees are the last six a cold 18-tree forest would grow
+    assert tree_seeds(model) == tree_seeds(fit_forest(X, y, 18))[-6:]
+
+
+def test_worst_policy_keeps_age_order(data):
+    X, y = data
+    model = fit_forest(X, y, 8)
+    seeds = tree_seeds(model)
+    assert retire_trees(model, 5, "worst", X, y) == 3
+    kept = tree_seeds(model)
+    assert len(kept) == 5 and kept == [s for s in seeds if s in kept]
+    assert model.n_estimators == 5